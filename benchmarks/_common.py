@@ -0,0 +1,51 @@
+"""
+benchmarks/_common.py
+
+Shared helpers for the benchmark scripts (and the test suite's corpus).
+
+- Puts payday/ on sys.path, the way main.py and chainpay.py run it
+- generate_log(lines, seed): seeded synthetic free-text work log with
+  mixed day/time/field styles, breaks, and lines the parser rejects
+- best_of(fn, repeat): fastest wall time of repeated calls
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "payday") not in sys.path:
+    sys.path.insert(0, str(ROOT / "payday"))
+
+_DAYS = ["Monday", "tue", "Wed", "thurs", "Fri", "sat", "Sunday"]
+_TIMES = ["0900 - 1700", "0800-1200", "1230 to 1600", "9am-5pm", "7:30am - 3:30pm", "2200-0600", "10:00-12:00"]
+_FIELDS = ["at Site A", "at 14 Pulsar St, Cosmic inspection", "for ACME Corp", "with Beta Co, fix sink",
+           "at Oak for Nebula Nomads, drywall", "prep work", "lunch", "no lunch", "30 mins"]
+_JUNK = ["notes: called the office", "= at nowhere", "left early"]
+
+
+def generate_log(lines, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(lines):
+        if rng.random() < 0.05:
+            out.append(rng.choice(_JUNK))
+            continue
+        segs = []
+        if rng.random() < 0.1:
+            segs.append(rng.choice(_FIELDS))  # orphan segment before the first block
+        for _ in range(rng.randint(1, 3)):
+            segs.append(rng.choice(_TIMES) + " " + " ".join(rng.sample(_FIELDS, rng.randint(0, 2))))
+        out.append(rng.choice(_DAYS) + "=" + " | ".join(segs))
+    return "\n".join(out) + "\n"
+
+
+def best_of(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best
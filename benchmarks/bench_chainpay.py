@@ -0,0 +1,96 @@
+"""
+benchmarks/bench_chainpay.py
+
+chainpay.py compatibility profile vs the original standalone script on the
+golden corpus (tests/data/chainpay). Both must produce the golden rows; the
+compat profile's CSV must match the golden "work hour.csv" byte for byte.
+
+The original script is read from git history (chainpay.py as it was before
+payday/core/compat.py was added), or from --legacy PATH; without either
+only the compat profile is timed.
+
+    python benchmarks/bench_chainpay.py [--times N] [--legacy PATH]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+from _common import ROOT, best_of
+
+from core.compat import CHAINPAY_WATERMARK, ChainpayParser
+from core.pipeline import Pipeline
+from pdio.writer import CsvWriter
+
+CORPUS = ROOT / "tests" / "data" / "chainpay"
+
+
+def _legacy_source(path):
+    if path:
+        return Path(path).read_text(encoding="utf-8")
+    try:
+        git = ["git", "-C", str(ROOT)]
+        added = subprocess.run(git + ["log", "--diff-filter=A", "--format=%H", "--", "payday/core/compat.py"],
+                               capture_output=True, text=True, check=True).stdout.split()
+        if not added:
+            return None
+        return subprocess.run(git + ["show", f"{added[-1]}^:chainpay.py"],
+                              capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load_legacy(source):
+    mod = types.ModuleType("chainpay_legacy")
+    exec(compile(source, "chainpay_legacy.py", "exec"), mod.__dict__)
+    return mod
+
+
+def _compat_rows(raw):
+    pipe = Pipeline(ChainpayParser())
+    return pipe.collect(pipe.run(raw))
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--times", type=int, default=10, help="corpus copies per timed run")
+    ap.add_argument("--legacy", metavar="PATH", help="original chainpay.py (default: from git history)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    source = _legacy_source(args.legacy)
+    legacy = _load_legacy(source) if source else None
+    if legacy is None:
+        print("original chainpay.py not found; timing the compat profile only")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for golden in sorted(CORPUS.glob("*.csv")):
+            raw = golden.with_suffix(".txt").read_text(encoding="utf-8")
+            rows = _compat_rows(raw)
+            out = CsvWriter(Path(tmp) / golden.name, watermark=CHAINPAY_WATERMARK).write(rows)
+            if out.read_bytes() != golden.read_bytes():
+                print(f"MISMATCH: {golden.stem}: compat output differs from {golden}")
+                failed = True
+            if legacy is not None and legacy.WorkHourParser().parse(raw) != rows:
+                print(f"MISMATCH: {golden.stem}: original script rows differ")
+                failed = True
+
+            big = raw * args.times
+            lines = big.count("\n")
+            timings = [("compat", best_of(lambda: _compat_rows(big), args.repeat))]
+            if legacy is not None:
+                timings.insert(0, ("original", best_of(lambda: legacy.WorkHourParser().parse(big), args.repeat)))
+            print(f"{golden.stem}: {lines:,} lines")
+            for label, t in timings:
+                print(f"  {label:<9} {t:7.3f}s  {lines / t:10,.0f} lines/s")
+            if legacy is not None:
+                print(f"  speedup   {timings[0][1] / timings[1][1]:7.2f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_intervals.py
+
+OccupancyIndex on a synthetic crew: build time, overlap queries against a
+linear scan of the same blocks, and the bulk conflicts() sweep. Checks that
+the indexed queries return what the scan finds.
+
+    python benchmarks/bench_intervals.py [--blocks N] [--queries N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from _common import best_of
+
+from core.intervals import OccupancyIndex
+
+
+def _crew(n, seed=1):
+    rng = random.Random(seed)
+    clients = [f"Client {i}" for i in range(200)]
+    sites = [f"Site {i}" for i in range(500)]
+    first = date(2024, 1, 1)
+    out = []
+    for _ in range(n):
+        start = rng.randrange(5 * 60, 20 * 60, 15)
+        on = first + timedelta(days=rng.randrange(365))
+        out.append({"Employee": f"emp{rng.randrange(2000)}", "Day": "", "Date": on, "Start": start,
+                    "End": start + rng.randrange(30, 8 * 60, 15), "Client": rng.choice(clients),
+                    "Location": rng.choice(sites)})
+    return out
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--blocks", type=int, default=200_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    blocks = _crew(args.blocks)
+    t = time.perf_counter()
+    index = OccupancyIndex(blocks)
+    t_build = time.perf_counter() - t
+
+    rng = random.Random(2)
+    queries = []
+    for _ in range(args.queries):
+        b = rng.choice(blocks)
+        queries.append((b["Location"], b["Start"], b["End"], b["Date"]))
+
+    def indexed():
+        return [index.at_location(loc, s, e, on_date=on) for loc, s, e, on in queries]
+
+    def scan():
+        out = []
+        for loc, s, e, on in queries:
+            qs, qe = OccupancyIndex.span({"Date": on, "Start": s, "End": e})
+            out.append([b for b in blocks if b["Location"] == loc
+                        and OccupancyIndex.span(b)[0] < qe and qs < OccupancyIndex.span(b)[1]])
+        return out
+
+    if indexed() != scan():
+        print("MISMATCH: indexed queries differ from the linear scan")
+        return 1
+    t_query = best_of(indexed, args.repeat)
+    t_scan = best_of(scan, 1)
+    t_conf = best_of(lambda: index.conflicts(by="Client"), args.repeat)
+    pairs = len(index.conflicts(by="Client"))
+
+    print(f"{args.blocks:,} blocks, {args.queries} location queries")
+    print(f"build       {t_build:7.3f}s")
+    print(f"queries     {t_query:7.3f}s  (linear scan {t_scan:.3f}s, {t_scan / t_query:.0f}x)")
+    print(f"conflicts   {t_conf:7.3f}s  {pairs:,} client pair(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
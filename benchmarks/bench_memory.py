@@ -0,0 +1,94 @@
+"""
+benchmarks/bench_memory.py
+
+Peak memory per pipeline stage on a large generated log, with budgets.
+
+Runs the CLI's streaming parse (stages -> CSV sink) under MemoryProfiler
+and checks each stage's peak against STAGE_BUDGETS, in bytes per line of
+one batch: stages stream batches, so their peaks must not grow with the
+input. The whole parse is also held to PARSE_BUDGET bytes per batch line.
+Exits 1 if any budget is exceeded, so memory regressions fail loudly.
+
+    python benchmarks/bench_memory.py [--lines N] [--batch-lines N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import generate_log
+
+from core.parser import WorkHourParser
+from core.pipeline import DEFAULT_BATCH, Pipeline
+from infra.memprofile import MemoryProfiler
+from pdio.sinks import SinkFanOut
+from pdio.writer import CsvWriter
+
+# Bytes per batch line; about 2.5x the peaks measured at 256-line batches
+STAGE_BUDGETS = {
+    "parse/read": 512,
+    "parse/clean": 1024,
+    "parse/segment": 2048,
+    "parse/extract": 5120,
+    "parse/policy": 5120,
+    "parse/format": 6144,
+    "parse/sinks": 2048,
+}
+PARSE_BUDGET = 12288
+
+
+def profile_parse(raw, out_path, batch_lines=DEFAULT_BATCH):
+    """MemoryProfiler stages of one streaming parse of raw into a CSV."""
+    mem = MemoryProfiler(enabled=True).start()
+    try:
+        pipe = mem.watch(Pipeline(WorkHourParser(), batch_size=batch_lines), prefix="parse/")
+        fan = SinkFanOut([CsvWriter(out_path)], threaded=False)
+        pipe.tap("format", mem.track("parse/sinks", fan.write))
+        with mem.stage("parse"):
+            for _ in pipe.run(raw):
+                pass
+        fan.close()
+    finally:
+        mem.stop()
+    return {st.name: st for st in mem.stages}
+
+
+def over_budget(stages, batch_lines):
+    """[(stage, bytes per batch line, budget)] for stages over their budget."""
+    budgets = dict(STAGE_BUDGETS, parse=PARSE_BUDGET)
+    out = []
+    for name, budget in budgets.items():
+        per_line = stages[name].peak / float(batch_lines)
+        if per_line > budget:
+            out.append((name, per_line, budget))
+    return out
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--lines", type=int, default=50000)
+    ap.add_argument("--batch-lines", type=int, default=DEFAULT_BATCH)
+    args = ap.parse_args(argv)
+
+    raw = generate_log(args.lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        t = time.perf_counter()
+        stages = profile_parse(raw, Path(tmp) / "cpd.csv", args.batch_lines)
+        elapsed = time.perf_counter() - t
+
+    print(f"{args.lines} lines, {args.batch_lines}-line batches, {elapsed:.1f}s traced")
+    budgets = dict(STAGE_BUDGETS, parse=PARSE_BUDGET)
+    for name, budget in budgets.items():
+        peak = stages[name].peak
+        print(f"{name:<14} peak {peak / 1024:8.1f} KiB  {peak / args.batch_lines:7.0f} B/batch line"
+              f"  (budget {budget})")
+    over = over_budget(stages, args.batch_lines)
+    for name, per_line, budget in over:
+        print(f"OVER BUDGET: {name} at {per_line:.0f} B/batch line (budget {budget})")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""
+benchmarks/bench_parse_many.py
+
+WorkHourParser.parse_many: sequential vs one shared instance on a
+ThreadPoolExecutor, with a reject sink attached. Checks both give the same
+rows. On a GIL build the threaded run is expected to be about as fast as
+the sequential one (parsing is CPU-bound); on free-threaded builds it
+scales with the workers.
+
+    python benchmarks/bench_parse_many.py [--texts N] [--lines N] [--workers N]
+"""
+
+import argparse
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from _common import best_of, generate_log
+
+from core.parser import WorkHourParser
+from pdio.rejects import RejectSink
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--texts", type=int, default=64)
+    ap.add_argument("--lines", type=int, default=500)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    texts = [generate_log(args.lines, seed=i) for i in range(args.texts)]
+    sources = [f"log{i}.txt" for i in range(args.texts)]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{args.texts} texts x {args.lines} lines, {args.workers} threads, GIL {'on' if gil else 'off'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = RejectSink(Path(tmp) / "rejects.csv")
+        parser = WorkHourParser(diagnostics=sink)
+        results = {}
+
+        def sequential():
+            results["seq"] = parser.parse_many(texts, sources=sources)
+
+        def threaded():
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                results["threads"] = parser.parse_many(texts, executor=pool, sources=sources)
+
+        t_seq = best_of(sequential, args.repeat)
+        t_thr = best_of(threaded, args.repeat)
+        sink.close()
+
+    if results["seq"] != results["threads"]:
+        print("MISMATCH: threaded rows differ from sequential")
+        return 1
+    total = args.texts * args.lines
+    for label, t in (("sequential", t_seq), ("threads", t_thr)):
+        print(f"{label:<11} {t:7.3f}s  {total / t:10,.0f} lines/s")
+    print(f"speedup     {t_seq / t_thr:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
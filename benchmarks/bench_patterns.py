@@ -0,0 +1,66 @@
+"""
+benchmarks/bench_patterns.py
+
+Adversarial lines for the extraction patterns (LOC_AT, CLIENT_FOR,
+CLIENT_WITH), FieldExtractors.task_after_client and the whole parser.
+Each case is timed at doubling lengths. A linear scan roughly doubles its
+time per step; the script exits 1 if any step grows by more than 3x
+(quadratic would be about 4x).
+
+    python benchmarks/bench_patterns.py [--start CHARS] [--steps N]
+"""
+
+import argparse
+import sys
+
+from _common import best_of
+
+from core.parser import WorkHourParser
+from patterns.patterns import CLIENT_FOR, CLIENT_WITH, LOC_AT
+from utils.extractors import FieldExtractors
+
+# name -> (callable, line factory taking a repeat count)
+CASES = {
+    "for-repeat/no-comma": (CLIENT_FOR.search, lambda n: "for a " * n),
+    "with-trailing-dashes": (CLIENT_WITH.search, lambda n: "with a" + " -" * n + " ,"),
+    "at-then-spaces": (LOC_AT.search, lambda n: "at" + " " * n + "!"),
+    "at-repeat/no-alnum": (LOC_AT.search, lambda n: "at - " * n),
+    "task-after-client/no-comma": (FieldExtractors.task_after_client, lambda n: "with bb " * n),
+    "task-after-client/late-comma": (FieldExtractors.task_after_client, lambda n: "for x " * n + ", done"),
+    "parse/for-repeat": (WorkHourParser().parse, lambda n: "Mon 0900-1700 " + "for a " * n),
+    "parse/eq-with-repeat": (WorkHourParser().parse, lambda n: "Mon 0900-1700 = " + "with bb " * n),
+    "parse/modifier-segment": (WorkHourParser().parse, lambda n: "Mon 0900-1700 at X | " + "for zz " * n),
+}
+MAX_GROWTH = 3.0
+
+
+def scaling(fn, make, start, steps):
+    """[(chars, seconds)] at start, 2*start, ... repeats."""
+    out = []
+    for i in range(steps):
+        line = make(start << i)
+        out.append((len(line), best_of(lambda: fn(line), 3)))
+    return out
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--start", type=int, default=2000, help="repeats at the first step")
+    ap.add_argument("--steps", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    failed = []
+    for name, (fn, make) in CASES.items():
+        timings = scaling(fn, make, args.start, args.steps)
+        growth = max(b / max(a, 1e-4) for (_, a), (_, b) in zip(timings, timings[1:]))
+        cells = "  ".join(f"{n // 1000}k:{t * 1000:.1f}ms" for n, t in timings)
+        print(f"{name:<30} {cells}  max x{growth:.1f}")
+        if growth > MAX_GROWTH:
+            failed.append(name)
+    for name in failed:
+        print(f"SUPER-LINEAR: {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
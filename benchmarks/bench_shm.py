@@ -0,0 +1,83 @@
+"""
+benchmarks/bench_shm.py
+
+ProcessParsePool result transfer: columnar shared memory ("shm") vs
+pickled row/block lists ("pickle"). Each run parses the same files and
+consumes every row and block in the parent; the two transfers must agree
+(up to the snapshot's 1/100 hour resolution). Parsing dominates on few
+cores, so the gap is widest with many workers feeding one parent.
+
+    python benchmarks/bench_shm.py [--lines N] [--files N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import generate_log
+
+from core.parser import WorkHourParser
+from core.procpool import ProcessParsePool
+
+
+def _consume(pool, paths):
+    rows, blocks = [], []
+    t = time.perf_counter()
+    for res in pool.map(paths):
+        with res:
+            rows.extend(res.rows)
+            blocks.extend(res.iter_blocks())
+    return time.perf_counter() - t, rows, blocks
+
+
+def _same(a, b):
+    """Equal up to the snapshot's 1/100 hour resolution."""
+    def norm(recs):
+        return [{k: round(v, 2) if isinstance(v, float) else v for k, v in r.items()} for r in recs]
+    return norm(a) == norm(b)
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    ap.add_argument("--lines", type=int, default=1_000_000, help="total lines across all files")
+    ap.add_argument("--files", type=int, default=32)
+    ap.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args(argv)
+    if os.name == "nt":
+        print("Windows always uses the pickle transfer; nothing to compare")
+        return 0
+
+    per_file = max(1, args.lines // args.files)
+    parser = WorkHourParser()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            p = Path(tmp) / f"emp{i}.txt"
+            p.write_text(generate_log(per_file, seed=i), encoding="utf-8")
+            paths.append(p)
+        print(f"{args.files} files x {per_file} lines, workers={args.workers or os.cpu_count()}")
+
+        results = {}
+        for transfer in ("pickle", "shm"):
+            pool = ProcessParsePool(parser, workers=args.workers, transfer=transfer)
+            runs = [_consume(pool, paths) for _ in range(args.repeat)]
+            results[transfer] = (min(r[0] for r in runs), runs[-1][1], runs[-1][2])
+
+    (t_pk, rows_pk, blocks_pk), (t_shm, rows_shm, blocks_shm) = results["pickle"], results["shm"]
+    if not (_same(rows_pk, rows_shm) and _same(blocks_pk, blocks_shm)):
+        print("MISMATCH: shared-memory results differ from pickled ones")
+        return 1
+    total = per_file * args.files
+    print(f"{len(rows_shm):,} rows, {len(blocks_shm):,} blocks")
+    for label, t in (("pickle", t_pk), ("shm", t_shm)):
+        print(f"{label:<7} {t:7.3f}s  {total / t:10,.0f} lines/s")
+    print(f"speedup {t_pk / t_shm:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
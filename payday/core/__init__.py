@@ -1,5 +1,15 @@
 #payday\core\__init__.py
 
+from .anomaly import AnomalyDetector
+from .compat import ChainpayParser
+from .dedupe import DuplicateFilter
+from .grammar import GrammarParser, InputGrammar
+from .intervals import IntervalTree, OccupancyIndex
 from .parser import WorkHourParser
+from .pipeline import Pipeline
+from .procpool import ParseResult, ProcessParsePool
+from .structured import StructuredLogParser
 
-__all__ = ["WorkHourParser"]
+__all__ = ["WorkHourParser", "Pipeline", "StructuredLogParser", "ProcessParsePool", "ParseResult",
+           "ChainpayParser", "IntervalTree", "OccupancyIndex", "DuplicateFilter",
+           "AnomalyDetector", "InputGrammar", "GrammarParser"]
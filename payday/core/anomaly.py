@@ -0,0 +1,208 @@
+"""
+core/anomaly.py
+
+Streaming anomaly detection on parsed hours, run as a Pipeline stage.
+
+- Fixed rules, no history needed: blocks longer than max_block_hours (e.g.
+  a missing am/pm turning 0800-0500 into a 21h overnight span), and a day
+  repeating or overlapping its own blocks
+- Baselines per key, O(1) memory each: Welford mean/std plus P-square
+  quartile sketches (utils/streamstats.py) of
+    employee -> net day hours   (employee = input file stem)
+    weekday  -> net day hours
+    client   -> block hours
+- A value is an outlier once its key has min_count observations and it is
+  both more than z_max standard deviations from the mean and outside the
+  Tukey far-out fence (Q1 - 3*IQR, Q3 + 3*IQR); std and IQR are floored at
+  half an hour so near-constant baselines do not flag every small change
+- Flagged values are reported, not dropped, and are kept out of the
+  baselines so one bad log does not widen them
+- save_state()/load_state(): baselines as JSON, carried across runs
+"""
+
+import json
+import os
+from pathlib import Path
+
+from utils.streamstats import P2Quantile, RunningStats
+
+DEFAULT_ANOMALY_Z = 4.0
+DEFAULT_ANOMALY_MIN_COUNT = 8
+DEFAULT_MAX_BLOCK_HOURS = 16.0
+
+RULE_LONG_BLOCK = "long_block"
+RULE_DUPLICATE_BLOCK = "duplicate_block"
+RULE_OVERLAPPING_BLOCK = "overlapping_block"
+RULE_OUTLIER = "outlier"
+
+_STATE_VERSION = 1
+_MIN_SPREAD = 0.5  # hours
+_FENCE = 3.0
+
+
+class Baseline:
+    """Running mean/std and quartiles of one key's values."""
+
+    __slots__ = ("stats", "q1", "q3")
+
+    def __init__(self, stats=None, q1=None, q3=None):
+        self.stats = stats or RunningStats()
+        self.q1 = q1 or P2Quantile(0.25)
+        self.q3 = q3 or P2Quantile(0.75)
+
+    def add(self, x):
+        self.stats.add(x)
+        self.q1.add(x)
+        self.q3.add(x)
+
+    def is_outlier(self, x, z_max, min_count):
+        stats = self.stats
+        if stats.n < min_count:
+            return False
+        if abs(x - stats.mean) <= z_max * max(stats.std, _MIN_SPREAD):
+            return False
+        q1, q3 = self.q1.value(), self.q3.value()
+        spread = _FENCE * max(q3 - q1, _MIN_SPREAD)
+        return x < q1 - spread or x > q3 + spread
+
+    def summary(self):
+        """(count, mean, std, q1, q3) for reports."""
+        return self.stats.n, self.stats.mean, self.stats.std, self.q1.value(), self.q3.value()
+
+    def to_state(self):
+        return {"stats": self.stats.to_state(), "q1": self.q1.to_state(), "q3": self.q3.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(RunningStats.from_state(state["stats"]), P2Quantile.from_state(state["q1"]),
+                   P2Quantile.from_state(state["q3"]))
+
+
+class AnomalyDetector:
+    """
+    Flags outlier days/blocks as they stream past; one instance spans a run.
+
+    Usage:
+        detector = AnomalyDetector(report=AnomalyReport(path))
+        detector.load_state(state_path)          # optional
+        pipe = detector.attach(Pipeline(parser))
+        rows = pipe.collect(pipe.run(raw, source=path))
+        detector.save_state(state_path)
+    """
+
+    def __init__(self, z_max=DEFAULT_ANOMALY_Z, min_count=DEFAULT_ANOMALY_MIN_COUNT,
+                 max_block_hours=DEFAULT_MAX_BLOCK_HOURS, report=None):
+        if z_max <= 0 or max_block_hours <= 0:
+            raise ValueError("Anomaly z threshold and max block hours must be positive")
+        self.z_max = float(z_max)
+        self.min_count = max(2, int(min_count))
+        self.max_block_hours = float(max_block_hours)
+        self.report = report
+        self.baselines = {}  # (dimension, name, metric) -> Baseline
+        self.days = 0
+        self.flagged = 0
+
+    # ----- State -----
+    def load_state(self, path):
+        """Merge baselines saved by an earlier run (missing file: start empty)."""
+        path = Path(path)
+        if not path.exists():
+            return self
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != _STATE_VERSION:
+            raise ValueError(f"Unsupported anomaly state version in {path}: {data.get('version')!r}")
+        for entry in data.get("baselines", []):
+            key = (entry["dimension"], entry["name"], entry["metric"])
+            self.baselines[key] = Baseline.from_state(entry)
+        return self
+
+    def save_state(self, path):
+        """Write baselines as JSON (temp file + rename, so a crash never leaves half a state)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for (dimension, name, metric), baseline in sorted(self.baselines.items()):
+            entry = {"dimension": dimension, "name": name, "metric": metric}
+            entry.update(baseline.to_state())
+            entries.append(entry)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": _STATE_VERSION, "baselines": entries}, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    # ----- Detection -----
+    def _baseline(self, key):
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            baseline = self.baselines[key] = Baseline()
+        return baseline
+
+    def _flag(self, source, day, on_date, time_blocks, scope, rule, hours, key=None, baseline=None):
+        self.flagged += 1
+        if self.report is not None:
+            label = "%s:%s" % key[:2] if key else ""
+            self.report.record(source, day, on_date, time_blocks, scope, rule, hours, label,
+                               baseline.summary() if baseline is not None else None)
+
+    def observe(self, source, employee, day, blocks, net_hours):
+        """Check one parsed day against the rules and baselines, then learn from it."""
+        self.days += 1
+        on_date = blocks[0].get("date") if blocks else None
+        day_ok = True
+        learn = []
+
+        spans = set()
+        for b in sorted(blocks, key=lambda b: b["_s_dt"]):
+            hours = b["hours"]
+            span = (b["_s_dt"], b["_e_dt"])
+            if hours > self.max_block_hours:
+                self._flag(source, day, on_date, b["time"], "block", RULE_LONG_BLOCK, hours)
+                day_ok = False
+                continue
+            if span in spans:
+                self._flag(source, day, on_date, b["time"], "block", RULE_DUPLICATE_BLOCK, hours)
+                day_ok = False
+                continue
+            if any(s < span[1] and span[0] < e for s, e in spans):
+                self._flag(source, day, on_date, b["time"], "block", RULE_OVERLAPPING_BLOCK, hours)
+                day_ok = False
+            spans.add(span)
+            client = b["client"]
+            if client and client != "NaN":
+                key = ("client", client.casefold(), "block_hours")
+                baseline = self._baseline(key)
+                if baseline.is_outlier(hours, self.z_max, self.min_count):
+                    self._flag(source, day, on_date, b["time"], "block", RULE_OUTLIER, hours, key, baseline)
+                    day_ok = False
+                else:
+                    learn.append((baseline, hours))
+
+        time_blocks = ", ".join(b["time"] for b in blocks)
+        for key in (("employee", employee, "day_hours"), ("weekday", day.capitalize(), "day_hours")):
+            baseline = self._baseline(key)
+            if baseline.is_outlier(net_hours, self.z_max, self.min_count):
+                self._flag(source, day, on_date, time_blocks, "day", RULE_OUTLIER, net_hours, key, baseline)
+                day_ok = False
+            else:
+                learn.append((baseline, net_hours))
+
+        # A day with any finding teaches nothing: its other values may be skewed too
+        if day_ok:
+            for baseline, value in learn:
+                baseline.add(value)
+        return day_ok
+
+    # ----- Stage -----
+    def attach(self, pipe):
+        """Insert the anomaly stage after the last stage before "format"."""
+        return pipe.insert_after(pipe.stage_names[-2], "anomaly", self.stage)
+
+    def stage(self, batches, ctx):
+        """Passes (day, blocks, net_hours) batches through unchanged, observing each day."""
+        observe, source = self.observe, ctx.source
+        employee = Path(source).stem
+        for batch in batches:
+            for day, blocks, net in batch:
+                observe(source, employee, day, blocks, net)
+            yield batch
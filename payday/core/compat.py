@@ -0,0 +1,170 @@
+"""
+core/compat.py
+
+Compatibility profile reproducing the legacy chainpay.py output byte for
+byte on top of the payday engine.
+
+- Same line splitting, day/time patterns, time parsing, hour rounding and
+  CSV layout as the engine (shared code, not copies)
+- Legacy differences kept as small overrides:
+  * Day is lower-case ("monday"); no title/sentence casing of fields
+  * Time-range segments take their task only from free text before the
+    first at/for/with; no "client, task" or "at site, task" tails
+  * Modifier "for CLIENT, TASK" tails are str.title()'d
+  * "at" chunks are cut at for/with without the comma look-ahead fallback
+  * No covering-block dedupe
+  * Lunch: explicit > negative > positive cue, default no deduction;
+    "(lunch)" appended to the first task without a space
+- CHAINPAY_WATERMARK / CHAINPAY_OUTPUT: legacy footer and file name
+"""
+
+import re
+
+from core.parser import WorkHourParser
+from patterns.patterns import CLIENT_FOR, CLIENT_WITH, LOC_AT, LUNCH_NO
+from pdio.rejects import REASON_NO_TIME_RANGE, REASON_SEGMENT_BEFORE_BLOCK
+from policies.policies import Policies
+from policies.rules import BreakPolicy, BreakRule, PolicyRuleSet
+from utils.extractors import FieldExtractors
+from utils.textutils import TextTools
+from utils.timeparse import TimeParser
+
+CHAINPAY_WATERMARK = "Compiled with chainpay.py by webbaby https://github.com/vebbaybi/chainpay/blob/main/chainpay.py"
+CHAINPAY_OUTPUT = "work hour.csv"
+
+# Legacy positive cue: "30mins" but not "30 mins" (patterns.LUNCH_POS accepts both)
+_LEGACY_LUNCH_POS = r"\b(lunch|break|30\s*min|30mins|30\s*minutes)\b"
+
+
+def chainpay_rules():
+    """The legacy lunch decision as a rule set (0.5h, annotate on yes/positive, default off)."""
+    lunch = BreakPolicy(
+        "lunch",
+        rules=[
+            BreakRule(r"\blunch\s*[:=]\s*(?:no|n)\b", priority=0, deduct=False),
+            BreakRule(r"\blunch\s*[:=]\s*(?:yes|y)\b", priority=0, deduct=True, annotate=True),
+            BreakRule(LUNCH_NO.pattern, priority=1, deduct=False),
+            BreakRule(_LEGACY_LUNCH_POS, priority=2, deduct=True, annotate=True),
+        ],
+        deduct_hours=0.5,
+        annotate="(lunch)",
+        default=False,
+    )
+    return PolicyRuleSet([lunch])
+
+
+class LegacyFieldExtractors(FieldExtractors):
+    """FieldExtractors with the legacy 'at' chunk split (parse_eq_tail picks it up via cls)."""
+
+    @staticmethod
+    def split_loc_task_from_at_chunk(chunk):
+        part = TextTools.clean_text(chunk)
+        part = re.split(r"\b(?:for|with)\b", part, flags=re.IGNORECASE)[0].strip()
+        if "," in part:
+            loc, rest = part.split(",", 1)
+            return TextTools.clean_text(loc), TextTools.clean_text(rest)
+        return TextTools.clean_text(part), ""
+
+
+class ChainpayParser(WorkHourParser):
+    """WorkHourParser running the chainpay.py compatibility profile."""
+
+    def __init__(self, policies=None, aliases=None, diagnostics=None, max_line_chars=None):
+        super().__init__(policies=policies or Policies(rules=chainpay_rules()), aliases=aliases,
+                         diagnostics=diagnostics, max_line_chars=max_line_chars)
+
+    def segment_line(self, line):
+        day, segments, break_scan = super().segment_line(line)
+        return day.lower(), segments, break_scan
+
+    def extract_blocks(self, segments, offset=0, raw_line="", rejects=None):
+        ex = LegacyFieldExtractors
+        blocks = []
+        orphans = []
+        for seg in segments:
+            tr = TimeParser.extract_time_range(seg)
+            if tr:
+                s_dt, e_dt, span, end_idx = tr
+                seg_tail = seg[end_idx:].strip()
+
+                location, client, task = "NaN", "NaN", "NaN"
+                if "=" in seg_tail:
+                    location, client, task = ex.parse_eq_tail(seg_tail.split("=", 1)[1].strip())
+                else:
+                    at_chunk = ex.extract_first(seg_tail, LOC_AT)
+                    if at_chunk:
+                        loc_val, _ = ex.split_loc_task_from_at_chunk(at_chunk)
+                        if loc_val:
+                            location = loc_val
+                    client_candidate = ex.extract_first(seg_tail, CLIENT_FOR) or ex.extract_first(seg_tail, CLIENT_WITH)
+                    if client_candidate:
+                        client = client_candidate
+
+                    before_directive = re.split(r"\b(?:at|with|for)\b", seg_tail, flags=re.IGNORECASE)[0]
+                    before_directive = TextTools.clean_text(before_directive.strip("-: ,"))
+                    before_directive = re.sub(r"^\d{3,4}\s*-\s*\d{3,4}\s*", "", before_directive)
+                    task = before_directive or "NaN"
+
+                blocks.append({
+                    "time": span,
+                    "location": location,
+                    "task": task,
+                    "client": client,
+                    "hours": round((e_dt - s_dt).total_seconds() / 3600.0, 2),
+                    "_s_dt": s_dt,
+                    "_e_dt": e_dt,
+                })
+            elif not blocks:
+                orphans.append(seg)
+            else:
+                # Modifier: applies only to the most recent block on this line
+                blk = blocks[-1]
+                at_chunk = ex.extract_first(seg, LOC_AT)
+                if at_chunk:
+                    loc_val, tail_task = ex.split_loc_task_from_at_chunk(at_chunk)
+                    if blk["location"] == "NaN" and loc_val:
+                        blk["location"] = loc_val
+                    if blk["task"] == "NaN" and tail_task:
+                        blk["task"] = tail_task
+
+                client_candidate = ex.extract_first(seg, CLIENT_FOR) or ex.extract_first(seg, CLIENT_WITH)
+                if blk["client"] == "NaN" and client_candidate:
+                    blk["client"] = client_candidate
+
+                if blk["task"] == "NaN":
+                    task_after_client = ex.task_after_client(seg)
+                    if task_after_client is not None:
+                        blk["task"] = TextTools.clean_text(task_after_client).title()
+
+        if rejects is not None:
+            if not blocks:
+                rejects.record(offset, REASON_NO_TIME_RANGE, raw_line)
+            else:
+                for seg in orphans:
+                    rejects.record(offset, REASON_SEGMENT_BEFORE_BLOCK, seg)
+        return blocks
+
+    def finish_blocks(self, blocks, break_scan):
+        if self.aliases is not None:
+            self.aliases.apply(blocks)
+
+        total_hours = self.policies.sum_hours(blocks)
+        deduction, notes = self.policies.decide_breaks(break_scan, blocks, total_hours)
+        for note in notes:
+            if blocks[0]["task"] != "NaN" and note.lower() not in blocks[0]["task"].lower():
+                blocks[0]["task"] = blocks[0]["task"] + note
+        if deduction:
+            total_hours = round(max(0.0, total_hours - deduction), 2)
+        return blocks, total_hours
+
+    @staticmethod
+    def format_row(day, blocks, total_hours):
+        """Legacy row: fields joined as extracted (no casing)."""
+        return {
+            "Day": day,
+            "TimeBlocks": ", ".join(b["time"] for b in blocks) or "NaN",
+            "Location": ", ".join(b["location"] for b in blocks) or "NaN",
+            "Tasks/Details": ", ".join(b["task"] for b in blocks) or "NaN",
+            "Client(s)": ", ".join(b["client"] for b in blocks) or "NaN",
+            "Hours": total_hours,
+        }
@@ -0,0 +1,201 @@
+"""
+core/dedupe.py
+
+Streaming duplicate-submission filter, run as a Pipeline stage.
+
+- Fingerprints each day record: its normalized line (key="line": casefolded
+  day + segments, checked right after "segment", before any extraction) or
+  its canonical block tuple (key="blocks": day, date, start/duration,
+  location, client, task per block, checked after "policy")
+- scope="employee" (default) matches within one employee (input file
+  stem); scope="global" also catches a day pasted into several employees'
+  files
+- Block keys check only dated days by default: free-text logs carry day
+  names only, and the same weekday with the same hours repeats every week.
+  undated=True opts in to matching undated days; otherwise they pass
+  through and are counted in `undated`. Line keys never carry a date and
+  always compare the normalized line, so choosing key="line" is the opt-in
+  for free-text logs
+- Exact 128-bit digests until they would outgrow memory_budget bytes, then
+  a scalable Bloom filter with false-positive rate fp_rate: memory stays
+  bounded, at the price of "probable" (not certain) matches from then on
+- Duplicates are dropped from the stream, so they never reach rows or the
+  TOTAL, and go to a DuplicateReport instead
+"""
+
+import hashlib
+from pathlib import Path
+
+from pdio.duplicates import MATCH_EXACT, MATCH_PROBABLE
+from utils.bloom import ScalableBloomFilter
+
+DEDUPE_KEYS = ("line", "blocks")
+DEDUPE_SCOPES = ("global", "employee")
+DEFAULT_DEDUPE_MEMORY = 64 << 20
+DEFAULT_DEDUPE_FP = 1e-6
+
+# Measured cost of one exact entry: 16-byte digest key, dict slot, source id
+_EXACT_ENTRY_BYTES = 104
+_FIELD_SEP = "\x1f"
+_BLOCK_SEP = "\x1e"
+
+
+class DuplicateFilter:
+    """
+    Cross-input duplicate detector; one instance spans a whole run.
+
+    Usage:
+        dedupe = DuplicateFilter(key="blocks", report=DuplicateReport(path))
+        for path, raw in inputs:
+            pipe = dedupe.attach(Pipeline(parser))
+            rows = pipe.collect(pipe.run(raw, source=path))
+    """
+
+    def __init__(self, key="blocks", scope="employee", memory_budget=DEFAULT_DEDUPE_MEMORY,
+                 fp_rate=DEFAULT_DEDUPE_FP, report=None, undated=False):
+        if key not in DEDUPE_KEYS:
+            raise ValueError(f"Unknown dedupe key: {key!r} (expected one of {', '.join(DEDUPE_KEYS)})")
+        if scope not in DEDUPE_SCOPES:
+            raise ValueError(f"Unknown dedupe scope: {scope!r} (expected one of {', '.join(DEDUPE_SCOPES)})")
+        if not 0.0 < fp_rate < 1.0:
+            raise ValueError(f"Dedupe false-positive rate must be between 0 and 1, got {fp_rate}")
+        self.key = key
+        self.scope = scope
+        self.fp_rate = fp_rate
+        self.max_exact = max(1, int(memory_budget) // _EXACT_ENTRY_BYTES)
+        self.report = report
+        self.match_undated = bool(undated) or key == "line"
+        self.checked = 0
+        self.undated = 0
+        self.duplicates = 0
+        self._exact = {}  # digest -> index into _sources (first sighting)
+        self._sources = []
+        self._source_ids = {}
+        self._bloom = None
+
+    @property
+    def mode(self):
+        return "exact" if self._bloom is None else "bloom"
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the fingerprint store."""
+        if self._bloom is not None:
+            return self._bloom.nbytes
+        return len(self._exact) * _EXACT_ENTRY_BYTES
+
+    def check(self, fingerprint, source=""):
+        """None for a first sighting, else (match, first source or "")."""
+        digest = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).digest()
+        self.checked += 1
+        if self._bloom is not None:
+            if self._bloom.add(digest):
+                self.duplicates += 1
+                return MATCH_PROBABLE, ""
+            return None
+        first = self._exact.get(digest)
+        if first is not None:
+            self.duplicates += 1
+            return MATCH_EXACT, self._sources[first]
+        self._exact[digest] = self._source_id(source)
+        if len(self._exact) > self.max_exact:
+            self._to_bloom()
+        return None
+
+    def _source_id(self, source):
+        sid = self._source_ids.get(source)
+        if sid is None:
+            sid = self._source_ids[source] = len(self._sources)
+            self._sources.append(source)
+        return sid
+
+    def _to_bloom(self):
+        # Seen digests move into the filter; their first sources are forgotten
+        bloom = ScalableBloomFilter(self.fp_rate, initial_capacity=max(1024, 2 * len(self._exact)))
+        for digest in self._exact:
+            bloom.add(digest)
+        self._bloom = bloom
+        self._exact = {}
+        self._sources = []
+        self._source_ids = {}
+
+    # ----- Fingerprints -----
+    def _scope_prefix(self, source):
+        return Path(source).stem + _FIELD_SEP if self.scope == "employee" else ""
+
+    @staticmethod
+    def line_key(day, segments):
+        """Normalized line: casefolded day and segments (already cleaned and split)."""
+        return _FIELD_SEP.join([day.casefold()] + [seg.casefold() for seg in segments])
+
+    @staticmethod
+    def blocks_key(day, blocks):
+        """Canonical block tuple of one day, independent of field casing."""
+        parts = [day.casefold()]
+        for b in blocks:
+            s_dt = b["_s_dt"]
+            d = b.get("date")
+            parts.append(_FIELD_SEP.join((
+                d.isoformat() if d else "",
+                str(s_dt.hour * 60 + s_dt.minute),
+                str(int((b["_e_dt"] - s_dt).total_seconds() // 60)),
+                b["location"].casefold(),
+                b["client"].casefold(),
+                b["task"].casefold(),
+            )))
+        return _BLOCK_SEP.join(parts)
+
+    # ----- Stages -----
+    def attach(self, pipe):
+        """Insert the dedupe stage into pipe (line keys need a "segment" stage; else block keys)."""
+        names = pipe.stage_names
+        if self.key == "line" and "segment" in names:
+            return pipe.insert_after("segment", "dedupe", self.line_stage)
+        return pipe.insert_after(names[names.index("format") - 1], "dedupe", self.day_stage)
+
+    def line_stage(self, batches, ctx):
+        """After "segment": drops (offset, raw_line, day, segments, break_scan) duplicates."""
+        if not self.match_undated:
+            for batch in batches:
+                self.undated += len(batch)
+                yield batch
+            return
+        check, report, source = self.check, self.report, ctx.source
+        prefix = self._scope_prefix(source)
+        raw, pos, line_no = ctx.raw_text, 0, 1
+        for batch in batches:
+            out = []
+            for item in batch:
+                offset, raw_line, day, segments, _ = item
+                dup = check(prefix + self.line_key(day, segments), source)
+                if dup is None:
+                    out.append(item)
+                    continue
+                if report is not None:
+                    line_no += raw.count("\n", pos, offset) + raw.count("\r", pos, offset) \
+                        - raw.count("\r\n", pos, offset)
+                    pos = offset
+                    report.record(source, line_no, dup[0], dup[1], day, text=raw_line)
+            if out:
+                yield out
+
+    def day_stage(self, batches, ctx):
+        """After "policy" (or "days"): drops (day, blocks, net_hours) duplicates."""
+        check, report, source = self.check, self.report, ctx.source
+        prefix = self._scope_prefix(source)
+        for batch in batches:
+            out = []
+            for item in batch:
+                day, blocks, net = item
+                if not self.match_undated and not any(b.get("date") for b in blocks):
+                    self.undated += 1
+                    out.append(item)
+                    continue
+                dup = check(prefix + self.blocks_key(day, blocks), source)
+                if dup is None:
+                    out.append(item)
+                elif report is not None:
+                    report.record(source, None, dup[0], dup[1], day,
+                                  ", ".join(b["time"] for b in blocks), net)
+            if out:
+                yield out
@@ -0,0 +1,207 @@
+"""
+core/diff.py
+
+Reconciliation diff between two timesheet runs.
+
+- Each run is a raw work log, a structured CSV/TSV/JSONL log (by extension,
+  as in --input-format auto) or a CSV output (cpd.csv); outputs are detected
+  by their "Day,TimeBlocks," header line, whatever the file name
+- Inputs are streamed: logs are parsed in line batches, structured logs
+  record by record (one day held at a time), CSV outputs row by row
+- Blocks are keyed by (employee, date-or-day, start, end) and hash-joined
+  (employee comes from an "Employee" CSV column when present):
+  the old run is the build side, the new run is probed against it
+- Reports added, removed and changed blocks in O(n + m); block records carry
+  the block's span hours
+- Paid hours are compared per (employee, date-or-day): net of break
+  deductions, as in the CSV "Hours" column (0.1 h resolution). A day whose
+  net hours moved gets an "hours" record, so e.g. "lunch: no" shows up even
+  when no block changed; the summary's hours_delta is the net paid change
+- CSV cells whose values themselves contain ", " cannot be split back per
+  block; such fields are treated as unknown and not compared
+"""
+
+import csv
+import itertools
+from collections import deque
+from pathlib import Path
+
+from core.parser import WorkHourParser
+from core.structured import StructuredLogParser, format_for_path
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+HOURS = "hours"
+
+_FIELDS = ("Location", "Task", "Client")
+_ROW_FIELDS = (("Location", "Location"), ("Task", "Tasks/Details"), ("Client", "Client(s)"))
+
+
+def _span_minutes(span):
+    """'0900-1700' -> (540, 1020); end past midnight is pushed past 1440."""
+    s_tok, e_tok = span.strip().split("-", 1)
+    start = int(s_tok[:2]) * 60 + int(s_tok[2:4])
+    end = int(e_tok[:2]) * 60 + int(e_tok[2:4])
+    if end <= start:
+        end += 1440
+    return start, end
+
+
+def _span_text(start, end):
+    end %= 1440
+    return "%02d%02d-%02d%02d" % (start // 60, start % 60, end // 60, end % 60)
+
+
+def _is_run_output(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return f.readline().lstrip("\ufeff").startswith("Day,TimeBlocks,")
+
+
+class BlockDiff:
+    """
+    Streams two runs and yields change records:
+      {"Change","Employee","Day","TimeBlock","Field","Old","New","HoursDelta"}
+    Totals are accumulated in self.summary while iterating. "hours" records
+    (Field "Hours", no TimeBlock) hold a day's old/new net hours.
+    """
+
+    def __init__(self, parser=None, batch_lines=10000):
+        self.parser = parser if parser else WorkHourParser()
+        self.batch_lines = max(1, int(batch_lines))
+        self.summary = {ADDED: 0, REMOVED: 0, CHANGED: 0, HOURS: 0, "unchanged": 0, "hours_delta": 0.0}
+
+    # ----- Block sources -----
+    def iter_blocks(self, path, day_hours=None):
+        """
+        Yield (key, attrs) for every block of a run file. If given, day_hours
+        ({(employee, day): net hours}) is filled as the days stream past.
+        """
+        path = Path(path)
+        if day_hours is None:
+            day_hours = {}
+        if _is_run_output(path):
+            return self._iter_csv_blocks(path, day_hours)
+        fmt = format_for_path(path)
+        if fmt is not None:
+            return self._iter_structured_blocks(path, fmt, day_hours)
+        return self._iter_log_blocks(path, day_hours)
+
+    def _iter_csv_blocks(self, path, day_hours):
+        with path.open(encoding="utf-8", newline="") as f:
+            rows = csv.DictReader(line for line in f if not line.startswith("#"))
+            for row in rows:
+                day = row.get("Date") or row.get("Day") or "Unknown"
+                if day == "TOTAL" or not row.get("TimeBlocks") or row["TimeBlocks"] == "NaN":
+                    continue
+                emp = row.get("Employee", "")
+                try:
+                    net = float(row.get("Hours") or 0)
+                except ValueError:
+                    net = 0.0
+                day_hours[(emp, day)] = day_hours.get((emp, day), 0.0) + net
+                spans = row["TimeBlocks"].split(", ")
+                cols = []
+                for _, col in _ROW_FIELDS:
+                    parts = (row.get(col) or "NaN").split(", ")
+                    # Values containing ", " cannot be split back per block: unknown (None)
+                    cols.append(parts if len(parts) == len(spans) else [None] * len(spans))
+                for i, span in enumerate(spans):
+                    start, end = _span_minutes(span)
+                    yield (emp, day, start, end), (cols[0][i], cols[1][i], cols[2][i])
+
+    def _iter_log_blocks(self, path, day_hours):
+        with path.open(encoding="utf-8", newline="") as f:
+            while True:
+                chunk = "".join(itertools.islice(f, self.batch_lines))
+                if not chunk:
+                    return
+                yield from self._keyed(self.parser, self.parser.iter_days(chunk, str(path)), day_hours)
+
+    def _iter_structured_blocks(self, path, fmt, day_hours):
+        parser = StructuredLogParser(fmt, policies=self.parser.policies, aliases=self.parser.aliases)
+        with path.open(encoding="utf-8", newline="") as f:
+            yield from self._keyed(parser, parser.iter_stream_days(f), day_hours)
+
+    @staticmethod
+    def _keyed(parser, days, day_hours):
+        # A raw log is one employee's sheet; the key must not depend on its file name
+        emp = ""
+        for day, blocks, hours in days:
+            recs = parser.block_records(day, blocks, hours)
+            if not recs:
+                continue
+            key_day = recs[0]["Date"].isoformat() if recs[0]["Date"] else recs[0]["Day"]
+            # Rounded per day like the CSV "Hours" cell, so a log and its output agree
+            day_hours[(emp, key_day)] = day_hours.get((emp, key_day), 0.0) + round(hours, 1)
+            for rec in recs:
+                key_day = rec["Date"].isoformat() if rec["Date"] else rec["Day"]
+                yield (emp, key_day, rec["Start"], rec["End"]), (rec["Location"], rec["Task"], rec["Client"])
+
+    # ----- Join -----
+    def _record(self, change, key, field="", old="", new="", delta=0.0, count=True):
+        emp, day, start, end = key
+        if count:
+            self.summary[change] += 1
+        return {
+            "Change": change,
+            "Employee": emp,
+            "Day": day,
+            "TimeBlock": _span_text(start, end),
+            "Field": field,
+            "Old": old,
+            "New": new,
+            "HoursDelta": delta,
+        }
+
+    def _hours_record(self, emp, day, old, new):
+        delta = round(new - old, 2)
+        self.summary[HOURS] += 1
+        self.summary["hours_delta"] = round(self.summary["hours_delta"] + delta, 2)
+        return {
+            "Change": HOURS,
+            "Employee": emp,
+            "Day": day,
+            "TimeBlock": "",
+            "Field": "Hours",
+            "Old": round(old, 2),
+            "New": round(new, 2),
+            "HoursDelta": delta,
+        }
+
+    def diff(self, old_path, new_path):
+        """Yield change records: added/changed blocks, removed blocks, then day hours."""
+        old_hours, new_hours = {}, {}
+        build = {}
+        for key, attrs in self.iter_blocks(old_path, old_hours):
+            q = build.get(key)
+            if q is None:
+                q = build[key] = deque()
+            q.append(attrs)
+
+        for key, attrs in self.iter_blocks(new_path, new_hours):
+            q = build.get(key)
+            if not q:
+                yield self._record(ADDED, key, delta=round((key[3] - key[2]) / 60.0, 2))
+                continue
+            old = q.popleft()
+            first = True
+            for name, o, n in zip(_FIELDS, old, attrs):
+                # None = not recoverable from a CSV cell; never reported as a change
+                if o != n and o is not None and n is not None:
+                    yield self._record(CHANGED, key, name, o, n, count=first)
+                    first = False
+            if first:
+                self.summary["unchanged"] += 1
+
+        for key, q in build.items():
+            for _ in q:
+                yield self._record(REMOVED, key, delta=-round((key[3] - key[2]) / 60.0, 2))
+
+        for day_key, new in new_hours.items():
+            old = old_hours.pop(day_key, 0.0)
+            if round(new, 1) != round(old, 1):
+                yield self._hours_record(*day_key, old, new)
+        for day_key, old in old_hours.items():
+            if round(old, 1):
+                yield self._hours_record(*day_key, old, 0.0)
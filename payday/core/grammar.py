@@ -0,0 +1,294 @@
+"""
+core/grammar.py
+
+Declarative input grammars for crews whose shorthand WorkHourParser does not
+read (e.g. "Mon 7-3:30 @site/client: task"), compiled once into a
+specialized parser.
+
+- InputGrammar: validates a grammar config and compiles it into a day-token
+  regex, a time-range regex built only from the configured time formats, a
+  segment splitter (plain str.split for a single separator) and one
+  directive-marker regex with a named group per field
+- GrammarParser: WorkHourParser with segment_line/extract_blocks driven by
+  the compiled grammar; cleaning, policies, aliases, rejects, casing and
+  the Pipeline stages are the built-in ones
+- matches(path): which inputs a grammar applies to ("files" globs), so
+  batch mode can pick a grammar per input file
+
+Grammar file (JSON):
+    {
+      "name": "crew-b",
+      "files": ["crew-b/*", "*-crewb.txt"],
+      "days": {"mon": "Monday", "tue": "Tuesday"},
+      "separators": ["|", ";"],
+      "time": {"formats": ["H", "H:MM", "HHMM"], "range": ["-", "to"],
+               "clock": "12h", "day_start": 6},
+      "directives": {"location": ["@"], "client": ["/"], "task": [":"]}
+    }
+
+Only "name" is required. Defaults: built-in day names and abbreviations,
+"|" separators, formats HHMM/H:MM, "-"/"to" ranges, 24h clock, and the
+built-in at/for/with directives (word markers).
+Time formats: "HHMM" (0730), "HMM" (730), "H:MM" (7:30), "H.MM" (7.30),
+"H" (7); every format also takes an am/pm (or a/p) suffix. With "clock":
+"12h", times without a suffix are read on a 12-hour dial: a start before
+day_start is afternoon (1-5 is 13:00-17:00) and an end at or before the
+start moves 12 hours later (7-3:30 is 07:00-15:30). A range that still ends
+at or before its start runs past midnight, as in the built-in parser.
+
+Segment fields: the first time range in a segment opens a block; the text
+after it is cut at the first marker of each field, each value running to
+the next such marker (a repeated marker stays part of the value, so
+"@site: a:b" has task "a:b"). Text before the first marker is the task
+unless a task directive is given. Segments without a time range fill the
+previous block's missing location/client/task from their directives.
+"""
+
+import fnmatch
+import json
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path, PurePath
+
+from core.parser import WorkHourParser
+from infra.constants import DAY_MAPPING, DAY_NAMES
+from pdio.rejects import REASON_NO_TIME_RANGE, REASON_SEGMENT_BEFORE_BLOCK
+from utils.textutils import TextTools
+
+_FIELDS = ("location", "client", "task")
+_TIME_FORMATS = {
+    "HHMM": r"(?:[01]\d|2[0-3])[0-5]\d",
+    "HMM": r"\d[0-5]\d",
+    "H:MM": r"(?:[01]?\d|2[0-3]):[0-5]\d",
+    "H.MM": r"(?:[01]?\d|2[0-3])\.[0-5]\d",
+    "H": r"(?:[01]?\d|2[0-3])",
+}
+_AMPM = r"(?:\s*(?:a\.m\.|p\.m\.|am|pm|a|p)\b)?"
+_DEFAULTS = {
+    "separators": ["|"],
+    "formats": ["HHMM", "H:MM"],
+    "range": ["-", "to"],
+    "directives": {"location": ["at"], "client": ["for", "with"]},
+}
+_FIELD_STRIP = " ,;:-/@"
+
+
+def _marker_pattern(marker):
+    """Word markers ("at") match whole words followed by a space; symbols match as-is."""
+    if re.fullmatch(r"\w+", marker):
+        return r"\b%s\b\s" % re.escape(marker)
+    return re.escape(marker)
+
+
+def _strings(value, what):
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not value or not all(isinstance(v, str) and v for v in value):
+        raise ValueError(f"Grammar '{what}' must be a non-empty list of strings")
+    return value
+
+
+class InputGrammar:
+    """A compiled grammar; build with from_dict()/from_file()."""
+
+    def __init__(self, name, files=(), days=None, separators=None, formats=None, ranges=None,
+                 clock="24h", day_start=6, directives=None):
+        if clock not in ("12h", "24h"):
+            raise ValueError(f"Grammar '{name}': clock must be '12h' or '24h', got {clock!r}")
+        self.name = name
+        self.files = list(files)
+        self.clock12 = clock == "12h"
+        self.day_start = int(day_start)
+
+        # Day tokens: longest first so "thurs" wins over "thu"
+        if days is None:
+            days = dict(DAY_MAPPING)
+            days.update({d: d.capitalize() for d in DAY_NAMES})
+        self.days = {token.lower(): canonical for token, canonical in days.items()}
+        tokens = sorted(self.days, key=len, reverse=True)
+        self.day_re = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, tokens)), re.IGNORECASE)
+
+        separators = separators or _DEFAULTS["separators"]
+        self.separator = separators[0] if len(separators) == 1 else None
+        self.split_re = None if self.separator else re.compile("|".join(map(re.escape, separators)))
+
+        formats = formats or _DEFAULTS["formats"]
+        unknown = [f for f in formats if f not in _TIME_FORMATS]
+        if unknown:
+            raise ValueError(f"Grammar '{name}': unknown time format(s) {unknown} "
+                             f"(known: {', '.join(_TIME_FORMATS)})")
+        # Longest formats first, so "0730" is never read as "07" + "30"
+        ordered = [f for f in _TIME_FORMATS if f in formats]
+        token = r"(?:%s)%s" % ("|".join(_TIME_FORMATS[f] for f in ordered), _AMPM)
+        ranges = ranges or _DEFAULTS["range"]
+        sep = "|".join(r"\b%s\b" % re.escape(r) if r.isalnum() else re.escape(r) for r in ranges)
+        self.range_re = re.compile(r"(?<![\d:.])(%s)\s*(?:%s)\s*(%s)(?![\d:])" % (token, sep, token),
+                                   re.IGNORECASE)
+
+        directives = directives if directives is not None else _DEFAULTS["directives"]
+        groups = []
+        for field, markers in directives.items():
+            if field not in _FIELDS:
+                raise ValueError(f"Grammar '{name}': unknown directive field {field!r} "
+                                 f"(expected one of {', '.join(_FIELDS)})")
+            markers = sorted(_strings(markers, f"directives.{field}"), key=len, reverse=True)
+            groups.append("(?P<%s>%s)" % (field, "|".join(_marker_pattern(m) for m in markers)))
+        self.has_task_marker = "task" in directives
+        self.directive_re = re.compile("|".join(groups), re.IGNORECASE) if groups else None
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not isinstance(data.get("name"), str) or not data["name"]:
+            raise ValueError("Grammar must be a JSON object with a 'name'")
+        name = data["name"]
+        time_cfg = data.get("time", {})
+        if not isinstance(time_cfg, dict):
+            raise ValueError(f"Grammar '{name}': 'time' must be an object")
+        days = data.get("days")
+        if days is not None and (not isinstance(days, dict) or not days):
+            raise ValueError(f"Grammar '{name}': 'days' must map tokens to day names")
+        directives = data.get("directives")
+        if directives is not None and not isinstance(directives, dict):
+            raise ValueError(f"Grammar '{name}': 'directives' must map fields to marker lists")
+        return cls(
+            name,
+            files=_strings(data["files"], "files") if "files" in data else (),
+            days=days,
+            separators=_strings(data["separators"], "separators") if "separators" in data else None,
+            formats=_strings(time_cfg["formats"], "time.formats") if "formats" in time_cfg else None,
+            ranges=_strings(time_cfg["range"], "time.range") if "range" in time_cfg else None,
+            clock=time_cfg.get("clock", "24h"),
+            day_start=time_cfg.get("day_start", 6),
+            directives=directives,
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a grammar from a JSON file."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def matches(self, path):
+        """True if one of the "files" globs matches the path or its file name."""
+        if not path:
+            return False
+        p = PurePath(path)
+        return any(fnmatch.fnmatch(p.as_posix(), g) or fnmatch.fnmatch(p.name, g) for g in self.files)
+
+    def parser(self, policies=None, aliases=None, diagnostics=None, max_line_chars=None):
+        return GrammarParser(self, policies=policies, aliases=aliases, diagnostics=diagnostics,
+                             max_line_chars=max_line_chars)
+
+    # ----- Compiled steps -----
+    @staticmethod
+    def _clock(token):
+        """(hour, minute, "a"/"p"/None) of a matched time token."""
+        tok = token.lower()
+        ap = None
+        digits = tok
+        for i, ch in enumerate(tok):
+            if ch == "a" or ch == "p":
+                ap, digits = ch, tok[:i]
+                break
+        digits = digits.replace(":", "").replace(".", "").strip()
+        if len(digits) <= 2:
+            return int(digits), 0, ap
+        return int(digits[:-2]), int(digits[-2:]), ap
+
+    def time_range(self, text):
+        """(start_dt, end_dt, "HHMM-HHMM", match_end) of the first range in text, or None."""
+        m = self.range_re.search(text)
+        if not m:
+            return None
+        sh, sm, sap = self._clock(m.group(1))
+        eh, em, eap = self._clock(m.group(2))
+        if sh > 23 or eh > 23 or sh > 12 and sap or eh > 12 and eap:
+            return None
+        if sap:
+            sh = sh % 12 + (12 if sap == "p" else 0)
+        elif self.clock12 and sh < self.day_start:
+            sh += 12
+        if eap:
+            eh = eh % 12 + (12 if eap == "p" else 0)
+        elif self.clock12 and eh < 12 and eh * 60 + em <= sh * 60 + sm:
+            eh += 12
+        today = date.today()
+        s_dt = datetime(today.year, today.month, today.day, sh, sm)
+        e_dt = datetime(today.year, today.month, today.day, eh % 24, em)
+        if e_dt <= s_dt:
+            e_dt += timedelta(days=1)  # overnight span
+        return s_dt, e_dt, s_dt.strftime("%H%M") + "-" + e_dt.strftime("%H%M"), m.end()
+
+    def fields(self, text):
+        """({field: value} from directive markers, text before the first marker)."""
+        found = {}
+        if self.directive_re is None:
+            return found, text
+        # Only the first marker of each field opens a value; later ones are text ("a:b" task)
+        marks = []
+        for m in self.directive_re.finditer(text):
+            if all(m.lastgroup != prev.lastgroup for prev in marks):
+                marks.append(m)
+        if not marks:
+            return found, text
+        for i, m in enumerate(marks):
+            end = marks[i + 1].start() if i + 1 < len(marks) else len(text)
+            value = TextTools.clean_text(text[m.end():end].strip(_FIELD_STRIP))
+            if value:
+                found[m.lastgroup] = value
+        return found, text[:marks[0].start()]
+
+
+class GrammarParser(WorkHourParser):
+    """WorkHourParser reading one InputGrammar's shorthand."""
+
+    def __init__(self, grammar, policies=None, aliases=None, diagnostics=None, max_line_chars=None):
+        super().__init__(policies=policies, aliases=aliases, diagnostics=diagnostics,
+                         max_line_chars=max_line_chars)
+        self.grammar = grammar
+
+    def segment_line(self, line):
+        g = self.grammar
+        m = g.day_re.search(line)
+        day = g.days[m.group(0).lower()] if m else "Unknown"
+        parts = line.split(g.separator) if g.separator else g.split_re.split(line)
+        segments = [s.strip() for s in parts if s.strip()]
+        return day, segments, self.policies.scan_breaks(segments)
+
+    def extract_blocks(self, segments, offset=0, raw_line="", rejects=None):
+        g = self.grammar
+        blocks = []
+        orphans = []
+        for seg in segments:
+            tr = g.time_range(seg)
+            if tr:
+                s_dt, e_dt, span, end_idx = tr
+                found, lead = g.fields(seg[end_idx:])
+                task = found.get("task")
+                if task is None and not g.has_task_marker:
+                    task = TextTools.clean_text(lead.strip(_FIELD_STRIP))
+                blocks.append({
+                    "time": span,
+                    "location": found.get("location") or "NaN",
+                    "task": task or "NaN",
+                    "client": found.get("client") or "NaN",
+                    "hours": round((e_dt - s_dt).total_seconds() / 3600.0, 2),
+                    "_s_dt": s_dt,
+                    "_e_dt": e_dt,
+                })
+            elif not blocks:
+                orphans.append(seg)
+            else:
+                # Modifier: fills what the most recent block is missing
+                blk = blocks[-1]
+                found, _ = g.fields(seg)
+                for field, value in found.items():
+                    if blk[field] == "NaN":
+                        blk[field] = value
+
+        if rejects is not None:
+            if not blocks:
+                rejects.record(offset, REASON_NO_TIME_RANGE, raw_line)
+            else:
+                for seg in orphans:
+                    rejects.record(offset, REASON_SEGMENT_BEFORE_BLOCK, seg)
+        return blocks
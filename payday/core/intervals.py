@@ -0,0 +1,183 @@
+"""
+core/intervals.py
+
+Cross-employee site/client occupancy over batch block output.
+
+- IntervalTree: static centered interval tree, overlap queries in O(log n + k)
+- OccupancyIndex: one tree per location and per client on an absolute minute
+  timeline (date, or weekday for day-name-only logs, times 1440 + start), so
+  overnight blocks are found from either side of midnight
+- OccupancyIndex.conflicts(): sort + sweep pass pairing overlapping blocks of
+  different employees on the same client/location, O(n log n + k); batch
+  mode reports them with --conflicts PATH (pdio/conflicts.py)
+
+Intervals are half-open [start, end): back-to-back blocks do not overlap.
+"""
+
+import heapq
+from datetime import date
+
+from infra.constants import DAY_MAPPING, DAY_NAMES
+
+CONFLICT_KEYS = ("client", "location")
+
+_DAY_INDEX = {name: i for i, name in enumerate(DAY_NAMES)}
+_DAY_INDEX.update({abbr: _DAY_INDEX[full.lower()] for abbr, full in DAY_MAPPING.items()})
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, here):
+        self.center = center
+        self.by_start = sorted(here, key=lambda iv: iv[0])
+        self.by_end = sorted(here, key=lambda iv: iv[1], reverse=True)
+        self.left = None
+        self.right = None
+
+
+class IntervalTree:
+    """Static interval tree over (start, end, item) triples."""
+
+    def __init__(self, intervals):
+        ivs = [(s, e, item) for s, e, item in intervals if e > s]
+        self._size = len(ivs)
+        self._root = self._build(ivs)
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def _build(cls, ivs):
+        if not ivs:
+            return None
+        points = sorted(p for s, e, _ in ivs for p in (s, e))
+        # Lower median: guarantees at least one interval stays at this node
+        center = points[(len(points) - 1) // 2]
+        here, left, right = [], [], []
+        for iv in ivs:
+            if iv[1] <= center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        node = _Node(center, here)
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
+
+    def overlapping(self, start, end):
+        """Items whose interval overlaps [start, end)."""
+        out = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end <= node.center:
+                # Node intervals all end after center >= end > start; need s < end
+                for s, e, item in node.by_start:
+                    if s >= end:
+                        break
+                    out.append(item)
+                stack.append(node.left)
+            elif start > node.center:
+                # Node intervals all start at/before center < start; need e > start
+                for s, e, item in node.by_end:
+                    if e <= start:
+                        break
+                    out.append(item)
+                stack.append(node.right)
+            else:
+                out.extend(item for _, _, item in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return out
+
+
+def _minutes(value):
+    """Accept minutes (int) or 'HHMM' / 'HH:MM'."""
+    if isinstance(value, int):
+        return value
+    text = str(value).replace(":", "").strip().zfill(4)
+    return int(text[:2]) * 60 + int(text[2:4])
+
+
+def _day_base(day=None, on_date=None):
+    """Absolute minute offset of a day: dates by ordinal, weekdays by index."""
+    if on_date is not None:
+        if isinstance(on_date, str):
+            on_date = date.fromisoformat(on_date)
+        return on_date.toordinal() * 1440
+    idx = _DAY_INDEX.get(str(day or "").lower(), -1)
+    return idx * 1440
+
+
+def _key(value):
+    return (value or "").casefold()
+
+
+class OccupancyIndex:
+    """
+    Interval index over block records (WorkHourParser.block_records output,
+    optionally with "Employee").
+    """
+
+    def __init__(self, blocks):
+        self.blocks = list(blocks)
+        by_loc, by_client = {}, {}
+        for i, b in enumerate(self.blocks):
+            s, e = self.span(b)
+            for field, groups in (("Location", by_loc), ("Client", by_client)):
+                value = b.get(field)
+                if value and value != "NaN":
+                    groups.setdefault(_key(value), []).append((s, e, i))
+        self._by_field = {
+            "Location": (by_loc, {k: IntervalTree(v) for k, v in by_loc.items()}),
+            "Client": (by_client, {k: IntervalTree(v) for k, v in by_client.items()}),
+        }
+
+    @staticmethod
+    def span(block):
+        """Absolute [start, end) minutes of a block record on the index timeline."""
+        base = _day_base(block.get("Day"), block.get("Date"))
+        return base + int(block["Start"]), base + int(block["End"])
+
+    def _query(self, field, value, start, end, day=None, on_date=None):
+        tree = self._by_field[field][1].get(_key(value))
+        if tree is None:
+            return []
+        base = _day_base(day, on_date)
+        s = base + _minutes(start)
+        e = base + _minutes(end)
+        if e <= s:
+            e += 1440
+        return [self.blocks[i] for i in sorted(tree.overlapping(s, e))]
+
+    def at_location(self, location, start, end, day=None, on_date=None):
+        """Blocks at `location` overlapping [start, end) on the given weekday or date."""
+        return self._query("Location", location, start, end, day, on_date)
+
+    def for_client(self, client, start, end, day=None, on_date=None):
+        """Blocks billed to `client` overlapping [start, end) on the given weekday or date."""
+        return self._query("Client", client, start, end, day, on_date)
+
+    def conflicts(self, by="Client"):
+        """
+        Overlapping block pairs from different employees on the same client
+        (by="Client") or location (by="Location"). Returns (block_a, block_b) pairs.
+        """
+        groups = self._by_field[by.capitalize()][0]
+        out = []
+        for ivs in groups.values():
+            active = []  # heap of (end, index)
+            for s, e, i in sorted(ivs):
+                while active and active[0][0] <= s:
+                    heapq.heappop(active)
+                emp = self.blocks[i].get("Employee", "")
+                for _, j in active:
+                    if self.blocks[j].get("Employee", "") != emp:
+                        out.append((self.blocks[j], self.blocks[i]))
+                heapq.heappush(active, (e, i))
+        return out
@@ -5,7 +5,9 @@ WorkHourParser: the central engine that:
 - Cleans raw lines
 - Splits into segments
 - Extracts time ranges, locations, tasks, clients
-- Applies policies (lunch deduction, block dedupe)
+- Normalizes client/location aliases (optional)
+- Applies policies (break/lunch deductions, block dedupe)
+- Reports dropped lines/segments to an optional diagnostics sink
 - Formats text consistently (title/sentence case)
 - Produces structured rows ready for CSV
 """
@@ -13,152 +15,273 @@ WorkHourParser: the central engine that:
 import re
 
 from patterns.patterns import CLIENT_FOR, CLIENT_WITH, LOC_AT
+from pdio.rejects import REASON_LINE_TOO_LONG, REASON_NO_TIME_RANGE, REASON_SEGMENT_BEFORE_BLOCK
 from policies.policies import Policies
 from utils.extractors import FieldExtractors
 from utils.textutils import TextTools
 from utils.timeparse import TimeParser
 
+_LINE_RE = re.compile(r"[^\r\n]+")
+
 
 class WorkHourParser:
-    """Transforms free-text work logs into structured row dictionaries."""
+    """
+    Transforms free-text work logs into structured row dictionaries.
+
+    Thread safety: all per-call state lives in locals of parse(); the
+    policies and alias tables are read-only after construction and the
+    diagnostics sink serializes its own appends. One instance may be shared
+    by any number of threads (including free-threaded CPython builds).
+
+    max_line_chars (optional) is a per-line length budget: longer lines are
+    dropped (and reported as line_too_long) so one malformed paste cannot
+    stall a batch.
+    """
 
-    def __init__(self, policies=None):
+    def __init__(self, policies=None, aliases=None, diagnostics=None, max_line_chars=None):
         self.policies = policies if policies else Policies()
-        
+        self.aliases = aliases if aliases else None
+        self.diagnostics = diagnostics
+        self.max_line_chars = max_line_chars
 
-    def parse(self, raw_text):
+    def parse(self, raw_text, source=""):
         """
         Parse multi-line text into structured rows.
         Each row: {"Day","TimeBlocks","Location","Tasks/Details","Client(s)","Hours"}
+
+        With a diagnostics sink (see pdio.rejects.RejectSink), dropped lines and
+        segments are recorded under `source`; without one they are skipped silently.
+        """
+        return [self.format_row(day, blocks, hours) for day, blocks, hours in self.iter_days(raw_text, source)]
+
+    def parse_blocks(self, raw_text, source=""):
+        """
+        Parse multi-line text into per-block records (see block_records()).
         """
-        rows = []
-        for raw_line in re.split(r"[\r\n]+", raw_text):
-            line = TextTools.clean_text(raw_line)
+        out = []
+        for day, blocks, hours in self.iter_days(raw_text, source):
+            out.extend(self.block_records(day, blocks, hours))
+        return out
+
+    def iter_days(self, raw_text, source=""):
+        """
+        Yield (day, blocks, net_hours) per accepted line, with aliases and
+        policies applied but before output casing/formatting.
+
+        The per-line steps (clean_line, segment_line, extract_blocks,
+        finish_blocks) are also the stages of core.pipeline.Pipeline.
+        """
+        rejects = self.diagnostics.open_text(raw_text, source) if self.diagnostics is not None else None
+        for m_line in _LINE_RE.finditer(raw_text):
+            raw_line = m_line.group(0)
+            line = self.clean_line(raw_line, m_line.start(), rejects)
             if not line:
                 continue
+            day, segments, break_scan = self.segment_line(line)
+            blocks = self.extract_blocks(segments, m_line.start(), raw_line, rejects)
+            if blocks:
+                blocks, total_hours = self.finish_blocks(blocks, break_scan)
+                yield day, blocks, total_hours
 
-            # Day extraction
-            day = FieldExtractors.derive_day(line)
+    def clean_line(self, raw_line, offset=0, rejects=None):
+        """Cleaned line, or "" when empty or over max_line_chars (rejected)."""
+        max_chars = self.max_line_chars
+        if max_chars and len(raw_line) > max_chars:
+            if rejects is not None:
+                rejects.record(offset, REASON_LINE_TOO_LONG, raw_line)
+            return ""
+        return TextTools.clean_text(raw_line)
 
-            # Split into logical segments
-            segments = [s.strip() for s in line.split("|") if s.strip()]
-            lunch_flag, lunch_annotate = self.policies.detect_lunch_flags(segments)
+    def segment_line(self, line):
+        """(day, segments, break_scan) of one cleaned line."""
+        # Day extraction
+        day = FieldExtractors.derive_day(line)
 
-            blocks = []
-            last_block_index = -1
+        # Split into logical segments
+        segments = [s.strip() for s in line.split("|") if s.strip()]
+        return day, segments, self.policies.scan_breaks(segments)
 
-            for seg in segments:
-                # Try to parse time range
-                tr = TimeParser.extract_time_range(seg)
-                if tr:
-                    s_dt, e_dt, span, end_idx = tr
-                    seg_tail = seg[end_idx:].strip()
+    def extract_blocks(self, segments, offset=0, raw_line="", rejects=None):
+        """
+        Time blocks of one line's segments (no aliases/policies yet). A line
+        without any time range, and segments before its first block, are
+        recorded as rejects.
+        """
+        blocks = []
+        last_block_index = -1
+        orphans = []
 
-                    location, client, task = "NaN", "NaN", "NaN"
-                    if "=" in seg_tail:
-                        after_eq = seg_tail.split("=", 1)[1].strip()
-                        location, client, task = FieldExtractors.parse_eq_tail(after_eq)
-                    else:
-                        at_chunk = FieldExtractors.extract_first(seg_tail, LOC_AT)
-                        for_name = FieldExtractors.extract_first(seg_tail, CLIENT_FOR)
-                        with_name = FieldExtractors.extract_first(seg_tail, CLIENT_WITH)
-
-                        if at_chunk:
-                            loc_val, tail_task = FieldExtractors.split_loc_task_from_at_chunk(at_chunk)
-                            if loc_val:
-                                location = loc_val
-                        client_candidate = for_name or with_name
-                        if client_candidate:
-                            client = client_candidate
-
-                        # Explicit task after client
-                        m_task_after_client = re.search(
-                            r"\b(?:with|for)\b\s+[A-Za-z0-9][\w&\-\s]+,\s*(.+)$",
-                            seg_tail,
-                            flags=re.IGNORECASE,
-                        )
-                        if m_task_after_client and TextTools.clean_text(m_task_after_client.group(1)):
-                            task = TextTools.clean_text(m_task_after_client.group(1))
-                        else:
-                            if at_chunk:
-                                _, tail_task = FieldExtractors.split_loc_task_from_at_chunk(at_chunk)
-                                if tail_task:
-                                    task = tail_task
-                            if task == "NaN":
-                                before_directive = re.split(r"\b(?:at|with|for)\b", seg_tail, flags=re.IGNORECASE)[0]
-                                before_directive = TextTools.clean_text(before_directive.strip("-: ,"))
-                                before_directive = re.sub(r"^\d{3,4}\s*-\s*\d{3,4}\s*", "", before_directive)
-                                if before_directive:
-                                    task = before_directive
-
-                    dur = round((e_dt - s_dt).total_seconds() / 3600.0, 2)
-                    blocks.append({
-                        "time": span,
-                        "location": location,
-                        "task": task,
-                        "client": client,
-                        "hours": dur,
-                        "_s_dt": s_dt,
-                        "_e_dt": e_dt,
-                    })
-                    last_block_index = len(blocks) - 1
+        for seg in segments:
+            # Try to parse time range
+            tr = TimeParser.extract_time_range(seg)
+            if tr:
+                s_dt, e_dt, span, end_idx = tr
+                seg_tail = seg[end_idx:].strip()
 
+                location, client, task = "NaN", "NaN", "NaN"
+                if "=" in seg_tail:
+                    after_eq = seg_tail.split("=", 1)[1].strip()
+                    location, client, task = FieldExtractors.parse_eq_tail(after_eq)
                 else:
-                    # Segment modifies the last block
-                    if last_block_index < 0:
-                        continue
-                    blk = blocks[last_block_index]
+                    at_chunk = FieldExtractors.extract_first(seg_tail, LOC_AT)
+                    for_name = FieldExtractors.extract_first(seg_tail, CLIENT_FOR)
+                    with_name = FieldExtractors.extract_first(seg_tail, CLIENT_WITH)
 
-                    at_chunk = FieldExtractors.extract_first(seg, LOC_AT)
                     if at_chunk:
                         loc_val, tail_task = FieldExtractors.split_loc_task_from_at_chunk(at_chunk)
-                        if blk["location"] == "NaN" and loc_val:
-                            blk["location"] = loc_val
-                        if blk["task"] == "NaN" and tail_task:
-                            blk["task"] = tail_task
-
-                    for_name = FieldExtractors.extract_first(seg, CLIENT_FOR)
-                    with_name = FieldExtractors.extract_first(seg, CLIENT_WITH)
+                        if loc_val:
+                            location = loc_val
                     client_candidate = for_name or with_name
-                    if blk["client"] == "NaN" and client_candidate:
-                        blk["client"] = client_candidate
-
-                    if blk["task"] == "NaN":
-                        m = re.search(
-                            r"\b(?:with|for)\b\s+[A-Za-z0-9][\w&\-\s]+,\s*(.+)$",
-                            seg,
-                            flags=re.IGNORECASE,
-                        )
-                        if m:
-                            blk["task"] = TextTools.clean_text(m.group(1))
-
-            if not blocks:
-                continue
+                    if client_candidate:
+                        client = client_candidate
+
+                    # Explicit task after client
+                    task_after_client = TextTools.clean_text(FieldExtractors.task_after_client(seg_tail) or "")
+                    if task_after_client:
+                        task = task_after_client
+                    else:
+                        if at_chunk:
+                            _, tail_task = FieldExtractors.split_loc_task_from_at_chunk(at_chunk)
+                            if tail_task:
+                                task = tail_task
+                        if task == "NaN":
+                            before_directive = re.split(r"\b(?:at|with|for)\b", seg_tail, flags=re.IGNORECASE)[0]
+                            before_directive = TextTools.clean_text(before_directive.strip("-: ,"))
+                            before_directive = re.sub(r"^\d{3,4}\s*-\s*\d{3,4}\s*", "", before_directive)
+                            if before_directive:
+                                task = before_directive
+
+                dur = round((e_dt - s_dt).total_seconds() / 3600.0, 2)
+                blocks.append({
+                    "time": span,
+                    "location": location,
+                    "task": task,
+                    "client": client,
+                    "hours": dur,
+                    "_s_dt": s_dt,
+                    "_e_dt": e_dt,
+                })
+                last_block_index = len(blocks) - 1
+
+            else:
+                # Segment modifies the last block
+                if last_block_index < 0:
+                    if rejects is not None:
+                        orphans.append(seg)
+                    continue
+                blk = blocks[last_block_index]
+
+                at_chunk = FieldExtractors.extract_first(seg, LOC_AT)
+                if at_chunk:
+                    loc_val, tail_task = FieldExtractors.split_loc_task_from_at_chunk(at_chunk)
+                    if blk["location"] == "NaN" and loc_val:
+                        blk["location"] = loc_val
+                    if blk["task"] == "NaN" and tail_task:
+                        blk["task"] = tail_task
 
-            # Drop umbrella block if detailed sub-blocks cover it
-            blocks = self.policies.drop_covering_block(blocks)
+                for_name = FieldExtractors.extract_first(seg, CLIENT_FOR)
+                with_name = FieldExtractors.extract_first(seg, CLIENT_WITH)
+                client_candidate = for_name or with_name
+                if blk["client"] == "NaN" and client_candidate:
+                    blk["client"] = client_candidate
+
+                if blk["task"] == "NaN":
+                    task_after_client = FieldExtractors.task_after_client(seg)
+                    if task_after_client is not None:
+                        blk["task"] = TextTools.clean_text(task_after_client)
+
+        if not blocks:
+            if rejects is not None:
+                rejects.record(offset, REASON_NO_TIME_RANGE, raw_line)
+            return blocks
+        for seg in orphans:
+            rejects.record(offset, REASON_SEGMENT_BEFORE_BLOCK, seg)
+        return blocks
+
+    def finish_blocks(self, blocks, break_scan):
+        """
+        Policy stage shared by every input format: aliases, covering-block
+        dedupe, break deduction/annotation. Returns (blocks, net_hours).
+        """
+        # Canonicalize client/location names before casing and aggregation
+        if self.aliases is not None:
+            self.aliases.apply(blocks)
 
-            # Annotate lunch when explicitly mentioned
-            if lunch_flag and lunch_annotate and blocks and blocks[0]["task"] != "NaN":
-                if "(lunch)" not in blocks[0]["task"].lower():
-                    blocks[0]["task"] = TextTools.clean_text(blocks[0]["task"] + " (lunch)")
+        # Drop umbrella block if detailed sub-blocks cover it
+        blocks = self.policies.drop_covering_block(blocks)
 
-            # Format outputs
-            timeblocks = ", ".join(b["time"] for b in blocks)
-            loc_out = ", ".join(TextTools.smart_title_case(b["location"]) for b in blocks)
-            tasks_out = ", ".join(TextTools.smart_sentence_case(b["task"]) for b in blocks)
-            clients_out = ", ".join(TextTools.smart_title_case(b["client"]) for b in blocks)
+        total_hours = self.policies.sum_hours(blocks)
+        deduction, notes = self.policies.decide_breaks(break_scan, blocks, total_hours)
 
-            total_hours = self.policies.sum_hours(blocks)
-            if lunch_flag:
-                total_hours = round(max(0.0, total_hours - self.policies.lunch_deduction_hours), 2)
+        # Annotate breaks (e.g. lunch) when explicitly mentioned
+        for note in notes:
+            if blocks[0]["task"] != "NaN" and note.lower() not in blocks[0]["task"].lower():
+                blocks[0]["task"] = TextTools.clean_text(blocks[0]["task"] + " " + note)
 
-            rows.append({
+        if deduction:
+            total_hours = round(max(0.0, total_hours - deduction), 2)
+        return blocks, total_hours
+
+    @staticmethod
+    def format_row(day, blocks, total_hours):
+        """Format one day's blocks into an output row (comma-joined, cased)."""
+        timeblocks = ", ".join(b["time"] for b in blocks)
+        loc_out = ", ".join(TextTools.smart_title_case(b["location"]) for b in blocks)
+        tasks_out = ", ".join(TextTools.smart_sentence_case(b["task"]) for b in blocks)
+        clients_out = ", ".join(TextTools.smart_title_case(b["client"]) for b in blocks)
+
+        return {
+            "Day": day,
+            "TimeBlocks": timeblocks if timeblocks else "NaN",
+            "Location": loc_out if loc_out.strip() else "NaN",
+            "Tasks/Details": tasks_out if tasks_out.strip() else "NaN",
+            "Client(s)": clients_out if clients_out.strip() else "NaN",
+            "Hours": total_hours,
+        }
+
+    @staticmethod
+    def block_records(day, blocks, net_hours=None):
+        """
+        One record per block, cased like rows:
+          {"Day","Date","Start","End","Location","Task","Client","Hours","Unpaid"}
+        Start/End are minutes from midnight of the start day (End > 1440 when
+        the block runs past midnight); Date is None for day-name-only logs.
+        Unpaid carries the day's break deduction in minutes on the first block
+        (derived from net_hours as yielded by iter_days; 0 when not given).
+        """
+        unpaid = 0
+        if net_hours is not None:
+            unpaid = max(0, int(round((sum(b["hours"] for b in blocks) - net_hours) * 60)))
+        out = []
+        for b in blocks:
+            s_dt = b["_s_dt"]
+            start = s_dt.hour * 60 + s_dt.minute
+            out.append({
                 "Day": day,
-                "TimeBlocks": timeblocks if timeblocks else "NaN",
-                "Location": loc_out if loc_out.strip() else "NaN",
-                "Tasks/Details": tasks_out if tasks_out.strip() else "NaN",
-                "Client(s)": clients_out if clients_out.strip() else "NaN",
-                "Hours": total_hours,
+                "Date": b.get("date"),
+                "Start": start,
+                "End": start + int((b["_e_dt"] - s_dt).total_seconds() // 60),
+                "Location": TextTools.smart_title_case(b["location"]),
+                "Task": TextTools.smart_sentence_case(b["task"]),
+                "Client": TextTools.smart_title_case(b["client"]),
+                "Hours": b["hours"],
+                "Unpaid": unpaid,
             })
-        return rows
+            unpaid = 0
+        return out
+
+    def parse_many(self, texts, executor=None, sources=None):
+        """
+        Parse independent texts; returns one row list per text, in input order.
+
+        executor: optional concurrent.futures.Executor (e.g. ThreadPoolExecutor)
+        used to run parse() concurrently on this shared instance.
+        sources: optional labels (one per text) for diagnostics records.
+        """
+        texts = list(texts)
+        sources = list(sources) if sources is not None else [""] * len(texts)
+        if len(sources) != len(texts):
+            raise ValueError("sources must have one entry per text")
+        if executor is None:
+            return [self.parse(t, src) for t, src in zip(texts, sources)]
+        return list(executor.map(self.parse, texts, sources))
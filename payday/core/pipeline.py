@@ -0,0 +1,242 @@
+"""
+core/pipeline.py
+
+Pipeline: WorkHourParser as explicit, pluggable stages
+read -> clean -> segment -> extract -> policy -> format.
+
+- Stages are generators over batches (lists) of up to batch_size items, so
+  per-item generator hand-offs and lookups are paid once per batch
+- Each stage is a callable (batches, ctx) -> batches and can be replaced,
+  or wrapped by a new stage inserted after it (cache, executor, ...)
+- tap(stage, sink) hands every batch leaving a stage to extra sinks, so one
+  pass can feed several consumers
+- run()/resume() execute a prefix or suffix of the stage list; the default
+  stages call the same WorkHourParser steps as iter_days(), so rows match
+  WorkHourParser.parse() exactly
+
+Item shapes between stages:
+  read     (offset, raw_line)
+  clean    (offset, raw_line, line)
+  segment  (offset, raw_line, day, segments, break_scan)
+  extract  (day, blocks, break_scan)
+  policy   (day, blocks, net_hours)        == iter_days() triples
+  format   row dict                        == parse() rows
+
+Parsers whose input is not line text (StructuredLogParser, staged = False)
+get one "days" stage (batched iter_days) in place of read..policy.
+"""
+
+import re
+
+DEFAULT_BATCH = 256
+
+_LINE_RE = re.compile(r"[^\r\n]+")
+
+
+class _RejectBuffer:
+    """
+    Reject cursor proxy for staged runs: stages see a whole batch before the
+    next stage does, so records arrive out of offset order. They are held
+    here and handed to the real cursor sorted, once per finished batch.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._pending = []
+
+    def record(self, char_offset, reason, text):
+        self._pending.append((char_offset, reason, text))
+
+    def flush(self):
+        if self._pending:
+            self._pending.sort(key=lambda rec: rec[0])  # stable: keeps per-line order
+            for rec in self._pending:
+                self._cursor.record(*rec)
+            self._pending = []
+
+
+class StageContext:
+    """Per-input state shared by the stages of one run."""
+
+    def __init__(self, parser, raw_text, source="", batch_size=DEFAULT_BATCH):
+        self.parser = parser
+        self.raw_text = raw_text
+        self.source = source
+        self.batch_size = batch_size
+        diagnostics = parser.diagnostics
+        self.rejects = _RejectBuffer(diagnostics.open_text(raw_text, source)) if diagnostics is not None else None
+
+
+# ----- Default stages -----
+def read_stage(batches, ctx):
+    """Source stage: the input text as batches of (offset, raw_line)."""
+    batch_size = ctx.batch_size
+    batch = []
+    for m in _LINE_RE.finditer(ctx.raw_text):
+        batch.append((m.start(), m.group(0)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def clean_stage(batches, ctx):
+    clean_line, rejects = ctx.parser.clean_line, ctx.rejects
+    for batch in batches:
+        out = []
+        for offset, raw_line in batch:
+            line = clean_line(raw_line, offset, rejects)
+            if line:
+                out.append((offset, raw_line, line))
+        if out:
+            yield out
+
+
+def segment_stage(batches, ctx):
+    segment_line = ctx.parser.segment_line
+    for batch in batches:
+        yield [(offset, raw_line) + segment_line(line) for offset, raw_line, line in batch]
+
+
+def extract_stage(batches, ctx):
+    extract_blocks, rejects = ctx.parser.extract_blocks, ctx.rejects
+    for batch in batches:
+        out = []
+        for offset, raw_line, day, segments, break_scan in batch:
+            blocks = extract_blocks(segments, offset, raw_line, rejects)
+            if blocks:
+                out.append((day, blocks, break_scan))
+        if out:
+            yield out
+
+
+def policy_stage(batches, ctx):
+    finish_blocks = ctx.parser.finish_blocks
+    for batch in batches:
+        out = []
+        for day, blocks, break_scan in batch:
+            blocks, net = finish_blocks(blocks, break_scan)
+            out.append((day, blocks, net))
+        yield out
+
+
+def format_stage(batches, ctx):
+    format_row = ctx.parser.format_row
+    for batch in batches:
+        yield [format_row(day, blocks, net) for day, blocks, net in batch]
+
+
+def days_stage(batches, ctx):
+    """Source stage for non-line parsers: batched parser.iter_days()."""
+    batch_size = ctx.batch_size
+    batch = []
+    for item in ctx.parser.iter_days(ctx.raw_text, ctx.source):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Pipeline:
+    """
+    Ordered, named stages over one parser.
+
+    Usage:
+        pipe = Pipeline(parser, batch_size=512)
+        days = []
+        pipe.tap("policy", days.extend)
+        rows = pipe.collect(pipe.run(raw_text, source))
+    """
+
+    def __init__(self, parser, batch_size=DEFAULT_BATCH):
+        self.parser = parser
+        self.batch_size = max(1, int(batch_size))
+        if getattr(parser, "staged", True):
+            self.stages = [("read", read_stage), ("clean", clean_stage), ("segment", segment_stage),
+                           ("extract", extract_stage), ("policy", policy_stage)]
+        else:
+            self.stages = [("days", days_stage)]
+        self.stages.append(("format", format_stage))
+        self._taps = {}
+
+    @property
+    def stage_names(self):
+        return [name for name, _ in self.stages]
+
+    def _index(self, name):
+        for i, (stage_name, _) in enumerate(self.stages):
+            if stage_name == name:
+                return i
+        raise ValueError(f"Unknown stage: {name!r} (stages: {', '.join(self.stage_names)})")
+
+    def replace(self, name, stage):
+        """Swap the implementation of stage `name`."""
+        self.stages[self._index(name)] = (name, stage)
+        return self
+
+    def insert_after(self, name, new_name, stage):
+        """Add stage `new_name` right after `name` (it receives that stage's batches)."""
+        if new_name in self.stage_names:
+            raise ValueError(f"Duplicate stage: {new_name!r}")
+        self.stages.insert(self._index(name) + 1, (new_name, stage))
+        return self
+
+    def tap(self, name, sink):
+        """Call sink(batch) for every batch leaving stage `name`."""
+        self._index(name)
+        self._taps.setdefault(name, []).append(sink)
+        return self
+
+    def run(self, raw_text, source="", stop=None):
+        """Batches leaving stage `stop` (default: the last) for one input text."""
+        ctx = StageContext(self.parser, raw_text, source, self.batch_size)
+        return self._chain(None, ctx, 0, stop)
+
+    def days(self, raw_text, source=""):
+        """Batches of (day, blocks, net_hours): every stage before "format"."""
+        return self.run(raw_text, source, stop=self.stage_names[self._index("format") - 1])
+
+    def resume(self, batches, start, stop=None, raw_text="", source=""):
+        """
+        Run stages `start`..`stop` over batches produced elsewhere (e.g. by
+        run(..., stop=<previous stage>) or by a ParseResult).
+        """
+        ctx = StageContext(self.parser, raw_text, source, self.batch_size)
+        return self._chain(batches, ctx, self._index(start), stop)
+
+    def _chain(self, batches, ctx, first, stop):
+        last = self._index(stop) if stop is not None else len(self.stages) - 1
+        for name, stage in self.stages[first:last + 1]:
+            batches = stage(batches, ctx)
+            sinks = self._taps.get(name)
+            if sinks:
+                batches = self._tapped(batches, sinks)
+        if ctx.rejects is not None:
+            batches = self._flushing(batches, ctx.rejects)
+        return batches
+
+    @staticmethod
+    def _flushing(batches, rejects):
+        # A batch leaving the last stage has passed every stage that could reject its lines
+        for batch in batches:
+            rejects.flush()
+            yield batch
+        rejects.flush()
+
+    @staticmethod
+    def _tapped(batches, sinks):
+        for batch in batches:
+            for sink in sinks:
+                sink(batch)
+            yield batch
+
+    @staticmethod
+    def collect(batches):
+        """Flatten batches into one list."""
+        out = []
+        for batch in batches:
+            out.extend(batch)
+        return out
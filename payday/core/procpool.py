@@ -0,0 +1,190 @@
+"""
+core/procpool.py
+
+Process-pool parsing with columnar result transfer through shared memory.
+
+- Each worker parses one input file and encodes its block records in the
+  snapshot layout (pdio/snapshot.py: integer time/hours columns plus an
+  offset-indexed string blob) directly into a multiprocessing.shared_memory
+  segment; only (segment name, size, digest) is pickled back
+- The parent maps the segment, rebuilds rows/blocks from the columns and
+  unlinks the segment when the result is closed
+- transfer="pickle" returns plain row/block lists instead (the baseline the
+  shared-memory path is measured against)
+
+Segments are owned by the parent: workers hand them over untracked, so a
+worker exiting never unlinks a result the parent has not read yet. Windows
+frees a segment once no process has it open, so it always uses "pickle".
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+from pdio.checkpoint import file_digest
+from pdio.snapshot import SnapshotReader, SnapshotWriter
+
+TRANSFERS = ("shm", "pickle")
+
+_worker_parser = None
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _read(path):
+    data = Path(path).read_bytes()
+    return data, data.decode("utf-8")  # no newline translation, like main._read_input_text
+
+
+def snapshot_records(parser, days):
+    """Block records for (day, blocks, net_hours) days, tagged with their output Row/Net."""
+    for r, (day, blocks, net) in enumerate(days):
+        for rec in parser.block_records(day, blocks, net):
+            rec["Row"] = r
+            rec["Net"] = net
+            yield rec
+
+
+def _records(parser, raw, source):
+    return snapshot_records(parser, parser.iter_days(raw, source))
+
+
+def _create_segment(size):
+    try:
+        return shared_memory.SharedMemory(create=True, size=size, track=False)  # 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        # Hand ownership to the parent: stop this process's tracker from unlinking it
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _parse_shm(path):
+    data, raw = _read(path)
+    encoded = SnapshotWriter.encode(_records(_worker_parser, raw, str(path)))
+    shm = _create_segment(max(1, encoded.size))
+    try:
+        encoded.copy_into(shm.buf)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    name = shm.name
+    shm.close()
+    return name, encoded.size, file_digest(data)
+
+
+def _parse_pickle(path):
+    data, raw = _read(path)
+    parser = _worker_parser
+    days = list(parser.iter_days(raw, str(path)))
+    rows = [parser.format_row(day, blocks, net) for day, blocks, net in days]
+    blocks = [rec for day, blks, net in days for rec in parser.block_records(day, blks, net)]
+    return rows, blocks, file_digest(data)
+
+
+class ParseResult:
+    """One file's result. rows / iter_blocks() are valid until close()."""
+
+    def __init__(self, path, sha256, rows=None, blocks=None, shm=None, size=0):
+        self.path = path
+        self.sha256 = sha256
+        self._shm = shm
+        self._reader = None
+        self._blocks = blocks
+        if shm is not None:
+            self._reader = SnapshotReader.from_buffer(shm.buf[:size])
+            rows = list(self._reader.iter_rows())
+        self.rows = rows
+
+    def iter_blocks(self, employee=None):
+        """Block records (as WorkHourParser.block_records), optionally tagged with Employee."""
+        blocks = self._reader.iter_blocks() if self._reader is not None else self._blocks
+        for rec in blocks:
+            if employee is not None:
+                rec = dict(rec, Employee=employee)
+            yield rec
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _attach(name):
+    return shared_memory.SharedMemory(name=name)
+
+
+def _discard(name):
+    shm = _attach(name)
+    shm.close()
+    shm.unlink()
+
+
+class ProcessParsePool:
+    """
+    Parse files on `workers` processes with a shared (picklable) parser.
+
+    map(paths) yields ParseResult objects in input order; close each one
+    (or use it as a context manager) to release its shared-memory segment.
+    """
+
+    def __init__(self, parser, workers=None, transfer="shm"):
+        if transfer not in TRANSFERS:
+            raise ValueError(f"Unknown transfer: {transfer!r} (expected one of {', '.join(TRANSFERS)})")
+        if parser.diagnostics is not None:
+            raise ValueError("Worker processes cannot share a diagnostics sink")
+        self.parser = parser
+        self.workers = workers
+        self.transfer = "pickle" if os.name == "nt" else transfer
+
+    def map(self, paths, window=None):
+        """
+        Results in input order. At most `window` files (default 2 x workers)
+        are in flight, which bounds the number of live segments.
+        """
+        paths = list(paths)
+        workers = self.workers or os.cpu_count() or 1
+        window = window or 2 * workers
+        fn = _parse_shm if self.transfer == "shm" else _parse_pickle
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.parser,)) as pool:
+            pending = deque()
+            nxt = 0
+            try:
+                while nxt < len(paths) or pending:
+                    while nxt < len(paths) and len(pending) < window:
+                        pending.append((paths[nxt], pool.submit(fn, paths[nxt])))
+                        nxt += 1
+                    path, fut = pending.popleft()
+                    yield self._result(path, fut.result())
+            finally:
+                # Abandoned or failed run: drop segments nobody will read
+                for _, fut in pending:
+                    fut.cancel()
+                for _, fut in pending:
+                    if self.transfer == "shm" and not fut.cancelled() and fut.exception() is None:
+                        _discard(fut.result()[0])
+
+    def _result(self, path, payload):
+        if self.transfer == "shm":
+            name, size, sha256 = payload
+            return ParseResult(path, sha256, shm=_attach(name), size=size)
+        rows, blocks, sha256 = payload
+        return ParseResult(path, sha256, rows=rows, blocks=blocks)
@@ -0,0 +1,235 @@
+"""
+core/structured.py
+
+StructuredLogParser: fast path for work logs that are already records
+(CSV, TSV or JSON Lines) instead of free text.
+
+- Columns map straight onto the block model; no time-range/at/for/with
+  regex extraction
+- Consecutive records of the same date (or weekday) form one day, like one
+  line of a free-text log
+- Aliases, covering-block dedupe, break rules and output casing are the
+  same WorkHourParser stages, so rows and block records match the text path
+- Lunch column (yes/no) is fed to the break rules as an explicit
+  "lunch: yes/no" directive, alongside the record's free-text fields
+
+Recognized columns (case-insensitive): date, day, start, end, location,
+client, task, lunch, plus the synonyms in COLUMN_ALIASES.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from core.parser import WorkHourParser
+from infra.constants import DAY_NAMES
+from pdio.rejects import REASON_BAD_RECORD, REASON_NO_TIME_RANGE
+from utils.extractors import FieldExtractors
+from utils.textutils import TextTools
+from utils.timeparse import TimeParser
+
+FORMATS = ("csv", "tsv", "jsonl")
+_EXTENSIONS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+COLUMN_ALIASES = {
+    "date": "date",
+    "day": "day", "weekday": "day",
+    "start": "start", "start_time": "start", "from": "start",
+    "end": "end", "end_time": "end", "to": "end",
+    "location": "location", "site": "location",
+    "client": "client", "customer": "client",
+    "task": "task", "tasks": "task", "details": "task", "description": "task",
+    "lunch": "lunch", "break": "lunch",
+}
+_YES = frozenset(("yes", "y", "true", "t", "1"))
+_NO = frozenset(("no", "n", "false", "f", "0"))
+
+
+def format_for_path(path):
+    """Structured format implied by a file extension, or None for free text."""
+    return _EXTENSIONS.get(Path(path).suffix.lower())
+
+
+def _clock(value, ref):
+    """'0930', '09:30', 930 (int) or any TimeParser token -> datetime on ref."""
+    text = str(value).strip()
+    h, sep, m = text.partition(":")
+    if sep:
+        fast = h.isdigit() and h.isascii() and len(h) <= 2 and m.isdigit() and m.isascii() and len(m) == 2
+        hh, mm = (int(h), int(m)) if fast else (0, 0)
+    else:
+        fast = text.isdigit() and text.isascii() and 3 <= len(text) <= 4
+        hh, mm = divmod(int(text), 100) if fast else (0, 0)
+    if fast:
+        return datetime(ref.year, ref.month, ref.day, hh, mm) if hh < 24 and mm < 60 else None
+    # am/pm and other spellings: same token rules as the text path
+    return TimeParser.to_dt(text, ref) if text else None
+
+
+class StructuredLogParser(WorkHourParser):
+    """
+    WorkHourParser over record-shaped input. iter_days() yields the same
+    (day, blocks, net_hours) triples, so parse(), parse_blocks(),
+    format_row() and block_records() behave as for text logs.
+    """
+
+    # Records are not lines: core.pipeline runs iter_days() as one "days" stage
+    staged = False
+
+    def __init__(self, fmt="csv", policies=None, aliases=None, diagnostics=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown structured format: {fmt!r} (expected one of {', '.join(FORMATS)})")
+        super().__init__(policies=policies, aliases=aliases, diagnostics=diagnostics)
+        self.fmt = fmt
+
+    # ----- Record sources: yield (start, end char offsets, record dict or None) -----
+    @staticmethod
+    def _lines(source):
+        """Text or an iterable of lines (e.g. a file opened with newline="")."""
+        return io.StringIO(source, newline="") if isinstance(source, str) else source
+
+    def _iter_delimited(self, source, delimiter):
+        stream = self._lines(source)
+        offset = [0]
+
+        def lines():
+            for line in stream:
+                offset[0] += len(line)
+                yield line
+
+        # The reader pulls whole records, so a record starts where the previous one ended
+        reader = csv.reader(lines(), delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = [COLUMN_ALIASES.get(h.strip().lower()) for h in header]
+        start = offset[0]
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield start, offset[0], {k: v for k, v in zip(keys, row) if k is not None}
+            start = offset[0]
+
+    def _iter_jsonl(self, source):
+        pos = 0
+        for line in self._lines(source):
+            if line.strip():
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    obj = None
+                if isinstance(obj, dict):
+                    rec = {}
+                    for k, v in obj.items():
+                        key = COLUMN_ALIASES.get(str(k).strip().lower())
+                        if key is not None and v is not None:
+                            rec[key] = str(v)
+                    yield pos, pos + len(line), rec
+                else:
+                    yield pos, pos + len(line), None
+            pos += len(line)
+
+    def _records(self, source):
+        if self.fmt == "jsonl":
+            return self._iter_jsonl(source)
+        return self._iter_delimited(source, "\t" if self.fmt == "tsv" else ",")
+
+    # ----- Record -> block -----
+    @staticmethod
+    def _day_key(rec):
+        on = None
+        raw_date = str(rec.get("date", "")).strip()
+        if raw_date:
+            on = date.fromisoformat(raw_date[:10])
+        day_text = str(rec.get("day", "")).strip()
+        if day_text:
+            day = FieldExtractors.derive_day(day_text)
+        elif on is not None:
+            day = DAY_NAMES[on.weekday()].capitalize()
+        else:
+            day = "Unknown"
+        return on, day
+
+    @staticmethod
+    def _block(rec, on):
+        ref = on if on is not None else date.today()
+        s_dt = _clock(rec.get("start", ""), ref)
+        e_dt = _clock(rec.get("end", ""), ref)
+        if s_dt is None or e_dt is None:
+            return None
+        if e_dt <= s_dt:
+            e_dt += timedelta(days=1)  # overnight span
+        block = {
+            "time": s_dt.strftime("%H%M") + "-" + e_dt.strftime("%H%M"),
+            "location": TextTools.clean_text(str(rec.get("location", ""))) or "NaN",
+            "task": TextTools.clean_text(str(rec.get("task", ""))) or "NaN",
+            "client": TextTools.clean_text(str(rec.get("client", ""))) or "NaN",
+            "hours": round((e_dt - s_dt).total_seconds() / 3600.0, 2),
+            "_s_dt": s_dt,
+            "_e_dt": e_dt,
+        }
+        if on is not None:
+            block["date"] = on
+        return block
+
+    @staticmethod
+    def _break_segments(rec, block):
+        segs = [v for v in (block["location"], block["task"], block["client"]) if v != "NaN"]
+        lunch = rec.get("lunch")
+        if lunch is not None and lunch != "":
+            flag = str(lunch).strip().lower()
+            if flag in _YES:
+                segs.append("lunch: yes")
+            elif flag in _NO:
+                segs.append("lunch: no")
+            else:
+                segs.append(str(lunch))  # free text such as "30 min" goes through the rules as-is
+        return segs
+
+    def iter_days(self, raw_text, source=""):
+        """Yield (day, blocks, net_hours) per run of same-day records."""
+        rejects = self.diagnostics.open_text(raw_text, source) if self.diagnostics is not None else None
+        yield from self._iter_days(raw_text, rejects)
+
+    def iter_stream_days(self, lines):
+        """
+        iter_days() over an iterable of lines (e.g. a file opened with
+        newline=""), holding one day at a time; rejects are not recorded.
+        """
+        return self._iter_days(lines, None)
+
+    def _iter_days(self, raw_text, rejects):
+        cur_key = None
+        day = None
+        blocks, segments = [], []
+        for offset, end, rec in self._records(raw_text):
+            if rec is None:
+                if rejects is not None:
+                    rejects.record(offset, REASON_BAD_RECORD, raw_text[offset:end].rstrip("\r\n"))
+                continue
+            try:
+                on, rec_day = self._day_key(rec)
+                block = self._block(rec, on)
+            except ValueError:
+                block = None
+                reason = REASON_BAD_RECORD
+            else:
+                reason = REASON_NO_TIME_RANGE
+            if block is None:
+                if rejects is not None:
+                    rejects.record(offset, reason, raw_text[offset:end].rstrip("\r\n"))
+                continue
+
+            key = (on, rec_day)
+            if key != cur_key and blocks:
+                finished, net = self.finish_blocks(blocks, self.policies.scan_breaks(segments))
+                yield day, finished, net
+                blocks, segments = [], []
+            cur_key, day = key, rec_day
+            blocks.append(block)
+            segments.extend(self._break_segments(rec, block))
+
+        if blocks:
+            finished, net = self.finish_blocks(blocks, self.policies.scan_breaks(segments))
+            yield day, finished, net
@@ -2,10 +2,15 @@
 
 from .constants import (CONSTANTS, DAY_ABBREVIATIONS, DAY_MAPPING, DAY_NAMES,
                         DEFAULT_OUTPUT_FILENAME, TITLE_MINOR_WORDS, WATERMARK)
-from .logger import LoggerFactory
+from .logger import JsonLinesFormatter, LoggerFactory
+from .memprofile import MemoryProfiler
+from .profiler import RunProfiler
 
 __all__ = [
     "LoggerFactory",
+    "JsonLinesFormatter",
+    "MemoryProfiler",
+    "RunProfiler",
     "CONSTANTS",
     "WATERMARK",
     "DAY_NAMES",
@@ -7,28 +7,39 @@ Centralized logger factory for the payday project.
 Env controls:
 - WORKHOUR_LOGLEVEL: logging level (default: INFO)
 - WORKHOUR_LOGFILE: optional log file path
+- WORKHOUR_LOGFORMAT: "text" (default) or "json" (one JSON object per line)
+
+Non-blocking: loggers only enqueue records; a single background
+QueueListener thread owns the stderr/file handlers and does all I/O.
 
 Idempotent: no duplicate handlers per logger name.
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
 
 class _LoggerConfig:
     """Internal config derived from environment variables (no dataclass, no type hints)."""
 
-    def __init__(self, level_name="INFO", logfile=None):
+    def __init__(self, level_name="INFO", logfile=None, fmt="text"):
         self.level_name = level_name
         self.logfile = logfile
+        self.fmt = fmt
 
     @classmethod
     def from_env(cls):
         level = os.getenv("WORKHOUR_LOGLEVEL", "INFO").strip().upper()
         logfile = os.getenv("WORKHOUR_LOGFILE")
         logfile = logfile.strip() if logfile else None
-        return cls(level_name=level, logfile=logfile)
+        fmt = os.getenv("WORKHOUR_LOGFORMAT", "text").strip().lower()
+        return cls(level_name=level, logfile=logfile, fmt=fmt)
 
     @property
     def level(self):
@@ -36,9 +47,59 @@ class _LoggerConfig:
         return getattr(logging, self.level_name, logging.INFO)
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Structured formatter: one JSON object per record.
+
+    Timing fields:
+      ts          -> wall-clock epoch seconds when the record was created
+      rel_ms      -> milliseconds since logging was initialised
+      elapsed_ms  -> caller-supplied duration, via extra={"elapsed_ms": ...}
+    Any other `extra` keys listed in EXTRA_FIELDS are copied through.
+    """
+
+    EXTRA_FIELDS = ("elapsed_ms", "stage", "lines", "rows", "blocks", "path")
+
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 6),
+            "rel_ms": round(record.relativeCreated, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key in self.EXTRA_FIELDS:
+            if key in record.__dict__:
+                payload[key] = record.__dict__[key]
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _PassthroughQueueHandler(QueueHandler):
+    """
+    Enqueue the record without formatting it on the calling thread.
+
+    The message is rendered once (args merged) so records stay picklable and
+    safe to hand across threads; the listener's handlers apply the formatter.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
 class LoggerFactory:
     """
-    Provides configured loggers with stderr + optional file handlers.
+    Provides configured loggers that log through one background writer thread.
 
     Usage:
         from payday.infra import LoggerFactory
@@ -47,30 +108,80 @@ class LoggerFactory:
 
     _formatter = logging.Formatter("[%(levelname)s] %(message)s")
     _configured_names = set()
+    _lock = threading.Lock()
+    _queue = None
+    _listener = None
 
     @classmethod
-    def get_logger(cls, name):
-        logger = logging.getLogger(name)
-        if name in cls._configured_names:
-            return logger  # Already configured
+    def _make_formatter(cls, cfg):
+        return JsonLinesFormatter() if cfg.fmt == "json" else cls._formatter
 
-        cfg = _LoggerConfig.from_env()
+    @classmethod
+    def _start_listener(cls, cfg):
+        """Start the single writer thread on the shared queue (caller holds _lock)."""
+        formatter = cls._make_formatter(cfg)
+        handlers = []
 
         # Always attach stderr handler
         stderr_handler = logging.StreamHandler(sys.stderr)
-        stderr_handler.setFormatter(cls._formatter)
-        logger.addHandler(stderr_handler)
+        stderr_handler.setFormatter(formatter)
+        handlers.append(stderr_handler)
 
         # Optionally add file handler
+        file_error = None
         if cfg.logfile:
             try:
                 file_handler = logging.FileHandler(cfg.logfile, encoding="utf-8")
-                file_handler.setFormatter(cls._formatter)
-                logger.addHandler(file_handler)
+                file_handler.setFormatter(formatter)
+                handlers.append(file_handler)
             except Exception as e:
-                logger.error("Failed to set up file logging at %s: %s", cfg.logfile, e)
+                file_error = e
+
+        if cls._queue is None:
+            cls._queue = queue.SimpleQueue()
+            atexit.register(cls.shutdown)
+        cls._listener = QueueListener(cls._queue, *handlers)
+        cls._listener.start()
+
+        if file_error is not None:
+            stderr_handler.handle(logging.makeLogRecord({
+                "name": "payday.infra.logger",
+                "levelno": logging.ERROR,
+                "levelname": "ERROR",
+                "msg": "Failed to set up file logging at %s: %s" % (cfg.logfile, file_error),
+            }))
 
-        # Apply level and mark configured
-        logger.setLevel(cfg.level)
-        cls._configured_names.add(name)
+    @classmethod
+    def get_logger(cls, name):
+        logger = logging.getLogger(name)
+        with cls._lock:
+            cfg = _LoggerConfig.from_env()
+            # First use, or restart on the same queue after shutdown()
+            if cls._listener is None:
+                cls._start_listener(cfg)
+            if name in cls._configured_names:
+                return logger  # Already configured
+
+            # Loggers only enqueue; the listener thread does the I/O
+            logger.addHandler(_PassthroughQueueHandler(cls._queue))
+
+            # Apply level and mark configured
+            logger.setLevel(cfg.level)
+            cls._configured_names.add(name)
         return logger
+
+    @classmethod
+    def shutdown(cls):
+        """Drain pending records and stop the writer thread (registered with atexit)."""
+        with cls._lock:
+            listener, cls._listener = cls._listener, None
+            if listener is None:
+                return
+            listener.stop()
+            for handler in listener.handlers:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    pass  # stream already closed by the embedding process (e.g. captured stderr)
+                if isinstance(handler, logging.FileHandler):
+                    handler.close()
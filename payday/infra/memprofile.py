@@ -0,0 +1,175 @@
+#payday\infra\memprofile.py
+"""
+infra/memprofile.py
+
+Allocation profiling for pipeline stages (tracemalloc based).
+
+- stage(name): context manager measuring peak and retained bytes of one stage
+  plus its top allocation sites (snapshot diff)
+- watch(pipe)/track(name, fn): attribution inside a streaming Pipeline,
+  where stages interleave batch by batch: every pull of a batch from a
+  stage (and every call of a tracked tap sink) is measured on its own,
+  excluding the upstream stages it pulls from. Peak is the largest single
+  batch; retained is not reported, since batches are allocated by one stage
+  and freed by a later one
+- report(log, lines): per-stage summary through the given logger
+- over_budget(lines, budget): stages whose peak bytes per input line exceed
+  a budget, so memory regressions can fail the run loudly
+
+Disabled profilers hand out a shared no-op context: zero tracing overhead.
+"""
+
+import contextlib
+import tracemalloc
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class StageStats:
+    """Measurements for one stage (bytes)."""
+
+    def __init__(self, name, peak, retained, top):
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+        self.top = top
+
+
+class MemoryProfiler:
+    """Per-stage peak/retained memory attribution."""
+
+    def __init__(self, enabled=False, top=5, frames=1):
+        self.enabled = bool(enabled)
+        self.top = int(top)
+        self.frames = max(1, int(frames))
+        self.stages = []
+        self._started_here = False
+        self._frames = []  # [name, base, top, inclusive] of open measurements
+        self._streamed = {}  # name -> StageStats of watched stages
+
+    def start(self):
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+        return self
+
+    def stop(self):
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def stage(self, name):
+        """Measure the enclosed block as stage `name` (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    def watch(self, pipe, prefix=""):
+        """Measure every stage of `pipe` per batch, as `prefix + stage name` (no-op when disabled)."""
+        if self.enabled:
+            for name, stage in list(pipe.stages):
+                pipe.replace(name, self._watched(prefix + name, stage))
+        return pipe
+
+    def track(self, name, fn):
+        """fn, with each call measured as streamed stage `name` (e.g. a tap sink)."""
+        if not self.enabled:
+            return fn
+
+        def tracked(*args):
+            self._enter(name)
+            try:
+                return fn(*args)
+            finally:
+                self._exit_streamed()
+        return tracked
+
+    def _watched(self, name, stage):
+        def watched(batches, ctx):
+            it = iter(stage(batches, ctx))
+            while True:
+                self._enter(name)
+                try:
+                    batch = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    self._exit_streamed()
+                yield batch
+        return watched
+
+    # ----- Frames -----
+    # tracemalloc has one global peak, reset whenever a frame opens or
+    # closes; each open frame keeps the highest peak seen while it was on
+    # top (exclusive) or anywhere inside it (inclusive, for stage()).
+    def _enter(self, name, inclusive=False):
+        cur, peak = tracemalloc.get_traced_memory()
+        if self._frames:
+            parent = self._frames[-1]
+            parent[2] = max(parent[2], peak)
+        tracemalloc.reset_peak()
+        self._frames.append([name, cur, cur, inclusive])
+
+    def _exit(self):
+        cur, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        name, base, top, _ = self._frames.pop()
+        top = max(top, peak)
+        for outer in self._frames:
+            if outer[3]:
+                outer[2] = max(outer[2], top)
+        return name, max(0, top - base), cur - base
+
+    def _exit_streamed(self):
+        name, peak, _ = self._exit()
+        st = self._streamed.get(name)
+        if st is None:
+            st = self._streamed[name] = StageStats(name, 0, None, [])
+            self.stages.append(st)
+        st.peak = max(st.peak, peak)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        before_snap = tracemalloc.take_snapshot()
+        self._enter(name, inclusive=True)
+        try:
+            yield
+        finally:
+            _, peak, retained = self._exit()
+            after_snap = tracemalloc.take_snapshot()
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            diff = after_snap.filter_traces(filters).compare_to(before_snap.filter_traces(filters), "lineno")
+            top = [(str(d.traceback[0]), d.size_diff, d.count_diff) for d in diff[: self.top] if d.size_diff > 0]
+            self.stages.append(StageStats(name, peak, retained, top))
+
+    def report(self, log, lines=None):
+        """Log peak/retained bytes (and bytes per input line) per stage."""
+        for st in self.stages:
+            per_line = ""
+            if lines:
+                per_line = " (%.0f B/line peak)" % (st.peak / float(lines))
+            retained = _fmt(st.retained) if st.retained is not None else "- (per batch)"
+            log.info("[mem] %-14s peak=%s retained=%s%s", st.name, _fmt(st.peak), retained, per_line)
+            for site, size, count in st.top:
+                log.info("[mem]     %s +%s in %d block(s)", site, _fmt(size), count)
+
+    def over_budget(self, lines, budget):
+        """[(stage, bytes_per_line)] for stages whose peak exceeds budget bytes/line."""
+        if not lines or not budget:
+            return []
+        out = []
+        for st in self.stages:
+            per_line = st.peak / float(lines)
+            if per_line > budget:
+                out.append((st.name, per_line))
+        return out
+
+
+def _fmt(n):
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return "%s%.1f%s" % (sign, n, unit) if unit != "B" else "%s%d%s" % (sign, n, unit)
+        n /= 1024.0
+    return "%s%.1fGiB" % (sign, n)
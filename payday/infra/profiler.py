@@ -0,0 +1,134 @@
+#payday\infra\profiler.py
+"""
+infra/profiler.py
+
+Function-level CPU profiling of a run (cProfile, stdlib only).
+
+- start()/stop(): profile everything in between; sample(i): profile only
+  every Nth unit of work (batch inputs), so long batches stay cheap
+- write(): the raw .pstats file (pstats/snakeviz/gprof2dot) plus a
+  collapsed-stack ("folded") text file for flamegraph.pl, inferno or
+  speedscope
+- report(log): top-N functions by self time
+
+cProfile records caller->callee edges, not full stacks: folded stacks are
+rebuilt by walking the call graph from its roots and splitting each
+function's time across its callers in proportion to the time each call
+edge accounts for. Recursive cycles are cut at their first repeat.
+"""
+
+import contextlib
+import cProfile
+import pstats
+from pathlib import Path
+
+_NULL_SAMPLE = contextlib.nullcontext()
+# Deeper paths are folded into their ancestor (keeps pathological recursion bounded)
+_MAX_DEPTH = 256
+
+
+def _label(func):
+    filename, lineno, name = func
+    if filename == "~":  # builtins: name is already "<built-in method ...>"
+        return name.replace(";", ",")
+    path = Path(filename)
+    short = "%s/%s" % (path.parent.name, path.name) if path.name == "__init__.py" else path.name
+    return ("%s:%d(%s)" % (short, lineno, name)).replace(";", ",")
+
+
+class RunProfiler:
+    """cProfile wrapper with pstats + folded-stack output."""
+
+    def __init__(self, out_path=None, top=15, every=1):
+        self.out_path = Path(out_path) if out_path else None
+        self.enabled = self.out_path is not None
+        self.top = int(top)
+        self.every = max(1, int(every))
+        self._profile = cProfile.Profile() if self.enabled else None
+        self._running = False
+
+    @property
+    def folded_path(self):
+        return self.out_path.with_suffix(".folded") if self.out_path else None
+
+    def start(self):
+        if self.enabled and not self._running:
+            self._profile.enable()
+            self._running = True
+        return self
+
+    def stop(self):
+        if self._running:
+            self._profile.disable()
+            self._running = False
+
+    def sample(self, index):
+        """Profile the enclosed block if index is a multiple of `every` (no-op otherwise)."""
+        if not self.enabled or index % self.every:
+            return _NULL_SAMPLE
+        return self._sampled()
+
+    @contextlib.contextmanager
+    def _sampled(self):
+        self.start()
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def stats(self):
+        self._profile.create_stats()
+        if not self._profile.stats:
+            return pstats.Stats()  # nothing sampled (e.g. every input skipped via checkpoint)
+        return pstats.Stats(self._profile)
+
+    def write(self):
+        """Write the pstats dump to out_path and folded stacks beside it; returns both paths."""
+        self.stop()
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(str(self.out_path))
+        with self.folded_path.open("w", encoding="utf-8", newline="\n") as f:
+            for stack, micros in self.folded(self.stats()):
+                f.write("%s %d\n" % (stack, micros))
+        return self.out_path, self.folded_path
+
+    @staticmethod
+    def folded(stats):
+        """[(semicolon-joined stack, self microseconds)] rebuilt from caller edges."""
+        table = stats.stats  # func -> (cc, nc, tt, ct, {caller: (cc, nc, tt, ct)})
+        callees = {}
+        for func, (_, _, _, _, callers) in table.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+        roots = [func for func, entry in table.items() if not entry[4]]
+
+        totals = {}
+        # Iterative DFS: (func, share of func's cumulative time on this path, path labels, path funcs)
+        todo = [(func, table[func][3], (_label(func),), (func,)) for func in roots]
+        while todo:
+            func, share, labels, funcs = todo.pop()
+            _, _, tt, ct, _ = table[func]
+            scale = share / ct if ct > 0 else 0.0
+            self_time = tt * scale
+            children = callees.get(func, ()) if len(funcs) < _MAX_DEPTH else ()
+            for child, edge_ct in children:
+                if child in funcs:
+                    continue  # recursion: already counted inside the child's own frame
+                child_share = edge_ct * scale
+                if child_share >= 1e-6:  # prune sub-microsecond paths (bounds fan-out)
+                    todo.append((child, child_share, labels + (_label(child),), funcs + (child,)))
+            if self_time > 0:
+                key = ";".join(labels)
+                totals[key] = totals.get(key, 0.0) + self_time
+        return sorted((stack, int(round(t * 1e6))) for stack, t in totals.items() if t * 1e6 >= 0.5)
+
+    def report(self, log):
+        """Log the top functions by self time."""
+        stats = self.stats()
+        total = stats.total_tt or 0.0
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[: self.top]
+        log.info("[prof] %.3fs profiled; top %d by self time:", total, len(rows))
+        for func, (cc, nc, tt, ct, _) in rows:
+            calls = str(nc) if nc == cc else "%d/%d" % (nc, cc)
+            pct = 100.0 * tt / total if total else 0.0
+            log.info("[prof] %8.3fs %5.1f%% cum %8.3fs %10s  %s", tt, pct, ct, calls, _label(func))
@@ -3,55 +3,664 @@
 
 CLI entrypoint:
 - Reads input text (file path arg or stdin)
-- Parses into structured rows
+- Reads free-text logs or structured CSV/TSV/JSONL records (--input-format)
+- Loads optional client/location aliases (--aliases PATH)
+- Records dropped lines/segments to a reject file (--rejects PATH)
+- Loads optional break/deduction rules (--rules PATH)
+- Drops (and rejects) lines over a length budget (--max-line-chars N)
+- Optionally writes a binary columnar block snapshot (--snapshot PATH)
+- Optionally writes a streamed XLSX workbook (--xlsx PATH)
+- Writes rows to several sinks from one parse (--sink [KIND:]PATH, repeatable:
+  csv, jsonl, sqlite, xlsx); each sink has its own writer thread behind a
+  bounded queue, so a slow sink throttles parsing instead of buffering
+- Optionally computes pay/overtime from a rate file (--pay RATES [--pay-out PATH])
+- Optionally reports per-stage memory (--memprofile and/or --mem-budget BYTES);
+  each pipeline stage and the sinks are measured per batch
+- Optionally profiles the run with cProfile: pstats + folded stacks + top-N
+  summary (--profile OUT; batch mode can sample --profile-every N inputs)
+- Batch mode: several inputs -> one CSV each in --out-dir, resumable through
+  a checkpoint journal (--checkpoint PATH)
+- Batch inputs can be parsed on worker processes (--workers N); results come
+  back through shared memory
+- Optionally splits blocks into per-week/client/employee CSVs
+  (--partition-by KEY [--partition-dir DIR])
+- Optionally writes all blocks, ordered by employee/date/start, to one CSV
+  through a bounded-memory external merge sort (--sort-out PATH [--sort-run N])
+- Batch mode: optionally reports overlapping blocks of different employees
+  on the same client or location (--conflicts PATH [--conflicts-by KEY])
+- Optionally withholds repeated days (same normalized line or block tuple,
+  per employee or across inputs) and reports them instead of counting them
+  (--dedupe line|blocks [--dedupe-scope employee|global] [--dedupe-undated]
+  [--dedupe-report PATH] [--dedupe-memory BYTES] [--dedupe-fp RATE]); block
+  keys match only dated days unless --dedupe-undated is given (line keys
+  always match), and a run where they could check no day at all fails;
+  exact fingerprints switch to a Bloom filter past the memory budget
+- Optionally flags outlier days/blocks against per-employee/client/weekday
+  baselines (Welford mean/std + P-square quartiles) carried across runs
+  (--anomalies PATH [--anomaly-state PATH] [--anomaly-z Z]
+  [--anomaly-min-count N] [--anomaly-max-block HOURS])
+- Reads crew shorthand through declarative input grammars (--grammar PATH,
+  repeatable): each is compiled once into its own regexes and segment
+  parser; batch inputs pick a grammar by its "files" globs
+- Parses into structured rows through a staged, batched pipeline
+  (--batch-lines N lines per batch)
 - Writes CSV with total + watermark
 - Emits concise log messages and exit codes
 
+Subcommand:
+  diff OLD NEW [--out PATH]  reconcile two runs (raw logs or CSV outputs)
+
 Exit codes:
- 0 = success
- 1 = parsed no rows
- 2 = input error (e.g., file missing, no stdin)
+ 0 = success (diff: runs identical)
+ 1 = parsed no rows (batch: for some input; diff: differences found)
+ 2 = input or output error (e.g., file missing, no stdin, unwritable output)
+ 3 = a stage exceeded --mem-budget bytes per input line
 """
 
+import argparse
+import csv
 import sys
 from pathlib import Path
 
+from core.anomaly import DEFAULT_ANOMALY_MIN_COUNT, DEFAULT_ANOMALY_Z, DEFAULT_MAX_BLOCK_HOURS, AnomalyDetector
+from core.dedupe import DEDUPE_KEYS, DEDUPE_SCOPES, DEFAULT_DEDUPE_FP, DEFAULT_DEDUPE_MEMORY, DuplicateFilter
+from core.diff import BlockDiff
+from core.grammar import InputGrammar
+from core.intervals import CONFLICT_KEYS, OccupancyIndex
 from core.parser import WorkHourParser
+from core.pipeline import DEFAULT_BATCH, Pipeline
+from core.procpool import ParseResult, ProcessParsePool, snapshot_records
+from core.structured import FORMATS, StructuredLogParser, format_for_path
 from infra.logger import LoggerFactory
-from pdio.writer import CsvWriter
+from infra.memprofile import MemoryProfiler
+from infra.profiler import RunProfiler
+from pdio.anomalies import AnomalyReport
+from pdio.checkpoint import CheckpointJournal, config_fingerprint, file_digest
+from pdio.conflicts import ConflictReport
+from pdio.duplicates import DuplicateReport
+from pdio.extsort import ExternalSorter
+from pdio.partition import PARTITION_KEYS, PartitionedWriter
+from pdio.rejects import RejectSink
+from pdio.sinks import SinkFanOut, open_sink, sink_kinds
+from pdio.snapshot import SnapshotWriter
+from pdio.writer import BlockCsvWriter, CsvWriter, PaySummaryWriter
+from pdio.xlsx import XlsxWriter
+from policies.pay import PayEngine
+from policies.policies import Policies
+from policies.rules import PolicyRuleSet
+from utils.aliases import AliasNormalizer
 
 log = LoggerFactory.get_logger("payday.main")
 
 
-def _read_input_text(argv):
-    """File path via argv[1] or stdin; error if neither."""
-    if len(argv) >= 2:
-        p = Path(argv[1])
+def _build_arg_parser():
+    ap = argparse.ArgumentParser(prog="payday", description="Parse work logs into a CSV timesheet.")
+    ap.add_argument("input", nargs="*", help="input text file(s) (default: stdin; several need --out-dir)")
+    ap.add_argument("--out-dir", metavar="DIR", help="batch mode: write <input stem>.csv per input into DIR")
+    ap.add_argument("--checkpoint", metavar="PATH",
+                    help="batch mode: journal finished inputs here and skip them on rerun")
+    ap.add_argument("--input-format", choices=("auto", "text") + FORMATS, default="auto",
+                    help="input kind (default auto: .csv/.tsv/.jsonl/.ndjson are records, else free text)")
+    ap.add_argument("--aliases", metavar="PATH", help="JSON client/location alias dictionary")
+    ap.add_argument("--rejects", metavar="PATH", help="write dropped lines/segments to this CSV")
+    ap.add_argument("--rules", metavar="PATH", help="JSON break/deduction rule set")
+    ap.add_argument("--grammar", metavar="PATH", action="append",
+                    help="JSON input grammar for free-text logs; repeatable (batch: first whose "
+                         "\"files\" globs match the input, else the first without \"files\")")
+    ap.add_argument("--max-line-chars", metavar="N", type=int,
+                    help="drop input lines longer than N characters (recorded as rejects)")
+    ap.add_argument("--snapshot", metavar="PATH", help="also write a columnar block snapshot")
+    ap.add_argument("--xlsx", metavar="PATH", help="also write an XLSX workbook")
+    ap.add_argument("--sink", metavar="[KIND:]PATH", action="append",
+                    help=f"write rows here instead of CWD/cpd.csv; repeatable, all fed by one parse "
+                         f"(kinds: {', '.join(sink_kinds())}; default kind from the extension)")
+    ap.add_argument("--pay", metavar="RATES", help="JSON rate table/thresholds; writes a pay summary")
+    ap.add_argument("--pay-out", metavar="PATH", help="pay summary CSV (default: CWD/pay.csv)")
+    ap.add_argument("--batch-lines", metavar="N", type=int, default=DEFAULT_BATCH,
+                    help=f"lines handed between pipeline stages at a time (default {DEFAULT_BATCH})")
+    ap.add_argument("--workers", metavar="N", type=int,
+                    help="batch mode: parse inputs on N worker processes (shared-memory results)")
+    ap.add_argument("--partition-by", choices=PARTITION_KEYS,
+                    help="also write one block-level CSV per week, client or employee (employee = input stem)")
+    ap.add_argument("--partition-dir", metavar="DIR", help="partition output directory (default: CWD/partitions)")
+    ap.add_argument("--sort-out", metavar="PATH",
+                    help="also write every block, ordered by employee/date/start, to one CSV")
+    ap.add_argument("--sort-run", metavar="N", type=int, default=100000,
+                    help="with --sort-out: blocks held in memory before spilling a sorted run (default 100000)")
+    ap.add_argument("--conflicts", metavar="PATH",
+                    help="batch mode: report overlapping blocks of different employees on one client/location")
+    ap.add_argument("--conflicts-by", choices=CONFLICT_KEYS, default="client",
+                    help="with --conflicts: compare blocks per client or per location (default client)")
+    ap.add_argument("--dedupe", choices=DEDUPE_KEYS,
+                    help="withhold repeated days (by normalized line or canonical blocks) and report them")
+    ap.add_argument("--dedupe-scope", choices=DEDUPE_SCOPES, default="employee",
+                    help="with --dedupe: match within one employee or across all inputs (default employee)")
+    ap.add_argument("--dedupe-undated", action="store_true",
+                    help="with --dedupe blocks: also match days without a date (free-text logs); the same "
+                         "weekday and hours in another week then count as a duplicate")
+    ap.add_argument("--dedupe-report", metavar="PATH",
+                    help="with --dedupe: duplicate report CSV (default: CWD/duplicates.csv)")
+    ap.add_argument("--dedupe-memory", metavar="BYTES", type=int, default=DEFAULT_DEDUPE_MEMORY,
+                    help=f"with --dedupe: exact fingerprints kept up to BYTES, then a Bloom filter "
+                         f"(default {DEFAULT_DEDUPE_MEMORY})")
+    ap.add_argument("--dedupe-fp", metavar="RATE", type=float, default=DEFAULT_DEDUPE_FP,
+                    help=f"with --dedupe: Bloom filter false-positive rate (default {DEFAULT_DEDUPE_FP:g})")
+    ap.add_argument("--anomalies", metavar="PATH",
+                    help="flag outlier days/blocks (long or overlapping blocks, unusual hours) to this CSV")
+    ap.add_argument("--anomaly-state", metavar="PATH",
+                    help="with --anomalies: JSON baselines loaded before and saved after the run")
+    ap.add_argument("--anomaly-z", metavar="Z", type=float, default=DEFAULT_ANOMALY_Z,
+                    help=f"with --anomalies: standard deviations from the mean for an outlier "
+                         f"(default {DEFAULT_ANOMALY_Z:g})")
+    ap.add_argument("--anomaly-min-count", metavar="N", type=int, default=DEFAULT_ANOMALY_MIN_COUNT,
+                    help=f"with --anomalies: observations a baseline needs before it flags "
+                         f"(default {DEFAULT_ANOMALY_MIN_COUNT})")
+    ap.add_argument("--anomaly-max-block", metavar="HOURS", type=float, default=DEFAULT_MAX_BLOCK_HOURS,
+                    help=f"with --anomalies: flag blocks longer than HOURS (default {DEFAULT_MAX_BLOCK_HOURS:g})")
+    ap.add_argument("--memprofile", action="store_true", help="trace allocations per pipeline stage")
+    ap.add_argument("--mem-budget", metavar="BYTES", type=int,
+                    help="fail (exit 3) if a stage peaks above BYTES per input line (implies --memprofile)")
+    ap.add_argument("--profile", metavar="OUT",
+                    help="cProfile the run: pstats to OUT, folded stacks to OUT with a .folded suffix")
+    ap.add_argument("--profile-every", metavar="N", type=int,
+                    help="batch mode: profile only every Nth input (with --workers: parent side only)")
+    return ap
+
+
+def _read_input_text(path):
+    """File path or stdin; error if neither."""
+    if path:
+        p = Path(path)
         if not p.exists():
             raise FileNotFoundError(f"Input file not found: {p}")
-        return p.read_text(encoding="utf-8")
+        # Keep original line endings so reject byte offsets match the file
+        with p.open(encoding="utf-8", newline="") as f:
+            return f.read()
     if sys.stdin.isatty():
         raise RuntimeError("No input provided. Pass a file path or pipe text via stdin.")
     return sys.stdin.read()
 
 
+def _diff_main(argv):
+    ap = argparse.ArgumentParser(prog="payday diff", description="Reconcile two timesheet runs.")
+    ap.add_argument("old", help="previous run (raw log or CSV output)")
+    ap.add_argument("new", help="current run (raw log or CSV output)")
+    ap.add_argument("--out", metavar="PATH", help="write the change report CSV here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    for p in (args.old, args.new):
+        if not Path(p).exists():
+            log.error("Input file not found: %s", p)
+            return 2
+
+    differ = BlockDiff()
+    out = None
+    try:
+        out = Path(args.out).open("w", newline="", encoding="utf-8") if args.out else sys.stdout
+        w = csv.writer(out)
+        w.writerow(["Change", "Employee", "Day", "TimeBlock", "Field", "Old", "New", "HoursDelta"])
+        for rec in differ.diff(args.old, args.new):
+            w.writerow([rec["Change"], rec["Employee"], rec["Day"], rec["TimeBlock"],
+                        rec["Field"], rec["Old"], rec["New"], f"{rec['HoursDelta']:+.2f}"])
+    except (OSError, UnicodeDecodeError) as e:
+        log.error(str(e))
+        return 2
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    s = differ.summary
+    log.info("Diff: %d added, %d removed, %d changed, %d unchanged block(s); %d day(s) with other "
+             "paid hours, hours delta %+.2f",
+             s["added"], s["removed"], s["changed"], s["unchanged"], s["hours"], s["hours_delta"])
+    return 1 if (s["added"] or s["removed"] or s["changed"] or s["hours"]) else 0
+
+
+def _input_format(args, path):
+    if args.input_format != "auto":
+        return args.input_format
+    return (format_for_path(path) if path else None) or "text"
+
+
+def _grammar_for(grammars, path):
+    """Input grammar for a free-text input: first whose globs match, else first without globs."""
+    for g in grammars:
+        if g.files and g.matches(path):
+            return g
+    return next((g for g in grammars if not g.files), None)
+
+
+def _parser_key(args, path, grammars=()):
+    """Input format, or ("grammar", index) for a free-text input read by a --grammar."""
+    fmt = _input_format(args, path)
+    if fmt == "text":
+        g = _grammar_for(grammars, path)
+        if g is not None:
+            return ("grammar", grammars.index(g))
+    return fmt
+
+
+def _parser_for(args, path, policies, aliases, diagnostics=None, cache=None, grammars=()):
+    """Free-text, grammar or structured parser for one input (shared per kind via cache)."""
+    key = _parser_key(args, path, grammars)
+    parser = cache.get(key) if cache is not None else None
+    if parser is None:
+        if key == "text":
+            parser = WorkHourParser(policies=policies, aliases=aliases, diagnostics=diagnostics,
+                                    max_line_chars=args.max_line_chars)
+        elif isinstance(key, tuple):
+            parser = grammars[key[1]].parser(policies=policies, aliases=aliases, diagnostics=diagnostics,
+                                             max_line_chars=args.max_line_chars)
+        else:
+            parser = StructuredLogParser(key, policies=policies, aliases=aliases, diagnostics=diagnostics)
+        if cache is not None:
+            cache[key] = parser
+    return parser
+
+
+def _load_grammars(args):
+    return [InputGrammar.from_file(p) for p in args.grammar or ()]
+
+
+def _checkpoint_settings(args):
+    """Settings that change batch outputs; rule/alias/grammar files by content hash."""
+    def digest(path):
+        return file_digest(Path(path).read_bytes()) if path else None
+    return {
+        "aliases": digest(args.aliases),
+        "rules": digest(args.rules),
+        "grammars": [digest(p) for p in args.grammar or ()],
+        "max_line_chars": args.max_line_chars,
+    }
+
+
+def _checkpoint_config(args, path, grammars, settings):
+    """Config fingerprint of one batch input: shared settings plus the parser it resolves to."""
+    key = _parser_key(args, path, grammars)
+    parser = "grammar:" + settings["grammars"][key[1]] if isinstance(key, tuple) else key
+    return config_fingerprint({"aliases": settings["aliases"], "rules": settings["rules"],
+                               "max_line_chars": settings["max_line_chars"], "parser": parser})
+
+
+def _employee_blocks(parser, days, employee):
+    """Block records of parsed days, tagged with the employee name."""
+    for day, blocks, hours in days:
+        for rec in parser.block_records(day, blocks, hours):
+            rec["Employee"] = employee
+            yield rec
+
+
+def _partition_writer(args):
+    if not args.partition_by:
+        return None
+    return PartitionedWriter(args.partition_dir or Path.cwd() / "partitions", by=args.partition_by)
+
+
+def _close_partitions(partitions):
+    paths = partitions.close()
+    log.info("Wrote %d %s partition(s) -> %s", len(paths), partitions.by, partitions.out_dir)
+
+
+def _sorter(args):
+    return ExternalSorter(run_size=args.sort_run) if args.sort_out else None
+
+
+def _write_sorted(args, sorter):
+    writer = BlockCsvWriter(args.sort_out)
+    path = writer.write(sorter.merged())
+    log.info("Wrote %d block(s) sorted by employee/date/start (%d spilled run(s)) -> %s",
+             writer.count, sorter.spilled_runs, path)
+
+
+def _write_conflicts(args, blocks):
+    index = OccupancyIndex(blocks)
+    report = ConflictReport(args.conflicts, by=args.conflicts_by)
+    path = report.write(index.conflicts(by=args.conflicts_by))
+    log.info("Wrote %d %s conflict(s) across %d block(s) -> %s", report.count, args.conflicts_by,
+             len(index.blocks), path)
+
+
+def _sink_writers(args):
+    """Row writers for --sink targets (default: CWD/cpd.csv) plus --xlsx."""
+    writers = [open_sink(spec) for spec in args.sink] if args.sink else [CsvWriter()]
+    if args.xlsx:
+        writers.append(XlsxWriter(args.xlsx))
+    return writers
+
+
+def _dedupe_filter(args):
+    """DuplicateFilter for --dedupe (None without it); raises ValueError on bad settings."""
+    if not args.dedupe:
+        return None
+    dedupe = DuplicateFilter(args.dedupe, scope=args.dedupe_scope, memory_budget=args.dedupe_memory,
+                             fp_rate=args.dedupe_fp, undated=args.dedupe_undated)
+    dedupe.report = DuplicateReport(args.dedupe_report or Path.cwd() / "duplicates.csv")
+    return dedupe
+
+
+def _close_dedupe(dedupe):
+    report = dedupe.report
+    report.close()
+    log.info("Withheld %d duplicate day(s) of %d (%.2f h; %s fingerprints, ~%d B) -> %s",
+             dedupe.duplicates, dedupe.checked, report.hours, dedupe.mode, dedupe.nbytes, report.out_path)
+    if dedupe.undated:
+        log.warning("%d undated day(s) were not checked for duplicates (see --dedupe-undated)", dedupe.undated)
+
+
+def _dedupe_checked_nothing(dedupe):
+    """True (and logged) when --dedupe skipped every day: undated input without an opt-in."""
+    if dedupe is None or dedupe.checked or not dedupe.undated:
+        return False
+    log.error("--dedupe blocks checked none of %d undated day(s); use --dedupe line or --dedupe-undated.",
+              dedupe.undated)
+    return True
+
+
+def _anomaly_detector(args):
+    """AnomalyDetector for --anomalies (None without it), with saved baselines loaded."""
+    if not args.anomalies:
+        return None
+    detector = AnomalyDetector(z_max=args.anomaly_z, min_count=args.anomaly_min_count,
+                               max_block_hours=args.anomaly_max_block)
+    if args.anomaly_state:
+        detector.load_state(args.anomaly_state)
+    detector.report = AnomalyReport(args.anomalies)
+    return detector
+
+
+def _close_anomalies(args, detector):
+    detector.report.close()
+    log.info("Flagged %d anomal%s in %d day(s) -> %s", detector.flagged, "y" if detector.flagged == 1 else "ies",
+             detector.days, detector.report.out_path)
+    if args.anomaly_state:
+        try:
+            path = detector.save_state(args.anomaly_state)
+        except OSError as e:
+            log.error("Could not save anomaly baselines: %s", e)
+            return
+        log.info("Saved %d anomaly baseline(s) -> %s", len(detector.baselines), path)
+
+
+def _attach_checks(pipe, dedupe, detector):
+    """Dedupe first, so withheld duplicates never reach the anomaly baselines."""
+    if dedupe is not None:
+        dedupe.attach(pipe)
+    if detector is not None:
+        detector.attach(pipe)
+    return pipe
+
+
+def _iter_batch_results(args, paths, policies, aliases, prof, dedupe=None, detector=None, grammars=()):
+    """ParseResult per input, in input order (sequential or on --workers processes)."""
+    if args.workers and args.workers > 1 and paths:
+        parser = _parser_for(args, paths[0], policies, aliases, grammars=grammars)
+        yield from ProcessParsePool(parser, workers=args.workers).map(paths)
+        return
+    parsers = {}
+    for i, p in enumerate(paths):
+        with prof.sample(i):
+            data = Path(p).read_bytes()
+            raw = data.decode("utf-8")  # no newline translation, like _read_input_text
+            parser = _parser_for(args, p, policies, aliases, cache=parsers, grammars=grammars)
+            pipe = _attach_checks(Pipeline(parser, batch_size=args.batch_lines), dedupe, detector)
+            days = pipe.collect(pipe.days(raw, source=p))
+            rows = pipe.collect(pipe.resume([days], "format"))
+        blocks = [rec for day, blks, hours in days for rec in parser.block_records(day, blks, hours)]
+        yield ParseResult(p, file_digest(data), rows=rows, blocks=blocks)
+
+
+def _finish_profile(prof):
+    if not prof.enabled:
+        return
+    if not prof.stats().stats:
+        log.warning("Nothing was profiled; no profile written.")
+        return
+    try:
+        pstats_path, folded_path = prof.write()
+    except OSError as e:
+        log.error("Could not write profile: %s", e)
+        return
+    prof.report(log)
+    log.info("Wrote profile -> %s (folded stacks -> %s)", pstats_path, folded_path)
+
+
+def _batch_output(out_dir, path):
+    return out_dir / (Path(path).stem + ".csv")
+
+
+def _batch_main(args):
+    unsupported = [flag for flag, value in (("--rejects", args.rejects), ("--snapshot", args.snapshot),
+                                            ("--xlsx", args.xlsx), ("--pay", args.pay),
+                                            ("--sink", args.sink), ("--memprofile", args.memprofile),
+                                            ("--mem-budget", args.mem_budget is not None)) if value]
+    if unsupported:
+        log.error("Not supported with --out-dir: %s", ", ".join(unsupported))
+        return 2
+    if (args.partition_by or args.sort_out or args.conflicts) and args.checkpoint:
+        # Skipped inputs would be missing from the partition/sorted/conflict files
+        log.error("--partition-by, --sort-out and --conflicts cannot be combined with --checkpoint.")
+        return 2
+    if args.dedupe and (args.checkpoint or (args.workers and args.workers > 1)):
+        # Fingerprints live in this process and must see every input, in order
+        log.error("--dedupe cannot be combined with --checkpoint or --workers.")
+        return 2
+    if args.anomalies and args.workers and args.workers > 1:
+        log.error("--anomalies cannot be combined with --workers.")
+        return 2
+    if not args.input:
+        log.error("Batch mode needs at least one input file.")
+        return 2
+    stems = {}
+    for p in args.input:
+        if not Path(p).is_file():
+            log.error("Input file not found: %s", p)
+            return 2
+        other = stems.setdefault(Path(p).stem, p)
+        if other != p:
+            log.error("Inputs %s and %s would write the same output name.", other, p)
+            return 2
+
+    try:
+        grammars = _load_grammars(args)
+        aliases = AliasNormalizer.from_file(args.aliases) if args.aliases else None
+        policies = Policies(rules=PolicyRuleSet.from_file(args.rules)) if args.rules else None
+        dedupe = _dedupe_filter(args)
+        detector = _anomaly_detector(args)
+        settings = _checkpoint_settings(args) if args.checkpoint else None
+    except Exception as e:
+        log.error(str(e))
+        return 2
+    if args.workers and args.workers > 1 and len({_parser_key(args, p, grammars) for p in args.input}) > 1:
+        log.error("--workers needs all inputs in one format and grammar (see --input-format, --grammar).")
+        return 2
+
+    out_dir = Path(args.out_dir)
+    journal = CheckpointJournal(args.checkpoint) if args.checkpoint else None
+    prof = RunProfiler(args.profile, every=args.profile_every or 1)
+    partitions = None
+    sorter = _sorter(args)
+    occupancy = [] if args.conflicts else None
+    processed = skipped = empty = 0
+    try:
+        todo = []
+        for p in args.input:
+            done = None
+            if journal is not None:
+                done = journal.completed(p, [_batch_output(out_dir, p)],
+                                         _checkpoint_config(args, p, grammars, settings))
+            if done is None:
+                todo.append(p)
+            else:
+                skipped += 1
+                empty += not done.get("rows")
+        results = _iter_batch_results(args, todo, policies, aliases, prof, dedupe, detector, grammars)
+        partitions = _partition_writer(args)
+        for i, res in enumerate(results):
+            with prof.sample(i), res:
+                p = res.path
+                if partitions is not None:
+                    partitions.write(res.iter_blocks(employee=Path(p).stem))
+                if sorter is not None:
+                    sorter.extend(res.iter_blocks(employee=Path(p).stem))
+                if occupancy is not None:
+                    occupancy.extend(res.iter_blocks(employee=Path(p).stem))
+                target = _batch_output(out_dir, p)
+                outputs = []
+                if res.rows:
+                    outputs.append(CsvWriter(target, fsync=journal is not None).write(res.rows))
+                else:
+                    empty += 1
+                    log.warning("No valid work entries parsed from %s", p)
+                if journal is not None:
+                    journal.record(p, None, outputs, len(res.rows), sha256=res.sha256, targets=[target],
+                                   config=_checkpoint_config(args, p, grammars, settings))
+                processed += 1
+        if sorter is not None:
+            _write_sorted(args, sorter)
+        if occupancy is not None:
+            _write_conflicts(args, occupancy)
+    except (OSError, UnicodeDecodeError) as e:
+        log.error(str(e))
+        return 2
+    finally:
+        if journal is not None:
+            journal.close()
+        if partitions is not None:
+            _close_partitions(partitions)
+        if sorter is not None:
+            sorter.close()
+        if dedupe is not None:
+            _close_dedupe(dedupe)
+        if detector is not None:
+            _close_anomalies(args, detector)
+        _finish_profile(prof)
+
+    log.info("Batch: %d input(s) processed, %d skipped via checkpoint -> %s", processed, skipped, out_dir)
+    if _dedupe_checked_nothing(dedupe):
+        return 2
+    return 1 if empty else 0
+
+
 def main(argv):
+    if argv[1:2] == ["diff"]:
+        return _diff_main(argv[2:])
+    args = _build_arg_parser().parse_args(argv[1:])
+    if args.out_dir:
+        return _batch_main(args)
+    if args.checkpoint or args.profile_every or args.conflicts or len(args.input) > 1:
+        log.error("Several inputs, --checkpoint, --profile-every and --conflicts require --out-dir.")
+        return 2
+    args.input = args.input[0] if args.input else None
+    mem = MemoryProfiler(enabled=args.memprofile or args.mem_budget is not None).start()
+    prof = RunProfiler(args.profile).start()
+    try:
+        return _run(args, mem)
+    finally:
+        prof.stop()
+        mem.stop()
+        _finish_profile(prof)
+
+
+def _run(args, mem):
     try:
-        raw = _read_input_text(argv)
+        with mem.stage("read"):
+            raw = _read_input_text(args.input)
+        grammars = _load_grammars(args)
+        aliases = AliasNormalizer.from_file(args.aliases) if args.aliases else None
+        policies = Policies(rules=PolicyRuleSet.from_file(args.rules)) if args.rules else None
+        pay_engine = PayEngine.from_file(args.pay) if args.pay else None
+        dedupe = _dedupe_filter(args)
+        detector = _anomaly_detector(args)
+        writers = _sink_writers(args)
     except Exception as e:
         log.error(str(e))
         return 2
 
-    parser = WorkHourParser()
-    rows = parser.parse(raw)
+    rejects = RejectSink(args.rejects) if args.rejects else None
+    parser = _parser_for(args, args.input, policies, aliases, diagnostics=rejects, grammars=grammars)
+    pipe = _attach_checks(Pipeline(parser, batch_size=args.batch_lines), dedupe, detector)
+    # Rows stream into every sink as they are formatted; days are kept only for block outputs.
+    # Profiled runs write inline, so sink allocations are attributed to "parse/sinks".
+    fan = SinkFanOut(writers, threaded=not mem.enabled)
+    mem.watch(pipe, prefix="parse/")
+    pipe.tap("format", mem.track("parse/sinks", fan.write))
+    days = []
+    if args.snapshot or args.partition_by or args.sort_out or pay_engine is not None:
+        pipe.tap(pipe.stage_names[-2], days.extend)
+    sink_error = None
+    try:
+        with mem.stage("parse"):
+            rows = sum(len(batch) for batch in pipe.run(raw, source=args.input or "<stdin>"))
+    except Exception as e:
+        if not fan.failed:
+            raise
+        sink_error = e
+    finally:
+        if dedupe is not None:
+            _close_dedupe(dedupe)
+        if detector is not None:
+            _close_anomalies(args, detector)
+        if rejects is not None:
+            rejects.close()
+            log.info("Recorded %d reject(s) -> %s", rejects.count, rejects.out_path)
+        try:
+            sunk = fan.close()
+        except Exception as e:
+            sink_error = sink_error or e
+    if sink_error is not None:
+        log.error("Could not write output: %s", sink_error)
+        return 2
 
+    for _, path, count, waited in sunk:
+        if path is not None:
+            log.info("Wrote %d row(s) -> %s", count, path)
+        if waited >= 0.05:
+            log.info("Sink %s held back parsing for %.2fs (queue full)", path, waited)
     if not rows:
         log.error("No valid work entries parsed. Nothing to write.")
         return 1
+    if _dedupe_checked_nothing(dedupe):
+        return 2
+
+    try:
+        with mem.stage("write"):
+            if args.snapshot:
+                snap_path = SnapshotWriter(args.snapshot).write(snapshot_records(parser, days))
+                log.info("Wrote block snapshot -> %s", snap_path)
+
+            employee = Path(args.input).stem if args.input else ""
+            partitions = _partition_writer(args)
+            if partitions is not None:
+                try:
+                    partitions.write(_employee_blocks(parser, days, employee))
+                finally:
+                    _close_partitions(partitions)
+
+            sorter = _sorter(args)
+            if sorter is not None:
+                with sorter:
+                    sorter.extend(_employee_blocks(parser, days, employee))
+                    _write_sorted(args, sorter)
+
+        if pay_engine is not None:
+            with mem.stage("pay"):
+                pay_blocks = list(_employee_blocks(parser, days, employee))
+                totals = PayEngine.summarize(pay_engine.compute(pay_blocks))
+                pay_path = PaySummaryWriter(args.pay_out).write(totals)
+            log.info("Wrote pay summary for %d employee-week(s) -> %s", len(totals), pay_path)
+    except OSError as e:
+        log.error("Could not write output: %s", e)
+        return 2
 
-    writer = CsvWriter()  # defaults to CWD / "work hour.csv"
-    out_path = writer.write(rows)
-    log.info("Wrote %d row(s) -> %s", len(rows), out_path)
+    if mem.enabled:
+        lines = raw.count("\n") + (0 if raw.endswith("\n") else 1)
+        mem.report(log, lines)
+        over = mem.over_budget(lines, args.mem_budget)
+        for stage, per_line in over:
+            log.error("Memory budget exceeded: stage %s peaked at %.0f B/line (budget %d)",
+                      stage, per_line, args.mem_budget)
+        if over:
+            return 3
     return 0
 
 
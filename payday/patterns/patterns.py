@@ -29,9 +29,22 @@ TIME_RANGE_GENERIC = re.compile(
 )
 
 # ---------- Extractors ----------
+# Linear by construction: every quantified piece is followed by a piece that
+# cannot match its characters, so each run is consumed once and a failed
+# attempt backs off at most one run. LOC_AT's trailing class has nothing
+# after it. A client name is the first character, then word runs and
+# separator runs that alternate and end on a word run. This captures what
+# [A-Za-z0-9][\w&\-\s]+\b did without backtracking from the end of the run.
+_CLIENT_NAME = r"([A-Za-z0-9](?:\w+|[&\-\s]+\w+)(?:[&\-\s]+\w+)*)"
+
 LOC_AT      = re.compile(r"\bat\s+([A-Za-z0-9][\w\-\s&.,'#/]+)", re.IGNORECASE)
-CLIENT_WITH = re.compile(r"\bwith\s+([A-Za-z0-9][\w&\-\s]+)\b", re.IGNORECASE)
-CLIENT_FOR  = re.compile(r"\bfor\s+([A-Za-z0-9][\w&\-\s]+)\b", re.IGNORECASE)
+CLIENT_WITH = re.compile(r"\bwith\s+" + _CLIENT_NAME, re.IGNORECASE)
+CLIENT_FOR  = re.compile(r"\bfor\s+" + _CLIENT_NAME, re.IGNORECASE)
+
+# Pieces of the "for/with <client>, <task>" scan (see FieldExtractors.task_after_client):
+# maximal runs of client-name characters, and a client lead-in inside one run
+CLIENT_RUN  = re.compile(r"[\w&\-\s]+")
+CLIENT_LEAD = re.compile(r"\b(?:with|for)\b\s+[A-Za-z0-9]", re.IGNORECASE)
 
 # ---------- Lunch detection ----------
 LUNCH_POS = re.compile(
@@ -1,5 +1,19 @@
 #payday\pdio\__init__.py
 
-from .writer import CsvWriter
+from .anomalies import AnomalyReport
+from .checkpoint import CheckpointJournal
+from .duplicates import DuplicateReport
+from .extsort import ExternalSorter
+from .jsonl import JsonLinesWriter
+from .partition import PartitionedWriter
+from .rejects import RejectSink
+from .sinks import SinkFanOut, open_sink, register_sink
+from .snapshot import SnapshotReader, SnapshotWriter
+from .sqlite import SqliteWriter
+from .writer import BlockCsvWriter, CsvWriter, PaySummaryWriter
+from .xlsx import XlsxWriter
 
-__all__ = ["CsvWriter"]
+__all__ = ["CsvWriter", "PaySummaryWriter", "XlsxWriter", "RejectSink", "SnapshotWriter", "SnapshotReader",
+           "CheckpointJournal", "PartitionedWriter", "ExternalSorter", "BlockCsvWriter",
+           "DuplicateReport", "JsonLinesWriter", "SqliteWriter", "SinkFanOut", "open_sink", "register_sink",
+           "AnomalyReport"]
@@ -0,0 +1,61 @@
+"""
+pdio/anomalies.py
+
+Report sink for flagged days and blocks (see core/anomaly.py).
+
+Responsibilities:
+- One row per finding: where, what (day or block), which rule fired, and
+  the baseline it was judged against (key, count, mean, std, quartiles)
+- Buffer rows in memory and write them to CSV in bulk
+"""
+
+import csv
+from pathlib import Path
+
+
+def _num(value):
+    return "" if value is None else f"{value:.2f}"
+
+
+class AnomalyReport:
+    """Buffered CSV writer for anomaly findings."""
+
+    HEADER = ["Source", "Day", "Date", "TimeBlocks", "Scope", "Rule", "Key", "Hours",
+              "Count", "Mean", "Std", "Q1", "Q3"]
+
+    def __init__(self, out_path, buffer_size=1000):
+        self.out_path = Path(out_path)
+        self.buffer_size = max(1, int(buffer_size))
+        self.count = 0
+        self._buffer = []
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.out_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(self.HEADER)
+
+    def record(self, source, day, on_date, time_blocks, scope, rule, hours, key="", baseline=None):
+        """baseline: (count, mean, std, q1, q3) for statistical findings, None for fixed rules."""
+        count, mean, std, q1, q3 = baseline or ("", None, None, None, None)
+        self._buffer.append((source, day, on_date.isoformat() if on_date else "", time_blocks, scope, rule,
+                             key, _num(hours), count, _num(mean), _num(std), _num(q1), _num(q3)))
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        if self._fh.closed:
+            return
+        self._flush()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
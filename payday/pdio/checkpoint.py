@@ -0,0 +1,121 @@
+"""
+pdio/checkpoint.py
+
+Checkpoint journal for resumable batch runs.
+
+Responsibilities:
+- Append one JSON line per completed input (path, size, mtime, SHA-256,
+  output targets, outputs written, row count, config fingerprint), flushed
+  and fsync'd before the next input starts
+- On resume, report an input as done only if its size, mtime and content
+  hash still match, it was written to the same output targets under the
+  same effective config, and every recorded output still exists
+- Tolerate a torn last line from a crash mid-append (ignored on load)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def config_fingerprint(settings):
+    """Stable hash of the output-affecting settings (a JSON-serializable dict)."""
+    return file_digest(json.dumps(settings, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of finished batch inputs."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._done = {}
+        self._f = None
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn append from an interrupted run
+                if isinstance(rec, dict) and "path" in rec:
+                    self._done[rec["path"]] = rec
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+    def completed(self, path, targets=(), config=None):
+        """
+        Journal record for `path` if it finished in an earlier run for the
+        same output targets and config fingerprint, is unchanged since
+        (size, mtime, hash) and has its outputs in place; else None.
+        """
+        rec = self._done.get(self._key(path))
+        if rec is None:
+            return None
+        if rec.get("targets") != [self._key(t) for t in targets] or rec.get("config") != config:
+            return None
+        st = os.stat(path)
+        if st.st_size != rec.get("size") or st.st_mtime_ns != rec.get("mtime_ns"):
+            return None
+        if file_digest(Path(path).read_bytes()) != rec.get("sha256"):
+            return None
+        if not all(Path(p).exists() for p in rec.get("outputs", ())):
+            return None
+        return rec
+
+    def record(self, path, data, outputs, rows, sha256=None, targets=(), config=None):
+        """
+        Durably mark `path` (whose content was `data`) as finished; pass the
+        content hash as sha256 instead when the bytes were read elsewhere.
+        targets are the outputs this input maps to (written or not, e.g. no
+        rows), config the fingerprint of the settings that produced them.
+        Outputs must already be durable (fsync'd) when recorded.
+        """
+        st = os.stat(path)
+        rec = {
+            "path": self._key(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha256 if sha256 is not None else file_digest(data),
+            "targets": [self._key(t) for t in targets],
+            "outputs": [str(p) for p in outputs],
+            "rows": rows,
+            "config": config,
+        }
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = self.path.open("a", encoding="utf-8")
+            if self._f.tell() and not self._ends_with_newline():
+                self._f.write("\n")  # terminate a torn line so this record stays parseable
+        self._f.write(json.dumps(rec, sort_keys=True) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._done[rec["path"]] = rec
+        return rec
+
+    def _ends_with_newline(self):
+        with self.path.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
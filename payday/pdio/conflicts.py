@@ -0,0 +1,54 @@
+"""
+pdio/conflicts.py
+
+Report writer for cross-employee occupancy conflicts (see core/intervals.py).
+
+Responsibilities:
+- One row per overlapping block pair: the shared client or location, both
+  employees with their time blocks, and the overlap in minutes
+- Write the pairs to CSV in the order OccupancyIndex.conflicts() yields them
+"""
+
+import csv
+from pathlib import Path
+
+from core.intervals import OccupancyIndex
+
+
+def _span_text(start, end):
+    end %= 1440
+    return "%02d%02d-%02d%02d" % (start // 60, start % 60, end // 60, end % 60)
+
+
+class ConflictReport:
+    """CSV writer for OccupancyIndex.conflicts() pairs."""
+
+    HEADER = ["By", "Value", "Day", "Date", "EmployeeA", "TimeBlockA", "EmployeeB", "TimeBlockB",
+              "OverlapMinutes"]
+
+    def __init__(self, out_path, by="Client"):
+        self.out_path = Path(out_path)
+        self.by = by.capitalize()
+        self.count = 0
+
+    def write(self, pairs):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.out_path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(self.HEADER)
+            for a, b in pairs:
+                (sa, ea), (sb, eb) = OccupancyIndex.span(a), OccupancyIndex.span(b)
+                d = b.get("Date")
+                w.writerow([
+                    self.by,
+                    b.get(self.by, ""),
+                    b.get("Day", "Unknown"),
+                    d.isoformat() if d else "",
+                    a.get("Employee", ""),
+                    _span_text(int(a["Start"]), int(a["End"])),
+                    b.get("Employee", ""),
+                    _span_text(int(b["Start"]), int(b["End"])),
+                    min(ea, eb) - max(sa, sb),
+                ])
+                self.count += 1
+        return self.out_path
@@ -0,0 +1,63 @@
+"""
+pdio/duplicates.py
+
+Report sink for suspected duplicate submissions (see core/dedupe.py).
+
+Responsibilities:
+- One row per withheld day: where it came from, how sure the match is
+  ("exact", or "probable" once the filter runs on a Bloom filter) and where
+  the first copy was seen, when known
+- Buffer rows in memory and write them to CSV in bulk
+- Keep the withheld hours, so the report shows what the totals left out
+"""
+
+import csv
+from pathlib import Path
+
+MATCH_EXACT = "exact"
+MATCH_PROBABLE = "probable"
+
+
+class DuplicateReport:
+    """Buffered CSV writer for duplicate days."""
+
+    HEADER = ["Source", "Line", "Match", "FirstSource", "Day", "TimeBlocks", "Hours", "Text"]
+
+    def __init__(self, out_path, buffer_size=1000):
+        self.out_path = Path(out_path)
+        self.buffer_size = max(1, int(buffer_size))
+        self.count = 0
+        self.hours = 0.0
+        self._buffer = []
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.out_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(self.HEADER)
+
+    def record(self, source, line, match, first_source, day, time_blocks="", hours=None, text=""):
+        """Line/hours may be None when the key stage does not know them."""
+        self._buffer.append((source, "" if line is None else line, match, first_source or "", day,
+                             time_blocks, "" if hours is None else f"{hours:.2f}", text))
+        self.count += 1
+        if hours:
+            self.hours += hours
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        if self._fh.closed:
+            return
+        self._flush()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
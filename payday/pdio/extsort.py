@@ -0,0 +1,191 @@
+"""
+pdio/extsort.py
+
+External merge sort of block records by employee, date and start time.
+
+Responsibilities:
+- Hold at most run_size records in memory; when full, sort them and spill
+  the run to a temp file as compact tuples (marshal, in chunks)
+- k-way merge the runs with heapq.merge, fan_in runs at a time (more runs
+  are merged into intermediate runs first), so open files and memory stay
+  bounded however many inputs there are
+- Yield the merged stream as block records, ready for any block sink
+
+Order: Employee, then dated blocks by Date, then day-name-only blocks by
+weekday (Monday first, unknown last), then Start. The sort is stable:
+equal keys keep their input order.
+"""
+
+import heapq
+import marshal
+import shutil
+import struct
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from infra.constants import DAY_NAMES
+
+# Records per marshal chunk: amortizes (de)serialization calls, bounds read buffers
+_CHUNK = 1024
+# Chunk length prefix: marshal.loads on whole chunks is far faster than marshal.load on a file
+_LEN = struct.Struct("<I")
+_WEEKDAY = {name.capitalize(): i for i, name in enumerate(DAY_NAMES)}
+
+
+def _to_tuple(rec, seq):
+    # (employee, undated, date ordinal | weekday, start, seq, end, day, location, task, client, hours, unpaid)
+    # seq (input position) is unique, so plain tuple order is the stable key order
+    # and sort/merge never compare past it
+    d = rec.get("Date")
+    day = rec.get("Day", "Unknown")
+    return (
+        rec.get("Employee", ""),
+        0 if d else 1,
+        d.toordinal() if d else _WEEKDAY.get(day, 7),
+        int(rec["Start"]),
+        seq,
+        int(rec["End"]),
+        day,
+        rec.get("Location", "NaN"),
+        rec.get("Task", "NaN"),
+        rec.get("Client", "NaN"),
+        rec.get("Hours", 0.0) or 0.0,
+        int(rec.get("Unpaid", 0) or 0),
+    )
+
+
+def _to_record(t):
+    return {
+        "Employee": t[0],
+        "Day": t[6],
+        "Date": None if t[1] else date.fromordinal(t[2]),
+        "Start": t[3],
+        "End": t[5],
+        "Location": t[7],
+        "Task": t[8],
+        "Client": t[9],
+        "Hours": t[10],
+        "Unpaid": t[11],
+    }
+
+
+def _dump_chunk(f, chunk):
+    data = marshal.dumps(chunk)
+    f.write(_LEN.pack(len(data)))
+    f.write(data)
+
+
+def _write_run(path, tuples):
+    with open(path, "wb") as f:
+        chunk = []
+        for t in tuples:
+            chunk.append(t)
+            if len(chunk) >= _CHUNK:
+                _dump_chunk(f, chunk)
+                chunk = []
+        if chunk:
+            _dump_chunk(f, chunk)
+
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(_LEN.size)
+            if not head:
+                return
+            yield from marshal.loads(f.read(_LEN.unpack(head)[0]))
+
+
+class ExternalSorter:
+    """
+    Bounded-memory sorter for block records.
+
+    Usage:
+        with ExternalSorter(run_size=100000) as sorter:
+            sorter.extend(blocks)            # any number of calls
+            BlockCsvWriter(path).write(sorter.merged())
+    """
+
+    def __init__(self, run_size=100000, tmp_dir=None, fan_in=64):
+        self.run_size = max(1, int(run_size))
+        self.fan_in = max(2, int(fan_in))
+        self.tmp_dir = tmp_dir
+        self.count = 0
+        self.spilled_runs = 0
+        self._buffer = []
+        self._runs = []
+        self._dir = None
+
+    def add(self, rec):
+        self._buffer.append(_to_tuple(rec, self.count))
+        self.count += 1
+        if len(self._buffer) >= self.run_size:
+            self._spill()
+
+    def extend(self, blocks):
+        for rec in blocks:
+            self.add(rec)
+        return self
+
+    def _new_run_path(self):
+        if self._dir is None:
+            self._dir = Path(tempfile.mkdtemp(prefix="payday-sort-", dir=self.tmp_dir))
+        self.spilled_runs += 1
+        return self._dir / ("run%06d.bin" % self.spilled_runs)
+
+    def _spill(self):
+        self._buffer.sort()
+        path = self._new_run_path()
+        _write_run(path, self._buffer)
+        self._runs.append(path)
+        self._buffer = []
+
+    def _merge_runs(self, runs):
+        return heapq.merge(*[_read_run(p) for p in runs])
+
+    def merged(self):
+        """
+        Sorted block records (consumes the sorter). Runs are merged fan_in at
+        a time.
+        """
+        if not self._runs:
+            self._buffer.sort()
+            tuples, self._buffer = self._buffer, []
+            for t in tuples:
+                yield _to_record(t)
+            return
+        if self._buffer:
+            self._spill()
+        runs = self._runs
+        while len(runs) > self.fan_in:
+            next_runs = []
+            for i in range(0, len(runs), self.fan_in):
+                group = runs[i:i + self.fan_in]
+                if len(group) == 1:
+                    next_runs.append(group[0])
+                    continue
+                path = self._new_run_path()
+                _write_run(path, self._merge_runs(group))
+                for p in group:
+                    p.unlink()
+                next_runs.append(path)
+            runs = next_runs
+        self._runs = runs
+        for t in self._merge_runs(runs):
+            yield _to_record(t)
+
+    def close(self):
+        """Remove spilled runs."""
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+        self._runs = []
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,51 @@
+"""
+pdio/jsonl.py
+JSON Lines writer for structured work-hour rows (a feed for other tools).
+
+Responsibilities:
+- One JSON object per row, keys in CSV column order, Hours as a number
+- Stream row by row (same open/write_row/close contract as CsvWriter)
+- No TOTAL or watermark lines: every line is a row, so consumers can sum
+"""
+
+import json
+from pathlib import Path
+
+from pdio.writer import HEADER
+
+_BUFFER = 1 << 16
+
+
+class JsonLinesWriter:
+    """JSONL sink with the same write(rows) contract as CsvWriter."""
+
+    def __init__(self, out_path=None):
+        self.out_path = Path(out_path) if out_path else Path.cwd() / "cpd.jsonl"
+        self._fh = None
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def open(self):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.out_path.open("w", encoding="utf-8", newline="\n", buffering=_BUFFER)
+        return self
+
+    def write_row(self, r):
+        obj = {key: r.get(key, "NaN") for key in HEADER[:-1]}
+        obj["Hours"] = r.get("Hours", 0.0) or 0.0
+        self._fh.write(self._encode(obj) + "\n")
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        return self.out_path
+
+    def write(self, rows):
+        """Stream rows into a JSONL file."""
+        self.open()
+        try:
+            for r in rows:
+                self.write_row(r)
+        finally:
+            out = self.close()
+        return out
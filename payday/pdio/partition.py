@@ -0,0 +1,210 @@
+"""
+pdio/partition.py
+Partitioned CSV sink: one file per week, client or employee.
+
+Responsibilities:
+- Route block records (WorkHourParser.block_records, optionally with
+  "Employee") to <out_dir>/<partition>.csv
+- Keep at most max_open buffered file handles, closing the least recently
+  used one (reopened in append mode when its partition shows up again)
+- Format and write on a single writer thread fed by a bounded queue, so the
+  parsing thread never blocks on file I/O unless the queue is full
+- Append a per-partition TOTAL row and watermark on close
+"""
+
+import csv
+import queue
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from infra.constants import WATERMARK
+
+HEADER = ["Employee", "Day", "Date", "TimeBlock", "Location", "Tasks/Details", "Client", "Hours", "Unpaid"]
+PARTITION_KEYS = ("week", "client", "employee")
+
+_UNSAFE = re.compile(r"[^\w\-.]+")
+_STOP = object()
+# Blocks per queue item in write(): amortizes queue locking
+_BATCH = 256
+
+
+def _span_text(start, end):
+    end %= 1440
+    return "%02d%02d-%02d%02d" % (start // 60, start % 60, end // 60, end % 60)
+
+
+def block_row(rec):
+    """CSV row of one block record (HEADER order)."""
+    d = rec.get("Date")
+    return [
+        rec.get("Employee", ""),
+        rec.get("Day", "Unknown"),
+        d.isoformat() if d else "",
+        _span_text(int(rec["Start"]), int(rec["End"])),
+        rec.get("Location", "NaN"),
+        rec.get("Task", "NaN"),
+        rec.get("Client", "NaN"),
+        f"{rec.get('Hours', 0.0) or 0.0:.2f}",
+        int(rec.get("Unpaid", 0) or 0),
+    ]
+
+
+def _week_of(rec):
+    d = rec.get("Date")
+    return "%04d-W%02d" % d.isocalendar()[:2] if d else "undated"
+
+
+class PartitionedWriter:
+    """
+    Block sink writing one CSV per partition.
+
+    by: "week" (ISO week of Date, "undated" without one), "client" or "employee".
+    Each file carries per-block rows, then a TOTAL row whose Hours are net of
+    Unpaid break minutes, then the watermark. Use as a context manager or call
+    close(); write errors from the writer thread surface there.
+    """
+
+    def __init__(self, out_dir, by="employee", max_open=64, queue_size=4096, buffering=1 << 16):
+        if by not in PARTITION_KEYS:
+            raise ValueError(f"Unknown partition key: {by!r} (expected one of {', '.join(PARTITION_KEYS)})")
+        self.out_dir = Path(out_dir)
+        self.by = by
+        self.max_open = max(1, int(max_open))
+        self.buffering = buffering
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._handles = OrderedDict()  # partition -> (file, csv writer), LRU order
+        self._totals = {}  # partition -> [gross hours, unpaid minutes]
+        self._paths = {}
+        self._taken = set()
+        self._error = None
+        self.reopened = 0
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="payday-partition-writer", daemon=True)
+        self._thread.start()
+
+    # ----- Producer side -----
+    def partition_of(self, rec):
+        if self.by == "week":
+            return _week_of(rec)
+        if self.by == "client":
+            return rec.get("Client") or "NaN"
+        return rec.get("Employee") or "unknown"
+
+    def _put(self, batch):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(batch)
+
+    def write_block(self, rec):
+        self._put([rec])
+
+    def write(self, blocks):
+        batch = []
+        for rec in blocks:
+            batch.append(rec)
+            if len(batch) >= _BATCH:
+                self._put(batch)
+                batch = []
+        if batch:
+            self._put(batch)
+        return self
+
+    # ----- Writer thread -----
+    def _path_for(self, part):
+        path = self._paths.get(part)
+        if path is None:
+            name = _UNSAFE.sub("_", part).strip("._") or "_"
+            path = self.out_dir / (name + ".csv")
+            n = 1
+            # casefold: "Acme" and "ACME" must not share a file on case-insensitive filesystems
+            while path.name.casefold() in self._taken:
+                n += 1
+                path = self.out_dir / ("%s~%d.csv" % (name, n))
+            self._paths[part] = path
+            self._taken.add(path.name.casefold())
+        return path
+
+    def _handle(self, part):
+        h = self._handles.get(part)
+        if h is not None:
+            self._handles.move_to_end(part)
+            return h[1]
+        if len(self._handles) >= self.max_open:
+            _, (old, _) = self._handles.popitem(last=False)
+            old.close()
+        fresh = part not in self._totals
+        if not fresh:
+            self.reopened += 1
+        f = self._path_for(part).open("w" if fresh else "a", newline="", encoding="utf-8",
+                                      buffering=self.buffering)
+        w = csv.writer(f)
+        if fresh:
+            self._totals[part] = [0.0, 0]
+            w.writerow(HEADER)
+        self._handles[part] = (f, w)
+        return w
+
+    def _write_one(self, rec):
+        part = self.partition_of(rec)
+        w = self._handle(part)
+        row = block_row(rec)
+        total = self._totals[part]
+        total[0] += rec.get("Hours", 0.0) or 0.0
+        total[1] += row[8]
+        w.writerow(row)
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is _STOP:
+                return
+            if self._error is not None:
+                continue  # drain so producers never block after a failure
+            try:
+                for rec in batch:
+                    self._write_one(rec)
+            except Exception as e:
+                self._error = e
+
+    # ----- Finish -----
+    def _close_handles(self):
+        for f, _ in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+    def _finish(self):
+        # Partitions still in the pool get their footer now; only evicted ones are reopened
+        for part, (hours, unpaid) in self._totals.items():
+            h = self._handles.pop(part, None)
+            f, w = h if h is not None else (None, None)
+            if f is None:
+                f = self._paths[part].open("a", newline="", encoding="utf-8")
+                w = csv.writer(f)
+            with f:
+                net = max(0.0, hours - unpaid / 60.0)
+                w.writerow(["TOTAL", "", "", "", "", "", "", f"{net:.2f}", unpaid])
+                f.write(f"# {WATERMARK}\n")
+
+    def close(self):
+        """Drain the queue, write TOTAL + watermark per partition; returns {partition: path}."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            try:
+                if self._error is None:
+                    self._finish()
+            finally:
+                self._close_handles()
+        if self._error is not None:
+            raise self._error
+        return dict(self._paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,98 @@
+"""
+pdio/rejects.py
+
+Reject-file sink for input the parser could not use.
+
+Responsibilities:
+- Record dropped lines/segments with line number, byte offset and reason
+- Buffer records in memory and write them to CSV in bulk
+- Resolve line numbers/byte offsets lazily, only for rejected input
+"""
+
+import csv
+import threading
+from pathlib import Path
+
+REASON_NO_TIME_RANGE = "no_time_range"
+REASON_SEGMENT_BEFORE_BLOCK = "segment_before_block"
+REASON_LINE_TOO_LONG = "line_too_long"
+REASON_BAD_RECORD = "bad_record"
+
+
+class RejectCursor:
+    """
+    Per-input position tracker handed out by RejectSink.open_text().
+
+    Offsets must be recorded in increasing order; each record only encodes
+    the text between the previous and current offset, so resolving
+    positions stays linear in the input size.
+    """
+
+    def __init__(self, sink, raw_text, source=""):
+        self._sink = sink
+        self._raw = raw_text
+        self._source = source
+        self._pos = 0
+        self._line = 1
+        self._byte = 0
+
+    def record(self, char_offset, reason, text):
+        """Record a reject starting at char_offset in the raw text."""
+        if char_offset > self._pos:
+            raw, a, b = self._raw, self._pos, char_offset
+            self._line += raw.count("\n", a, b) + raw.count("\r", a, b) - raw.count("\r\n", a, b)
+            self._byte += len(raw[a:b].encode("utf-8"))
+            self._pos = char_offset
+        self._sink.append((self._source, self._line, self._byte, reason, text))
+
+
+class RejectSink:
+    """Buffered CSV writer for rejected input (thread-safe appends)."""
+
+    HEADER = ["Source", "Line", "ByteOffset", "Reason", "Text"]
+
+    def __init__(self, out_path, buffer_size=1000):
+        self.out_path = Path(out_path)
+        self.buffer_size = max(1, int(buffer_size))
+        self.count = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.out_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(self.HEADER)
+
+    def open_text(self, raw_text, source=""):
+        """Start tracking positions for one input text."""
+        return RejectCursor(self, raw_text, source)
+
+    def append(self, rec):
+        with self._lock:
+            self._buffer.append(rec)
+            self.count += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+            self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._flush_locked()
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,188 @@
+"""
+pdio/sinks.py
+
+Row sinks by name, and fan-out of one row stream to several of them.
+
+Responsibilities:
+- Registry of row writers ("csv", "jsonl", "sqlite", "xlsx"; more via
+  register_sink) with the streaming contract open() / write_row(row) /
+  close() -> path
+- Sink specs: "KIND:PATH", or a bare PATH whose extension names the kind;
+  an unknown KIND is an error (a one-letter prefix is a Windows drive)
+- SinkFanOut: every batch of rows goes to each sink's bounded queue, drained
+  by that sink's own writer thread. A full queue blocks the producer, so a
+  slow sink throttles parsing (backpressure) instead of piling up rows,
+  and one parse pass feeds all sinks concurrently. threaded=False writes
+  inline on the producer's thread instead (e.g. for memory attribution)
+
+Batches are shared between sinks: writers must not modify rows.
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+
+from pdio.jsonl import JsonLinesWriter
+from pdio.sqlite import SqliteWriter
+from pdio.writer import CsvWriter
+from pdio.xlsx import XlsxWriter
+
+_STOP = object()
+
+_SINKS = {}  # kind -> factory(path)
+_EXTENSIONS = {}  # ".ext" -> kind
+
+
+def register_sink(kind, factory, extensions=()):
+    """Make `kind` available to --sink; factory(path) returns a row writer."""
+    _SINKS[kind] = factory
+    for ext in extensions:
+        _EXTENSIONS[ext.lower()] = kind
+
+
+def sink_kinds():
+    return sorted(_SINKS)
+
+
+register_sink("csv", CsvWriter, (".csv",))
+register_sink("jsonl", JsonLinesWriter, (".jsonl", ".ndjson"))
+register_sink("sqlite", SqliteWriter, (".db", ".sqlite", ".sqlite3"))
+register_sink("xlsx", XlsxWriter, (".xlsx",))
+
+
+def open_sink(spec):
+    """Writer for "KIND:PATH" or PATH (kind from the extension); ValueError if unknown."""
+    kind, sep, path = spec.partition(":")
+    if sep and kind not in _SINKS and not (len(kind) == 1 and kind.isalpha()):  # "C:\out.csv" is a path
+        raise ValueError(f"Unknown sink kind {kind!r} in {spec!r} (kinds: {', '.join(sink_kinds())})")
+    if not sep or kind not in _SINKS:
+        kind, path = _EXTENSIONS.get(Path(spec).suffix.lower()), spec
+        if kind is None:
+            raise ValueError(f"Cannot tell the sink kind of {spec!r}; use KIND:PATH "
+                             f"(kinds: {', '.join(sink_kinds())})")
+    if not path:
+        raise ValueError(f"Sink {spec!r} has no path")
+    return _SINKS[kind](path)
+
+
+class _SinkWorker:
+    """One sink, its bounded queue and its writer thread (opened on the first batch)."""
+
+    def __init__(self, writer, queue_size, threaded=True):
+        self.writer = writer
+        self.rows = 0
+        self.waited = 0.0  # producer seconds blocked on this sink's full queue
+        self.error = None
+        self.path = None
+        self.threaded = threaded
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._opened = False
+
+    def put(self, batch):
+        if not self.threaded:
+            self._consume(batch)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="payday-sink-writer", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            t = time.perf_counter()
+            self._queue.put(batch)
+            self.waited += time.perf_counter() - t
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is _STOP:
+                break
+            self._consume(batch)  # after a failure this only drains, so the producer never blocks
+        self._close()
+
+    def _consume(self, batch):
+        if self.error is not None:
+            return
+        try:
+            if not self._opened:
+                self._opened = True
+                self.writer.open()
+            for row in batch:
+                self.writer.write_row(row)
+            self.rows += len(batch)
+        except Exception as e:
+            self.error = e
+
+    def _close(self):
+        if self._opened:
+            self._opened = False
+            try:
+                self.path = self.writer.close()
+            except Exception as e:
+                self.error = self.error or e
+
+    def finish(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        elif not self.threaded:
+            self._close()
+
+
+class SinkFanOut:
+    """
+    One producer, several row sinks.
+
+    Usage:
+        fan = SinkFanOut([open_sink("cpd.csv"), open_sink("feed.jsonl")])
+        pipe.tap("format", fan.write)
+        pipe.collect(pipe.run(raw_text))
+        for writer, path, rows, waited in fan.close(): ...
+
+    Sinks are opened on the first batch, so a run that yields no rows
+    creates no files. write() raises the first sink error once it is
+    known; close() drains and closes every sink, then raises the first
+    sink error unless write() already raised it.
+    """
+
+    def __init__(self, writers, queue_size=8, threaded=True):
+        self.threaded = threaded
+        self._workers = [_SinkWorker(w, max(1, int(queue_size)), threaded) for w in writers]
+        self._raised = False
+
+    @property
+    def failed(self):
+        return any(w.error is not None for w in self._workers)
+
+    def _raise_first(self):
+        for worker in self._workers:
+            if worker.error is not None:
+                self._raised = True
+                raise worker.error
+
+    def write(self, batch):
+        if not batch:
+            return
+        self._raise_first()
+        for worker in self._workers:
+            worker.put(batch)
+        if not self.threaded:
+            self._raise_first()
+
+    def close(self):
+        """[(writer, path or None, rows, producer wait seconds)] per sink, in order."""
+        for worker in self._workers:
+            worker.finish()
+        if not self._raised:
+            self._raise_first()
+        return [(w.writer, w.path, w.rows, w.waited) for w in self._workers]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,367 @@
+"""
+pdio/snapshot.py
+
+Binary columnar snapshot of parsed blocks, reloaded through mmap.
+
+The same encoding travels between processes in shared memory
+(SnapshotWriter.encode() / SnapshotReader.from_buffer(), see core/procpool.py).
+
+Layout (little-endian):
+  header     "<8sHHQI": magic, version, column count, row count, string count
+  directory  per column "<8s1s7xQQ": name, array typecode, offset, byte length
+  columns    each 8-byte aligned, raw array bytes
+
+Columns:
+  day       b   weekday index 0=Monday..6=Sunday, -1 unknown
+  date      i   proleptic ordinal (date.toordinal()), 0 unknown
+  start     h   minutes from midnight
+  end       h   minutes from midnight of the start day (> 1440 past midnight)
+  location  I   string id
+  task      I   string id
+  client    I   string id
+  hours     i   block hours x 100
+  row       I   output row (day) the block belongs to
+  net       i   net hours of that row x 100 (after break deductions)
+  stroff    I   string table offsets (n_strings + 1) into strblob
+  strblob   B   UTF-8 bytes of all distinct strings
+
+String ids index one shared dictionary, so repeated clients/locations/tasks
+are stored once. Readers look columns up by name; row/net come from the
+optional "Row"/"Net" keys of block records (default: one row per block).
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+
+from infra.constants import DAY_NAMES
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+MAGIC = b"PDSNAP1\x00"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHQI")
+_DIRENT = struct.Struct("<8s1s7xQQ")
+
+_COLUMNS = (
+    ("day", "b"),
+    ("date", "i"),
+    ("start", "h"),
+    ("end", "h"),
+    ("location", "I"),
+    ("task", "I"),
+    ("client", "I"),
+    ("hours", "i"),
+    ("row", "I"),
+    ("net", "i"),
+)
+
+_NUMPY_TYPES = {"b": "<i1", "h": "<i2", "i": "<i4", "I": "<u4", "B": "<u1"}
+
+_DAY_INDEX = {name.capitalize(): i for i, name in enumerate(DAY_NAMES)}
+# Indexed by the day column; -1 (unknown) picks the trailing entry
+_DAY_OUT = [name.capitalize() for name in DAY_NAMES] + ["Unknown"]
+_LITTLE = sys.byteorder == "little"
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _centi(hours):
+    return int(round(float(hours or 0.0) * 100))
+
+
+def _span_text(start, end):
+    end %= 1440
+    return "%02d%02d-%02d%02d" % (start // 60, start % 60, end // 60, end % 60)
+
+
+class EncodedSnapshot:
+    """Encoded snapshot parts; size is the exact byte length of the layout."""
+
+    def __init__(self, header, payloads):
+        self._header = header
+        self._payloads = payloads  # (offset, bytes)
+        last = payloads[-1] if payloads else None
+        self.size = last[0] + len(last[1]) if last else len(header)
+
+    def write_to(self, f):
+        f.write(self._header)
+        pos = len(self._header)
+        for off, data in self._payloads:
+            f.write(b"\x00" * (off - pos))
+            f.write(data)
+            pos = off + len(data)
+
+    def copy_into(self, buf):
+        """Copy into a writable buffer of at least self.size bytes (e.g. SharedMemory.buf)."""
+        buf[:len(self._header)] = self._header
+        for off, data in self._payloads:
+            buf[off:off + len(data)] = data
+
+
+class SnapshotWriter:
+    """Writes block records (WorkHourParser.block_records output) as a snapshot."""
+
+    def __init__(self, out_path):
+        self.out_path = Path(out_path)
+
+    def write(self, blocks):
+        """Encode an iterable of block records; returns the output path."""
+        encoded = self.encode(blocks)
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.out_path.open("wb") as f:
+            encoded.write_to(f)
+        return self.out_path
+
+    @staticmethod
+    def encode(blocks):
+        """Encode block records into an EncodedSnapshot (no I/O)."""
+        lists = {name: [] for name, _ in _COLUMNS}
+        strings = {}
+        sid_of = strings.setdefault
+        centi = {}  # hours value -> hundredths; hours repeat heavily
+        day_app, date_app = lists["day"].append, lists["date"].append
+        start_app, end_app = lists["start"].append, lists["end"].append
+        loc_app, task_app, client_app = lists["location"].append, lists["task"].append, lists["client"].append
+        hours_app, row_app, net_app = lists["hours"].append, lists["row"].append, lists["net"].append
+
+        for i, b in enumerate(blocks):
+            day_app(_DAY_INDEX.get(b.get("Day"), -1))
+            d = b.get("Date")
+            date_app(d.toordinal() if d else 0)
+            start_app(int(b["Start"]))
+            end_app(int(b["End"]))
+            loc_app(sid_of(b.get("Location") or "NaN", len(strings)))
+            task_app(sid_of(b.get("Task") or "NaN", len(strings)))
+            client_app(sid_of(b.get("Client") or "NaN", len(strings)))
+            h = b.get("Hours")
+            net = b.get("Net", h)
+            ch = centi.get(h)
+            if ch is None:
+                ch = centi[h] = _centi(h)
+            cn = centi.get(net)
+            if cn is None:
+                cn = centi[net] = _centi(net)
+            hours_app(ch)
+            row_app(b.get("Row", i))
+            net_app(cn)
+        cols = {name: array(code, lists[name]) for name, code in _COLUMNS}
+        n_blocks = len(lists["day"])
+        del lists
+
+        stroff = array("I", [0])
+        blob = bytearray()
+        for s in strings:  # dicts keep insertion order == id order
+            blob += s.encode("utf-8")
+            stroff.append(len(blob))
+        cols["stroff"] = stroff
+        cols["strblob"] = array("B", blob)
+
+        payloads = []
+        for name, col in cols.items():
+            if not _LITTLE and col.itemsize > 1:
+                col = array(col.typecode, col)
+                col.byteswap()
+            payloads.append((name, col.typecode, col.tobytes()))
+
+        offset = _align(_HEADER.size + _DIRENT.size * len(payloads))
+        head = [_HEADER.pack(MAGIC, VERSION, len(payloads), n_blocks, len(strings))]
+        placed = []
+        for name, code, data in payloads:
+            head.append(_DIRENT.pack(name.encode("ascii"), code.encode("ascii"), offset, len(data)))
+            placed.append((offset, data))
+            offset = _align(offset + len(data))
+        return EncodedSnapshot(b"".join(head), placed)
+
+
+class SnapshotReader:
+    """
+    Memory-mapped snapshot reader.
+
+    column(name) returns a zero-copy memoryview (or NumPy array with
+    use_numpy=True and NumPy installed) over the mapped file. Views are only
+    valid until close(), and NumPy arrays must be dropped before close();
+    on big-endian hosts memoryview columns are byte-swapped copies.
+    """
+
+    def __init__(self, path, use_numpy=False, _buffer=None):
+        self.path = Path(path) if path is not None else None
+        self.use_numpy = bool(use_numpy) and np is not None
+        self._views = []
+        self._strings = None
+        if _buffer is not None:
+            self._fh = None
+            self._mm = _buffer
+        else:
+            self._fh = self.path.open("rb")
+            try:
+                self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                self._fh.close()
+                raise ValueError(f"Not a payday snapshot: {self.path}")
+
+        self._dir = {}
+        try:
+            magic, version, ncols, self.n_rows, self.n_strings = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a payday snapshot (v{VERSION}): {self.path}")
+            pos = _HEADER.size
+            for _ in range(ncols):
+                name, code, off, nbytes = _DIRENT.unpack_from(self._mm, pos)
+                if off + nbytes > len(self._mm):
+                    raise struct.error("column past end of data")
+                self._dir[name.rstrip(b"\x00").decode("ascii")] = (code.decode("ascii"), off, nbytes)
+                pos += _DIRENT.size
+        except struct.error:
+            self.close()
+            raise ValueError(f"Truncated snapshot: {self.path}") from None
+        except ValueError:
+            self.close()
+            raise
+
+    @classmethod
+    def from_buffer(cls, buf, use_numpy=False):
+        """
+        Reader over an in-memory encoding (bytes, memoryview, SharedMemory.buf).
+        Columns are views into `buf`; close() releases them but leaves `buf` open.
+        """
+        return cls(None, use_numpy=use_numpy, _buffer=memoryview(buf))
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def column_names(self):
+        return list(self._dir)
+
+    def column(self, name):
+        """Zero-copy view of a column."""
+        code, off, nbytes = self._dir[name]
+        if self.use_numpy:
+            # Explicit little-endian dtypes: zero-copy on any host
+            return np.frombuffer(self._mm, dtype=_NUMPY_TYPES[code], count=nbytes // array(code).itemsize, offset=off)
+        raw = memoryview(self._mm)[off:off + nbytes]
+        self._views.append(raw)
+        if not _LITTLE and array(code).itemsize > 1:
+            col = array(code, raw.tobytes())
+            col.byteswap()
+            return memoryview(col)
+        view = raw.cast(code)
+        self._views.append(view)
+        return view
+
+    def strings(self):
+        """Decoded string table (built once, on first use)."""
+        if self._strings is None:
+            offs = self.column("stroff")
+            blob = self.column("strblob")
+            data = bytes(blob)
+            self._strings = [data[offs[i]:offs[i + 1]].decode("utf-8") for i in range(self.n_strings)]
+        return self._strings
+
+    def string(self, sid):
+        return self.strings()[sid]
+
+    def _row_columns(self):
+        """(hours, row, net) as lists; older snapshots without them get derived values."""
+        if "row" in self._dir:
+            return self.column("hours").tolist(), self.column("row").tolist(), self.column("net").tolist()
+        start, end = self.column("start").tolist(), self.column("end").tolist()
+        hours = [int(round((e - s) / 60.0 * 100)) for s, e in zip(start, end)]
+        return hours, list(range(self.n_rows)), hours
+
+    def _decoded(self, name):
+        """String column resolved through the string table."""
+        return list(map(self.strings().__getitem__, self.column(name).tolist()))
+
+    def iter_blocks(self):
+        """Rebuild block records (decoded; for tooling, not bulk analytics)."""
+        day = self.column("day").tolist()
+        dt = self.column("date").tolist()
+        start, end = self.column("start").tolist(), self.column("end").tolist()
+        loc, task, client = self._decoded("location"), self._decoded("task"), self._decoded("client")
+        hours, row, net = self._row_columns()
+        # Unpaid sits on a row's first block, as in WorkHourParser.block_records
+        gross = {}
+        for r, h in zip(row, hours):
+            gross[r] = gross.get(r, 0.0) + h / 100
+        dates = {0: None}
+        prev_row = None
+        for i in range(self.n_rows):
+            unpaid = 0
+            if row[i] != prev_row:
+                prev_row = row[i]
+                unpaid = max(0, int(round((gross[prev_row] - net[i] / 100) * 60)))
+            d = dates.get(dt[i])
+            if d is None and dt[i]:
+                d = dates[dt[i]] = date.fromordinal(dt[i])
+            yield {
+                "Day": _DAY_OUT[day[i]],
+                "Date": d,
+                "Start": start[i],
+                "End": end[i],
+                "Location": loc[i],
+                "Task": task[i],
+                "Client": client[i],
+                "Hours": hours[i] / 100,
+                "Unpaid": unpaid,
+            }
+
+    def iter_rows(self):
+        """Rebuild output rows (CsvWriter input) by grouping blocks per row."""
+        day = self.column("day").tolist()
+        start, end = self.column("start").tolist(), self.column("end").tolist()
+        loc, task, client = self._decoded("location"), self._decoded("task"), self._decoded("client")
+        _, row, net = self._row_columns()
+        span_cache = {}
+        spans = []
+        for s, e in zip(start, end):
+            text = span_cache.get((s, e))
+            if text is None:
+                text = span_cache[(s, e)] = _span_text(s, e)
+            spans.append(text)
+        n = self.n_rows
+        i = 0
+        while i < n:
+            r = row[i]
+            j = i + 1
+            while j < n and row[j] == r:
+                j += 1
+            yield {
+                "Day": _DAY_OUT[day[i]],
+                "TimeBlocks": ", ".join(spans[i:j]),
+                "Location": ", ".join(loc[i:j]),
+                "Tasks/Details": ", ".join(task[i:j]),
+                "Client(s)": ", ".join(client[i:j]),
+                "Hours": net[i] / 100,
+            }
+            i = j
+
+    def close(self):
+        for v in reversed(self._views):
+            v.release()
+        self._views = []
+        if self._mm is not None:
+            if self._fh is not None:
+                self._mm.close()
+            else:
+                self._mm.release()  # our view only; the caller owns the buffer
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,79 @@
+"""
+pdio/sqlite.py
+SQLite writer for structured work-hour rows (database load, stdlib sqlite3).
+
+Responsibilities:
+- (Re)create one table per load, replacing an earlier load like the file
+  writers replace their files
+- Insert rows in chunks inside a single transaction (executemany)
+- Same open/write_row/close contract as CsvWriter; the connection belongs
+  to the thread that called open()
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+
+_CHUNK = 1000
+_COLUMNS = ["day", "time_blocks", "location", "tasks", "clients", "hours"]
+_KEYS = ["Day", "TimeBlocks", "Location", "Tasks/Details", "Client(s)"]
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SqliteWriter:
+    """SQLite sink: rows into table `table` of the database at out_path."""
+
+    def __init__(self, out_path=None, table="work_hours"):
+        if not _IDENT.match(table):
+            raise ValueError(f"Invalid SQLite table name: {table!r}")
+        self.out_path = Path(out_path) if out_path else Path.cwd() / "cpd.db"
+        self.table = table
+        self._conn = None
+        self._pending = []
+        self._seq = 0
+
+    def open(self):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.out_path))
+        self._conn.execute("DROP TABLE IF EXISTS %s" % self.table)
+        self._conn.execute(
+            "CREATE TABLE %s (seq INTEGER PRIMARY KEY, day TEXT, time_blocks TEXT, location TEXT, "
+            "tasks TEXT, clients TEXT, hours REAL)" % self.table
+        )
+        self._pending = []
+        self._seq = 0
+        return self
+
+    def write_row(self, r):
+        self._seq += 1
+        self._pending.append([self._seq] + [r.get(key, "NaN") for key in _KEYS] + [r.get("Hours", 0.0) or 0.0])
+        if len(self._pending) >= _CHUNK:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._conn.executemany("INSERT INTO %s (seq, %s) VALUES (?, ?, ?, ?, ?, ?, ?)"
+                                   % (self.table, ", ".join(_COLUMNS)), self._pending)
+            self._pending = []
+
+    def close(self):
+        """Insert what is pending and commit the load."""
+        if self._conn is None:
+            return self.out_path
+        try:
+            self._flush()
+            self._conn.commit()
+        finally:
+            self._conn.close()
+            self._conn = None
+        return self.out_path
+
+    def write(self, rows):
+        """Load rows into the table."""
+        self.open()
+        try:
+            for r in rows:
+                self.write_row(r)
+        finally:
+            out = self.close()
+        return out
@@ -1,44 +1,138 @@
 """
-payday\pdio\writer.py
+pdio/writer.py
 CSV writer for structured work-hour rows.
 
 Responsibilities:
 - Ensure output directory exists
-- Write structured rows to CSV
+- Write structured rows to CSV (whole list, or streamed row by row)
 - Append weekly total
 - Add watermark footer
+- Write pay summaries (PaySummaryWriter)
+- Write block-level CSVs in the partition file layout (BlockCsvWriter)
 """
 
 import csv
+import os
 from pathlib import Path
 
 from infra.constants import WATERMARK
+from pdio.partition import HEADER as BLOCK_HEADER, block_row
+
+HEADER = ["Day", "TimeBlocks", "Location", "Tasks/Details", "Client(s)", "Hours"]
 
 
 class CsvWriter:
-    """CSV writer with watermark and weekly total support."""
+    """
+    CSV writer with watermark and weekly total support.
 
-    def __init__(self, out_path=None):
+    write(rows) for a whole list; incremental use (e.g. as a --sink):
+    open(), write_row(row) ..., close(). With fsync=True, close() returns
+    only once the file is on disk (e.g. before a checkpoint records it).
+    """
+
+    def __init__(self, out_path=None, watermark=WATERMARK, fsync=False):
         self.out_path = Path(out_path) if out_path else Path.cwd() / "cpd.csv"
+        self.watermark = watermark
+        self.fsync = fsync
+        self._fh = None
+        self._writer = None
+        self._total = 0.0
+
+    def open(self):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.out_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(HEADER)
+        self._total = 0.0
+        return self
+
+    def write_row(self, r):
+        self._total += r.get("Hours", 0.0) or 0.0
+        self._writer.writerow([
+            r.get("Day", "NaN"),
+            r.get("TimeBlocks", "NaN"),
+            r.get("Location", "NaN"),
+            r.get("Tasks/Details", "NaN"),
+            r.get("Client(s)", "NaN"),
+            f"{r.get('Hours', 0.0):.1f}",
+        ])
+
+    def close(self):
+        """Write the TOTAL row and watermark."""
+        if self._fh is None:
+            return self.out_path
+        with self._fh:
+            self._writer.writerow(["TOTAL", "", "", "", "", f"{self._total:.1f}"])
+            self._fh.write(f"# {self.watermark}\n")
+            if self.fsync:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+        self._fh = None
+        self._writer = None
+        return self.out_path
 
     def write(self, rows):
         """Write parsed rows into a CSV file with totals and watermark."""
-        weekly_total = sum(r.get("Hours", 0.0) or 0.0 for r in rows)
+        self.open()
+        try:
+            for r in rows:
+                self.write_row(r)
+        finally:
+            out = self.close()
+        return out
+
+
+class BlockCsvWriter:
+    """
+    One block-level CSV (same layout as PartitionedWriter files): block rows in
+    the order given, a TOTAL row net of Unpaid minutes, then the watermark.
+    Streams, so `blocks` may be any iterable (e.g. ExternalSorter output).
+    """
+
+    def __init__(self, out_path, watermark=WATERMARK):
+        self.out_path = Path(out_path)
+        self.watermark = watermark
+        self.count = 0
 
+    def write(self, blocks):
+        hours = 0.0
+        unpaid = 0
         self.out_path.parent.mkdir(parents=True, exist_ok=True)
         with self.out_path.open("w", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
-            w.writerow(["Day", "TimeBlocks", "Location", "Tasks/Details", "Client(s)", "Hours"])
-            for r in rows:
+            w.writerow(BLOCK_HEADER)
+            for rec in blocks:
+                row = block_row(rec)
+                hours += rec.get("Hours", 0.0) or 0.0
+                unpaid += row[8]
+                w.writerow(row)
+                self.count += 1
+            net = max(0.0, hours - unpaid / 60.0)
+            w.writerow(["TOTAL", "", "", "", "", "", "", f"{net:.2f}", unpaid])
+            f.write(f"# {self.watermark}\n")
+        return self.out_path
+
+
+class PaySummaryWriter:
+    """CSV writer for PayEngine.summarize() totals (hours + pay per employee/week)."""
+
+    def __init__(self, out_path=None):
+        self.out_path = Path(out_path) if out_path else Path.cwd() / "pay.csv"
+
+    def write(self, totals):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.out_path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["Employee", "Week", "Regular", "Overtime", "DoubleTime", "Night", "Pay"])
+            for t in totals:
                 w.writerow([
-                    r.get("Day", "NaN"),
-                    r.get("TimeBlocks", "NaN"),
-                    r.get("Location", "NaN"),
-                    r.get("Tasks/Details", "NaN"),
-                    r.get("Client(s)", "NaN"),
-                    f"{r.get('Hours', 0.0):.1f}",
+                    t["Employee"],
+                    t["Week"],
+                    f"{t['Regular'] / 60.0:.2f}",
+                    f"{t['Overtime'] / 60.0:.2f}",
+                    f"{t['DoubleTime'] / 60.0:.2f}",
+                    f"{t['Night'] / 60.0:.2f}",
+                    f"{t['PayCents'] / 100.0:.2f}",
                 ])
-            w.writerow(["TOTAL", "", "", "", "", f"{weekly_total:.1f}"])
             f.write(f"# {WATERMARK}\n")
-
         return self.out_path
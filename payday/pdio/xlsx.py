@@ -0,0 +1,226 @@
+"""
+pdio/xlsx.py
+Streaming XLSX writer for structured work-hour rows (stdlib only).
+
+Responsibilities:
+- Stream sheet XML row by row into the zip (bounded memory)
+- Shared-strings table for repeated Day/Location/Client values
+- Numeric Hours column with a SUM formula TOTAL row
+- Watermark row after the total (mirrors CsvWriter)
+"""
+
+import re
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from infra.constants import WATERMARK
+
+HEADER = ["Day", "TimeBlocks", "Location", "Tasks/Details", "Client(s)", "Hours"]
+_COLS = "ABCDEF"
+# Columns whose values repeat enough to go through the shared-strings table
+_SHARED = frozenset(("Day", "Location", "Client(s)"))
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Timesheet" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+    'Target="sharedStrings.xml"/>'
+    '<Relationship Id="rId3" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Style 1 = "0.0" for Hours (matches the CSV's one-decimal output)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="0.0"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+# Batch sheet XML into ~64 KiB writes to the deflate stream
+_FLUSH_CHARS = 1 << 16
+
+
+def _xml_text(value):
+    return escape(_XML_ILLEGAL.sub("", str(value)))
+
+
+class XlsxWriter:
+    """
+    XLSX sink with the same write(rows) contract as CsvWriter.
+
+    Rows may be any iterable (e.g. a generator over WorkHourParser.iter_days),
+    and are streamed straight into the compressed sheet; only the
+    shared-strings table (distinct Day/Location/Client values) is held in memory.
+    Incremental use: open(), write_row(row) ..., close().
+    """
+
+    def __init__(self, out_path=None):
+        self.out_path = Path(out_path) if out_path else Path.cwd() / "cpd.xlsx"
+        self._zip = None
+        self._sheet = None
+        self._strings = {}
+        self._refs = 0
+        self._row_num = 0
+        self._total = 0.0
+        self._buf = []
+        self._buf_chars = 0
+
+    def open(self):
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.out_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._strings = {}
+        self._refs = 0
+        self._row_num = 0
+        self._total = 0.0
+        self._emit(_SHEET_HEAD)
+        self._emit_row([self._shared_cell(h) for h in HEADER])
+        return self
+
+    def _emit(self, text):
+        self._buf.append(text)
+        self._buf_chars += len(text)
+        if self._buf_chars >= _FLUSH_CHARS:
+            self._flush()
+
+    def _flush(self):
+        if self._buf:
+            self._sheet.write("".join(self._buf).encode("utf-8"))
+            self._buf = []
+            self._buf_chars = 0
+
+    def _shared_cell(self, value):
+        self._refs += 1
+        sid = self._strings.get(value)
+        if sid is None:
+            sid = self._strings[value] = len(self._strings)
+        return "s", str(sid)
+
+    def _emit_row(self, cells):
+        self._row_num += 1
+        r = self._row_num
+        parts = ['<row r="%d">' % r]
+        for col, (kind, payload) in zip(_COLS, cells):
+            if kind == "s":
+                parts.append('<c r="%s%d" t="s"><v>%s</v></c>' % (col, r, payload))
+            elif kind == "inline":
+                parts.append('<c r="%s%d" t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>'
+                             % (col, r, _xml_text(payload)))
+            elif kind == "n":
+                parts.append('<c r="%s%d" s="1"><v>%s</v></c>' % (col, r, payload))
+            elif kind == "f":
+                formula, cached = payload
+                parts.append('<c r="%s%d" s="1"><f>%s</f><v>%s</v></c>' % (col, r, formula, cached))
+        parts.append("</row>")
+        self._emit("".join(parts))
+
+    def write_row(self, r):
+        hours = r.get("Hours", 0.0) or 0.0
+        self._total += hours
+        cells = []
+        for key in HEADER[:-1]:
+            value = r.get(key, "NaN")
+            cells.append(self._shared_cell(value) if key in _SHARED else ("inline", value))
+        cells.append(("n", repr(float(hours))))
+        self._emit_row(cells)
+
+    def close(self):
+        """Write TOTAL + watermark rows and the remaining package parts."""
+        if self._zip is None:
+            return self.out_path
+        last = self._row_num
+        total_formula = "SUM(F2:F%d)" % last if last >= 2 else "0"
+        self._emit_row([self._shared_cell("TOTAL"), ("inline", ""), ("inline", ""),
+                        ("inline", ""), ("inline", ""), ("f", (total_formula, repr(round(self._total, 2))))])
+        self._emit_row([("inline", "# " + WATERMARK)])
+        self._emit(_SHEET_TAIL)
+        self._flush()
+        self._sheet.close()
+
+        with self._zip.open("xl/sharedStrings.xml", "w", force_zip64=True) as ss:
+            ss.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                      '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                      'count="%d" uniqueCount="%d">' % (self._refs, len(self._strings))).encode("utf-8"))
+            for s in self._strings:  # insertion order == id order
+                ss.write(('<si><t xml:space="preserve">%s</t></si>' % _xml_text(s)).encode("utf-8"))
+            ss.write(b"</sst>")
+
+        self._zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _WORKBOOK)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._zip.close()
+        self._zip = None
+        self._sheet = None
+        self._strings = {}
+        return self.out_path
+
+    def write(self, rows):
+        """Stream rows into an XLSX file with totals and watermark."""
+        self.open()
+        try:
+            for r in rows:
+                self.write_row(r)
+        finally:
+            out = self.close()
+        return out
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -1,5 +1,7 @@
 #payday\policies\__init__.py
 
 from .policies import Policies
+from .pay import PayEngine, RateTable
+from .rules import BreakPolicy, BreakRule, PolicyRuleSet
 
-__all__ = ["Policies"]
+__all__ = ["Policies", "PayEngine", "RateTable", "PolicyRuleSet", "BreakPolicy", "BreakRule"]
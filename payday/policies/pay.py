@@ -0,0 +1,274 @@
+"""
+policies/pay.py
+
+Pay and overtime computation over per-block output for a whole batch.
+
+Encapsulates:
+- Per-client billing rates (rate table with a default rate)
+- Weekly overtime: paid minutes beyond weekly_overtime_hours per employee/week
+- Daily double time: paid minutes beyond daily_double_time_hours per employee/day
+- Night differential: flat amount per hour for minutes inside the night window
+  (default 22:00-06:00, i.e. the part of a block that runs past midnight)
+
+Input blocks are WorkHourParser.block_records() dicts, optionally carrying
+"Employee" and "Week"; Week defaults to the ISO week of "Date". Undated
+(day-name-only) blocks are numbered into weeks per employee in input order:
+a weekday earlier than the previous one starts the next week ("undated-2").
+Blocks are ordered by (employee, week, day, start) for the cumulative sums.
+A day's Unpaid minutes come off its first block; any excess carries over to
+the following blocks of the same day.
+
+All arithmetic is integer (minutes x rate cents x multiplier percent), so the
+NumPy path and the pure-Python fallback produce identical results.
+"""
+
+import json
+from pathlib import Path
+
+from infra.constants import DAY_NAMES
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+_DAY_INDEX = {name.capitalize(): i for i, name in enumerate(DAY_NAMES)}
+# Batches at least this large take the NumPy path when it is available
+NUMPY_MIN_BLOCKS = 2048
+
+
+def _cents(amount):
+    return int(round(float(amount) * 100))
+
+
+def _minute_of_day(hhmm):
+    hhmm = str(hhmm).replace(":", "").zfill(4)
+    return int(hhmm[:2]) * 60 + int(hhmm[2:])
+
+
+class RateTable:
+    """Hourly rates: per client (case-insensitive) with a default."""
+
+    def __init__(self, default_rate=0.0, clients=None):
+        self.default_cents = _cents(default_rate)
+        self.client_cents = {str(k).casefold(): _cents(v) for k, v in (clients or {}).items()}
+
+    def cents_for(self, client):
+        return self.client_cents.get((client or "").casefold(), self.default_cents)
+
+
+class PayEngine:
+    """
+    Computes per-block pay for a batch.
+
+    compute(blocks) -> list of per-block results (input order):
+      {"Employee","Week","Regular","Overtime","DoubleTime","Night" (minutes), "PayCents"}
+    summarize(results) -> per (employee, week) totals.
+    """
+
+    def __init__(
+        self,
+        rates=None,
+        weekly_overtime_hours=40,
+        daily_double_time_hours=12,
+        overtime_multiplier=1.5,
+        double_time_multiplier=2.0,
+        night_differential=0.0,
+        night_start="2200",
+        night_end="0600",
+        use_numpy=None,
+    ):
+        self.rates = rates if rates is not None else RateTable()
+        self.weekly_ot_minutes = int(round(float(weekly_overtime_hours) * 60))
+        self.daily_dt_minutes = int(round(float(daily_double_time_hours) * 60))
+        self.ot_pct = int(round(float(overtime_multiplier) * 100))
+        self.dt_pct = int(round(float(double_time_multiplier) * 100))
+        self.night_cents = _cents(night_differential)
+        self.night_start = _minute_of_day(night_start)
+        self.night_end = _minute_of_day(night_end)
+        # None -> NumPy for large batches when installed
+        self.use_numpy = use_numpy
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            rates=RateTable(data.get("default_rate", 0.0), data.get("clients")),
+            weekly_overtime_hours=data.get("weekly_overtime_hours", 40),
+            daily_double_time_hours=data.get("daily_double_time_hours", 12),
+            overtime_multiplier=data.get("overtime_multiplier", 1.5),
+            double_time_multiplier=data.get("double_time_multiplier", 2.0),
+            night_differential=data.get("night_differential", 0.0),
+            night_start=data.get("night_start", "2200"),
+            night_end=data.get("night_end", "0600"),
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """Load rates and thresholds from a JSON file."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    # ----- Column extraction -----
+    def _columns(self, blocks):
+        emp_ids, week_ids = {}, {}
+        undated = {}  # employee -> [week number, last weekday index]
+        carry = {}  # (employee, week, day) -> Unpaid minutes not yet taken off a block
+        cols = {k: [] for k in ("emp", "week", "day", "start", "paid", "rate", "night")}
+        for b in blocks:
+            emp = b.get("Employee", "")
+            week = b.get("Week")
+            d = b.get("Date")
+            day = d.toordinal() if d else _DAY_INDEX.get(b.get("Day"), -1)
+            if week is None:
+                if d:
+                    week = "%04d-W%02d" % d.isocalendar()[:2]
+                else:
+                    seq = undated.setdefault(emp, [1, -1])
+                    if 0 <= day < seq[1]:
+                        seq[0] += 1
+                    if day >= 0:
+                        seq[1] = day
+                    week = "undated-%d" % seq[0]
+            start, end = int(b["Start"]), int(b["End"])
+            cols["emp"].append(emp_ids.setdefault(emp, len(emp_ids)))
+            cols["week"].append(week_ids.setdefault(week, len(week_ids)))
+            cols["day"].append(day)
+            cols["start"].append(start)
+            day_key = (emp, week, day)
+            unpaid = int(b.get("Unpaid", 0) or 0) + carry.pop(day_key, 0)
+            paid = max(0, end - start - unpaid)
+            if unpaid > end - start:
+                carry[day_key] = unpaid - (end - start)
+            cols["paid"].append(paid)
+            cols["rate"].append(self.rates.cents_for(b.get("Client")))
+            cols["night"].append(min(paid, self._night_overlap(start, end)))
+        emp_names = list(emp_ids)
+        week_names = list(week_ids)
+        return cols, emp_names, week_names
+
+    def _night_overlap(self, start, end):
+        """Minutes of [start, end) inside the night window (end may pass 1440)."""
+        ns, ne = self.night_start, self.night_end
+        if ns == ne:
+            return 0
+        if ns < ne:
+            windows = ((ns, ne), (ns + 1440, ne + 1440))
+        else:
+            windows = ((0, ne), (ns, ne + 1440), (ns + 1440, 2880))
+        total = 0
+        for a, b in windows:
+            lo, hi = max(start, a), min(end, b)
+            if hi > lo:
+                total += hi - lo
+        return total
+
+    # ----- Engines -----
+    def _compute_python(self, cols):
+        n = len(cols["paid"])
+        emp, week, day, start = cols["emp"], cols["week"], cols["day"], cols["start"]
+        paid, rate, night = cols["paid"], cols["rate"], cols["night"]
+        order = sorted(range(n), key=lambda i: (emp[i], week[i], day[i], start[i], i))
+
+        ot = [0] * n
+        dt = [0] * n
+        pay = [0] * n
+        week_key = day_key = None
+        week_cum = day_cum = 0
+        for i in order:
+            wk = (emp[i], week[i])
+            if wk != week_key:
+                week_key, week_cum = wk, 0
+                day_key = None
+            if day[i] != day_key:
+                day_key, day_cum = day[i], 0
+            m = paid[i]
+            week_cum += m
+            day_cum += m
+            d = min(m, max(0, day_cum - self.daily_dt_minutes))
+            o_raw = min(m, max(0, week_cum - self.weekly_ot_minutes))
+            o = o_raw - min(o_raw, d)
+            reg = m - o - d
+            units = rate[i] * (reg * 100 + o * self.ot_pct + d * self.dt_pct) + night[i] * self.night_cents * 100
+            ot[i], dt[i] = o, d
+            pay[i] = (units + 3000) // 6000
+        return ot, dt, pay
+
+    def _compute_numpy(self, cols):
+        i64 = np.int64
+        emp = np.asarray(cols["emp"], dtype=i64)
+        week = np.asarray(cols["week"], dtype=i64)
+        day = np.asarray(cols["day"], dtype=i64)
+        start = np.asarray(cols["start"], dtype=i64)
+        paid = np.asarray(cols["paid"], dtype=i64)
+        rate = np.asarray(cols["rate"], dtype=i64)
+        night = np.asarray(cols["night"], dtype=i64)
+        n = len(paid)
+
+        order = np.lexsort((np.arange(n), start, day, week, emp))
+        e, w, dy, m = emp[order], week[order], day[order], paid[order]
+
+        new_week = np.ones(n, dtype=bool)
+        new_week[1:] = (e[1:] != e[:-1]) | (w[1:] != w[:-1])
+        new_day = new_week.copy()
+        new_day[1:] |= dy[1:] != dy[:-1]
+
+        csum = np.cumsum(m)
+        before = csum - m
+
+        def grouped_cumsum(starts):
+            # cumsum resets at group starts: subtract the running total before each group
+            base = np.where(starts, before, 0)
+            return csum - np.maximum.accumulate(base)
+
+        week_cum = grouped_cumsum(new_week)
+        day_cum = grouped_cumsum(new_day)
+
+        d = np.minimum(m, np.maximum(0, day_cum - self.daily_dt_minutes))
+        o_raw = np.minimum(m, np.maximum(0, week_cum - self.weekly_ot_minutes))
+        o = o_raw - np.minimum(o_raw, d)
+        reg = m - o - d
+        units = rate[order] * (reg * 100 + o * self.ot_pct + d * self.dt_pct) + night[order] * (self.night_cents * 100)
+
+        ot = np.empty(n, dtype=i64)
+        dt = np.empty(n, dtype=i64)
+        pay = np.empty(n, dtype=i64)
+        ot[order], dt[order], pay[order] = o, d, (units + 3000) // 6000
+        return ot.tolist(), dt.tolist(), pay.tolist()
+
+    def compute(self, blocks):
+        """Per-block pay results, in input order."""
+        cols, emp_names, week_names = self._columns(blocks)
+        n = len(cols["paid"])
+        use_numpy = self.use_numpy
+        if use_numpy is None:
+            use_numpy = np is not None and n >= NUMPY_MIN_BLOCKS
+        if n and use_numpy and np is not None:
+            ot, dt, pay = self._compute_numpy(cols)
+        else:
+            ot, dt, pay = self._compute_python(cols)
+
+        results = []
+        for i in range(n):
+            results.append({
+                "Employee": emp_names[cols["emp"][i]],
+                "Week": week_names[cols["week"][i]],
+                "Regular": cols["paid"][i] - ot[i] - dt[i],
+                "Overtime": ot[i],
+                "DoubleTime": dt[i],
+                "Night": cols["night"][i],
+                "PayCents": pay[i],
+            })
+        return results
+
+    @staticmethod
+    def summarize(results):
+        """Totals per (employee, week), in first-seen order."""
+        totals = {}
+        for r in results:
+            key = (r["Employee"], r["Week"])
+            t = totals.get(key)
+            if t is None:
+                t = totals[key] = {"Employee": key[0], "Week": key[1], "Regular": 0,
+                                   "Overtime": 0, "DoubleTime": 0, "Night": 0, "PayCents": 0}
+            for field in ("Regular", "Overtime", "DoubleTime", "Night", "PayCents"):
+                t[field] += r[field]
+        return list(totals.values())
@@ -4,24 +4,29 @@ policies/policies.py
 Business rules for the payday project.
 
 Encapsulates:
-- Lunch deduction logic (default subtract 0.5h)
+- Break/lunch deduction logic via a compiled rule set (default: one lunch, subtract 0.5h)
 - Optional lunch annotation on explicit positive mentions
 - Covering block de-duplication (tolerance in seconds)
 - Stable hour summation
 """
 
-from patterns.patterns import LUNCH_EXPLICIT, LUNCH_NO, LUNCH_POS
+from policies.rules import PolicyRuleSet
 
 
 class Policies:
     """
-    Stateful policy container.
+    Policy container.
+
+    Settings are fixed at construction and no method mutates them, so one
+    instance can be shared across threads.
 
     Parameters (all optional):
       lunch_deduction_hours: hours to subtract when lunch applies (default 0.5)
       annotate_on_positive: append "(lunch)" only when explicitly mentioned (default True)
       subtract_lunch_by_default: if no signals, subtract lunch (default True)
       cover_tolerance_seconds: tolerance for umbrella vs sub-block equality (default 60)
+      rules: compiled PolicyRuleSet; replaces the built-in lunch rule (and the three
+             lunch settings above) when given
     """
 
     def __init__(
@@ -30,43 +35,45 @@ class Policies:
         annotate_on_positive=True,
         subtract_lunch_by_default=True,
         cover_tolerance_seconds=60,
+        rules=None,
     ):
         self.lunch_deduction_hours = float(lunch_deduction_hours)
         self.annotate_on_positive = bool(annotate_on_positive)
         self.subtract_lunch_by_default = bool(subtract_lunch_by_default)
         self.cover_tolerance_seconds = int(cover_tolerance_seconds)
+        self.rules = rules if rules is not None else PolicyRuleSet.default(
+            deduction_hours=self.lunch_deduction_hours,
+            annotate_on_positive=self.annotate_on_positive,
+            subtract_by_default=self.subtract_lunch_by_default,
+        )
+
+    # ----- Lunch / break policy -----
+    def scan_breaks(self, segments):
+        """Single scan of a line's segments against every break rule."""
+        return self.rules.scan(segments)
+
+    def decide_breaks(self, scan, blocks, gross_hours):
+        """
+        Resolve a scan for a finished line.
+        Returns (deduction_hours, annotations) after shift-length and client gates.
+        """
+        return self.rules.decide(scan, gross_hours, (b["client"] for b in blocks))
 
-    # ----- Lunch policy -----
     def detect_lunch_flags(self, segments):
         """
-        Determine lunch policy for a given line.
+        Determine lunch policy for a given line (ungated).
 
         Returns (subtract, annotate):
-          subtract -> whether to subtract self.lunch_deduction_hours
-          annotate -> whether to append "(lunch)" to first task
-        Priority:
+          subtract -> whether any break deduction applies
+          annotate -> whether an annotation (e.g. "(lunch)") applies
+        With the built-in rules the priority is:
           1) "lunch: yes/no" explicit directive
           2) Negative cues → no subtract, no annotate
           3) Positive cues → subtract; annotate if enabled
           4) Fallback → self.subtract_lunch_by_default, no annotate
         """
-        joined = " | ".join(segments)
-
-        explicit = LUNCH_EXPLICIT.search(joined)
-        if explicit:
-            v = explicit.group(1).lower()
-            if v in ("no", "n"):
-                return False, False
-            if v in ("yes", "y"):
-                return True, bool(self.annotate_on_positive)
-
-        if LUNCH_NO.search(joined):
-            return False, False
-
-        if LUNCH_POS.search(joined):
-            return True, bool(self.annotate_on_positive)
-
-        return bool(self.subtract_lunch_by_default), False
+        deduction, notes = self.rules.decide(self.rules.scan(segments))
+        return bool(deduction or notes), bool(notes)
 
     # ----- Cover block de-duplication -----
     def drop_covering_block(self, blocks):
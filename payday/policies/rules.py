@@ -0,0 +1,239 @@
+"""
+policies/rules.py
+
+Declarative break/deduction rules, compiled once into a single scanner.
+
+A rule set is a list of breaks (lunch, afternoon break, ...). Each break has
+cue rules (regex + priority + outcome) and gates (shift length, clients).
+The cue patterns of each break are compiled into ONE alternation regex with
+named groups, so a line is scanned once per break no matter how many rules
+it has; a decision table then resolves each break independently.
+
+Rule file (JSON):
+    {
+      "breaks": [
+        {
+          "name": "lunch",
+          "deduct_hours": 0.5,
+          "annotate": "(lunch)",
+          "default": true,
+          "min_shift_hours": 0,
+          "max_shift_hours": null,
+          "clients": [],
+          "rules": [
+            {"pattern": "\\\\blunch\\\\s*[:=]\\\\s*(?:no|n)\\\\b",  "priority": 0, "deduct": false},
+            {"pattern": "\\\\blunch\\\\s*[:=]\\\\s*(?:yes|y)\\\\b", "priority": 0, "deduct": true, "annotate": true},
+            {"pattern": "\\\\bno\\\\s*lunch\\\\b", "priority": 1, "deduct": false},
+            {"pattern": "\\\\blunch\\\\b", "priority": 2, "deduct": true, "annotate": true}
+          ]
+        }
+      ]
+    }
+
+Per break, the matching rule with the lowest priority wins (earliest match
+breaks ties); with no match, "default" decides. A deduction applies only when
+the line's gross hours fall within [min_shift_hours, max_shift_hours] and,
+if "clients" is non-empty, some block on the line bills one of them.
+Cues are scanned with zero-width lookaheads so overlapping cues of different
+rules are all seen; if two rules of one break match at the same offset only
+the one with the lowest priority is recorded. Breaks never shadow each
+other: two breaks may share a cue (e.g. "no breaks").
+"""
+
+import json
+import re
+from pathlib import Path
+
+from patterns.patterns import LUNCH_NO, LUNCH_POS
+
+
+class BreakRule:
+    """One cue: a regex and what it means for its break."""
+
+    def __init__(self, pattern, priority=0, deduct=True, annotate=False, deduct_hours=None):
+        self.pattern = pattern
+        self.priority = int(priority)
+        self.deduct = bool(deduct)
+        self.annotate = bool(annotate)
+        self.deduct_hours = None if deduct_hours is None else float(deduct_hours)
+
+    @classmethod
+    def from_dict(cls, d):
+        if "pattern" not in d:
+            raise ValueError("Break rule is missing 'pattern'")
+        return cls(
+            d["pattern"],
+            priority=d.get("priority", 0),
+            deduct=d.get("deduct", True),
+            annotate=d.get("annotate", False),
+            deduct_hours=d.get("deduct_hours"),
+        )
+
+
+class BreakPolicy:
+    """A deductible break with its cue rules and gates."""
+
+    def __init__(
+        self,
+        name,
+        rules=(),
+        deduct_hours=0.5,
+        annotate=None,
+        default=False,
+        min_shift_hours=0.0,
+        max_shift_hours=None,
+        clients=(),
+    ):
+        self.name = name
+        self.rules = list(rules)
+        self.deduct_hours = float(deduct_hours)
+        self.annotate = annotate or None
+        self.default = bool(default)
+        self.min_shift_hours = float(min_shift_hours or 0.0)
+        self.max_shift_hours = None if max_shift_hours is None else float(max_shift_hours)
+        self.clients = frozenset(c.casefold() for c in clients or ())
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get("name", "break"),
+            rules=[BreakRule.from_dict(r) for r in d.get("rules", ())],
+            deduct_hours=d.get("deduct_hours", 0.5),
+            annotate=d.get("annotate"),
+            default=d.get("default", False),
+            min_shift_hours=d.get("min_shift_hours", 0.0),
+            max_shift_hours=d.get("max_shift_hours"),
+            clients=d.get("clients", ()),
+        )
+
+
+class PolicyRuleSet:
+    """
+    Compiled break rules: one combined regex per break plus a flat decision table.
+
+    scan(segments) -> per-break winning rule index (or -1)
+    decide(scan, gross_hours, clients) -> (total_deduction, [annotations])
+    """
+
+    def __init__(self, breaks):
+        self.breaks = list(breaks)
+
+        # Decision table, indexed by rule number
+        self._rule_priority = []
+        self._rule_deduct = []
+        self._rule_hours = []
+        self._rule_annotate = []
+
+        order = []
+        for b_idx, brk in enumerate(self.breaks):
+            for rule in brk.rules:
+                try:
+                    compiled = re.compile(rule.pattern, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError(f"Invalid pattern in break '{brk.name}': {rule.pattern!r} ({e})")
+                if compiled.groupindex:
+                    raise ValueError(f"Named groups are not allowed in break rules: {rule.pattern!r}")
+                order.append((rule.priority, len(order), b_idx, rule))
+
+        # Lower priority first so it wins when cues start at the same offset
+        order.sort(key=lambda t: (t[0], t[1]))
+        alternatives = {}
+        for r_idx, (_, _, b_idx, rule) in enumerate(order):
+            brk = self.breaks[b_idx]
+            self._rule_priority.append(rule.priority)
+            self._rule_deduct.append(rule.deduct)
+            self._rule_hours.append(rule.deduct_hours if rule.deduct_hours is not None else brk.deduct_hours)
+            self._rule_annotate.append(rule.annotate and brk.annotate)
+            alternatives.setdefault(b_idx, []).append((r_idx, rule.pattern))
+
+        # Per break: (break index, gate, combined lookahead scan, outer group -> rule index).
+        # The gate is a plain alternation of the same cues: its leftmost match is the
+        # first offset any cue matches at, so segments without cues skip the lookahead
+        # scan and the rest start it there (most positions in a line hold no cue)
+        self._scanners = []
+        for b_idx, alts in sorted(alternatives.items()):
+            combined = re.compile("|".join("(?=(?P<r%d>%s))" % alt for alt in alts), re.IGNORECASE)
+            gate = re.compile("|".join("(?:%s)" % pattern for _, pattern in alts), re.IGNORECASE)
+            # Inner groups never close last, so lastindex is always a rule's outer group
+            group_rule = {combined.groupindex["r%d" % r_idx]: r_idx for r_idx, _ in alts}
+            self._scanners.append((b_idx, gate.search, combined.finditer, group_rule))
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not isinstance(data.get("breaks"), list):
+            raise ValueError("Rule set must be a JSON object with a 'breaks' list")
+        return cls([BreakPolicy.from_dict(b) for b in data["breaks"]])
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a rule set from a JSON file."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    def default(cls, deduction_hours=0.5, annotate_on_positive=True, subtract_by_default=True):
+        """The built-in single lunch break (explicit > negative > positive > default)."""
+        lunch = BreakPolicy(
+            "lunch",
+            rules=[
+                BreakRule(r"\blunch\s*[:=]\s*(?:no|n)\b", priority=0, deduct=False),
+                BreakRule(r"\blunch\s*[:=]\s*(?:yes|y)\b", priority=0, deduct=True, annotate=True),
+                BreakRule(LUNCH_NO.pattern, priority=1, deduct=False),
+                BreakRule(LUNCH_POS.pattern, priority=2, deduct=True, annotate=True),
+            ],
+            deduct_hours=deduction_hours,
+            annotate="(lunch)" if annotate_on_positive else None,
+            default=subtract_by_default,
+        )
+        return cls([lunch])
+
+    def scan(self, segments):
+        """One pass per break over the line's segments; returns winning rule index per break."""
+        winners = [-1] * len(self.breaks)
+        rule_priority = self._rule_priority
+        for b_idx, gate, combined, group_rule in self._scanners:
+            cur = -1
+            for seg in segments:
+                first = gate(seg)
+                if first is None:
+                    continue
+                for m in combined(seg, first.start()):
+                    r_idx = group_rule[m.lastindex]
+                    # Segments and matches arrive in order, so only a strictly
+                    # lower priority can displace the current winner
+                    if cur < 0 or rule_priority[r_idx] < rule_priority[cur]:
+                        cur = r_idx
+            winners[b_idx] = cur
+        return winners
+
+    def decide(self, winners, gross_hours=None, clients=()):
+        """
+        Resolve the scan into (total_deduction_hours, annotations).
+        gross_hours=None skips shift-length gates; clients are raw block clients.
+        """
+        total = 0.0
+        notes = []
+        client_keys = None
+        for b_idx, brk in enumerate(self.breaks):
+            r_idx = winners[b_idx]
+            if r_idx >= 0:
+                deduct = self._rule_deduct[r_idx]
+                hours = self._rule_hours[r_idx]
+                note = self._rule_annotate[r_idx]
+            else:
+                deduct, hours, note = brk.default, brk.deduct_hours, None
+            if not deduct:
+                continue
+            if gross_hours is not None:
+                if gross_hours < brk.min_shift_hours:
+                    continue
+                if brk.max_shift_hours is not None and gross_hours > brk.max_shift_hours:
+                    continue
+            if brk.clients:
+                if client_keys is None:
+                    client_keys = {c.casefold() for c in clients if c and c != "NaN"}
+                if not (brk.clients & client_keys):
+                    continue
+            total += hours
+            if note:
+                notes.append(note)
+        return total, notes
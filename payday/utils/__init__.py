@@ -3,9 +3,18 @@
 from .timeparse import TimeParser
 from .textutils import TextTools
 from .extractors import FieldExtractors
+from .aliases import AhoCorasick, AliasNormalizer
+from .bloom import BloomFilter, ScalableBloomFilter
+from .streamstats import P2Quantile, RunningStats
 
 __all__ = [
     "TimeParser",
     "TextTools",
     "FieldExtractors",
+    "AhoCorasick",
+    "AliasNormalizer",
+    "BloomFilter",
+    "ScalableBloomFilter",
+    "RunningStats",
+    "P2Quantile",
 ]
@@ -0,0 +1,174 @@
+#payday\utils\aliases.py
+"""
+utils/aliases.py
+
+Client/location alias normalization.
+
+- AhoCorasick: case-insensitive multi-pattern matcher, built once, O(len(text)) scans
+- AliasNormalizer: maps extracted client/location values onto canonical names
+
+Alias file (JSON):
+    {
+      "clients":   {"ACME": ["acme corp", "alien circuitry"]},
+      "locations": {"14 Pulsar St": ["14 pulsar street"]}
+    }
+The canonical name is always an alias of itself.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+
+from utils.textutils import TextTools
+
+
+def _fold(text):
+    """Normalize text for matching: cleaned, casefolded."""
+    return TextTools.clean_text(text).casefold()
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over casefolded text.
+
+    All patterns are compiled into one automaton, so a scan costs
+    O(len(text) + matches) regardless of how many patterns are loaded.
+    """
+
+    def __init__(self, patterns):
+        """patterns: iterable of (pattern_text, value)."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._count = 0
+        for text, value in patterns:
+            key = _fold(text)
+            if key:
+                self._add(key, value)
+        self._build()
+
+    def __len__(self):
+        return self._count
+
+    def _add(self, key, value):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        # First registration wins for duplicate aliases
+        if not self._out[state]:
+            self._out[state] = ((len(key), value),)
+            self._count += 1
+
+    def _build(self):
+        """Breadth-first failure links; outputs inherit their suffix outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, folded):
+        """Yield (start, end, value) for every pattern occurrence in folded text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i + 1 - length, i + 1, value
+
+    def find(self, text, whole=False):
+        """
+        Return the value of the leftmost-longest whole-word match, or None.
+        Matches must start and end on word boundaries ('acme' does not hit 'acmes').
+        whole=True: only a match covering every word character of the text
+        ('acme corp' hits '(ACME Corp.)' but not 'Pacific ACME Corp').
+        """
+        folded = _fold(text)
+        if whole:
+            # Span of the text's word characters; a whole match must cover it
+            lo = next((i for i, ch in enumerate(folded) if _is_word_char(ch)), len(folded))
+            hi = len(folded) - next((i for i, ch in enumerate(reversed(folded)) if _is_word_char(ch)), len(folded))
+        best = None
+        for start, end, value in self.iter_matches(folded):
+            if start > 0 and _is_word_char(folded[start - 1]) and _is_word_char(folded[start]):
+                continue
+            if end < len(folded) and _is_word_char(folded[end]) and _is_word_char(folded[end - 1]):
+                continue
+            if whole and (start > lo or end < hi):
+                continue
+            if best is None or start < best[0] or (start == best[0] and end > best[1]):
+                best = (start, end, value)
+        return best[2] if best else None
+
+
+class AliasNormalizer:
+    """
+    Canonicalizes client and location values through prebuilt automata.
+
+    A value is replaced only when an alias spans all of it (surrounding
+    punctuation aside): "Pacific Acme" stays as written even if "acme" is
+    an alias. Values without such an alias (and "NaN") pass through unchanged.
+    """
+
+    def __init__(self, clients=None, locations=None):
+        self._clients = AhoCorasick(self._pairs(clients))
+        self._locations = AhoCorasick(self._pairs(locations))
+
+    @staticmethod
+    def _pairs(mapping):
+        for canonical, aliases in (mapping or {}).items():
+            yield canonical, canonical
+            for alias in aliases or ():
+                yield alias, canonical
+
+    @classmethod
+    def from_file(cls, path):
+        """Load an alias dictionary from a JSON file."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError(f"Alias file must contain a JSON object: {path}")
+        return cls(clients=data.get("clients"), locations=data.get("locations"))
+
+    def __bool__(self):
+        return bool(len(self._clients) or len(self._locations))
+
+    @staticmethod
+    def _normalize(matcher, value):
+        if not value or value == "NaN":
+            return value
+        canonical = matcher.find(value, whole=True)
+        return canonical if canonical is not None else value
+
+    def client(self, value):
+        """Canonical client name for value (or value unchanged)."""
+        return self._normalize(self._clients, value)
+
+    def location(self, value):
+        """Canonical location name for value (or value unchanged)."""
+        return self._normalize(self._locations, value)
+
+    def apply(self, blocks):
+        """Normalize 'client' and 'location' on each block in place."""
+        for b in blocks:
+            b["client"] = self.client(b["client"])
+            b["location"] = self.location(b["location"])
+        return blocks
@@ -0,0 +1,119 @@
+#payday\utils\bloom.py
+"""
+utils/bloom.py
+
+Bloom filters for bounded-memory membership tests.
+
+- BloomFilter: fixed capacity, sized for a target false-positive rate;
+  k bit positions per key by enhanced double hashing (Dillinger-Manolios)
+  of one blake2b digest
+- ScalableBloomFilter: chain of BloomFilters for an unknown number of keys;
+  each new filter doubles the capacity and halves the false-positive rate,
+  so the compound rate stays below the configured one however far it grows
+
+No false negatives: a key that was added always tests present. A key that
+was never added tests present with probability <= fp_rate.
+"""
+
+import hashlib
+import math
+
+_LN2_SQ = math.log(2) ** 2
+
+
+def _hash_pair(key):
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes keys."""
+
+    def __init__(self, capacity, fp_rate=1e-6):
+        if not 0.0 < fp_rate < 1.0:
+            raise ValueError(f"fp_rate must be between 0 and 1, got {fp_rate}")
+        self.capacity = max(1, int(capacity))
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / _LN2_SQ)))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def __contains__(self, key):
+        return self._has(*_hash_pair(key))
+
+    def add(self, key):
+        """Set key's bits; returns True if they were all set already (key probably seen)."""
+        return self._add(*_hash_pair(key))
+
+    def _has(self, h1, h2):
+        bits, m = self._bits, self.num_bits
+        pos, step = h1 % m, h2 % m
+        for i in range(1, self.num_hashes + 1):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos = (pos + step) % m
+            step = (step + i) % m
+        return True
+
+    def _add(self, h1, h2):
+        bits, m = self._bits, self.num_bits
+        pos, step = h1 % m, h2 % m
+        seen = True
+        for i in range(1, self.num_hashes + 1):
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                seen = False
+            pos = (pos + step) % m
+            step = (step + i) % m
+        if not seen:
+            self.count += 1
+        return seen
+
+
+class ScalableBloomFilter:
+    """
+    Growing Bloom filter (Almeida et al.): filters of capacity
+    initial_capacity * 2**i with false-positive rates fp_rate/2 * 2**-i,
+    whose union stays under fp_rate.
+    """
+
+    def __init__(self, fp_rate=1e-6, initial_capacity=1 << 16):
+        if not 0.0 < fp_rate < 1.0:
+            raise ValueError(f"fp_rate must be between 0 and 1, got {fp_rate}")
+        self.fp_rate = fp_rate
+        self.initial_capacity = max(1, int(initial_capacity))
+        self.filters = []
+
+    @property
+    def count(self):
+        return sum(f.count for f in self.filters)
+
+    @property
+    def nbytes(self):
+        return sum(f.nbytes for f in self.filters)
+
+    def __contains__(self, key):
+        h1, h2 = _hash_pair(key)
+        return any(f._has(h1, h2) for f in self.filters)
+
+    def add(self, key):
+        """Add key; returns True if it was (probably) present already."""
+        filters = self.filters
+        if not filters or filters[-1].full:
+            i = len(filters)
+            filters.append(BloomFilter(self.initial_capacity << i, self.fp_rate / 2 / (1 << i)))
+        h1, h2 = _hash_pair(key)
+        for f in filters[:-1]:
+            if f._has(h1, h2):
+                return True
+        return filters[-1]._add(h1, h2)
@@ -2,7 +2,7 @@
 
 import re
 from infra.constants import DAY_MAPPING, DAY_NAMES
-from patterns.patterns import LOC_AT, CLIENT_WITH, CLIENT_FOR, DAY_PATTERN
+from patterns.patterns import CLIENT_FOR, CLIENT_LEAD, CLIENT_RUN, CLIENT_WITH, DAY_PATTERN, LOC_AT
 from utils.textutils import TextTools
 
 
@@ -44,6 +44,31 @@ class FieldExtractors:
         m = pattern.search(text)
         return TextTools.clean_text(m.group(1)) if m else ""
 
+    @staticmethod
+    def task_after_client(text):
+        """
+        Task after a client clause: 'for ACME Corp, fix sink' -> 'fix sink'.
+        Same match as re.search(r"\\b(?:with|for)\\b\\s+[A-Za-z0-9][\\w&\\-\\s]+,\\s*(.+)$")
+        on single-line text, but linear: the client name cannot contain a comma,
+        so the comma must follow the maximal client-character run holding the
+        lead-in. Each run is visited once instead of re-scanned per 'for'/'with'.
+        Returns the raw capture (uncleaned) or None.
+        """
+        n = len(text)
+        for run in CLIENT_RUN.finditer(text):
+            end = run.end()
+            if end >= n - 1 or text[end] != ",":
+                continue
+            lead = CLIENT_LEAD.search(text, run.start(), end)
+            # The name needs at least one more run character after its first
+            if lead is None or lead.end() >= end:
+                continue
+            rest = text[end + 1:]
+            tail = rest.lstrip()
+            # (.+) keeps at least one character when the rest is all whitespace
+            return tail if tail else rest[-1]
+        return None
+
     @staticmethod
     def strip_directives(text):
         """Remove 'at ...', 'for ...', 'with ...' directives."""
@@ -75,9 +100,10 @@ class FieldExtractors:
         if client_candidate:
             client = client_candidate
 
-        m = re.search(r"\b(?:with|for)\b\s+[A-Za-z0-9][\w&\-\s]+,\s*(.+)$", after_eq, flags=re.IGNORECASE)
-        if m and TextTools.clean_text(m.group(1)):
-            task = TextTools.clean_text(m.group(1))
+        after_client = cls.task_after_client(after_eq)
+        after_client = TextTools.clean_text(after_client) if after_client else ""
+        if after_client:
+            task = after_client
         elif loc_tail:
             task = loc_tail
         else:
@@ -0,0 +1,128 @@
+#payday\utils\streamstats.py
+"""
+utils/streamstats.py
+
+Constant-memory running statistics (stdlib only).
+
+- RunningStats: Welford's online mean/variance (numerically stable, one pass)
+- P2Quantile: Jain & Chlamtac's P-square estimator of one quantile; five
+  markers, no stored samples
+- to_state()/from_state(): plain dicts, so baselines can be saved as JSON
+  and carried across runs
+"""
+
+import math
+
+
+class RunningStats:
+    """Welford accumulator: count, mean, sample variance/std."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_state(self):
+        return {"n": self.n, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(int(state["n"]), float(state["mean"]), float(state["m2"]))
+
+
+class P2Quantile:
+    """
+    Streaming estimate of the p-quantile (0 < p < 1) with five markers:
+    min, p/2, p, (1+p)/2, max. Marker heights move by piecewise-parabolic
+    interpolation as observations arrive. Exact until five observations.
+    """
+
+    __slots__ = ("p", "heights", "positions", "desired", "_steps")
+
+    def __init__(self, p):
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._steps = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    @property
+    def count(self):
+        return self.positions[4] if len(self.heights) == 5 else len(self.heights)
+
+    def add(self, x):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        n, desired, steps = self.positions, self.desired, self._steps
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            desired[i] += steps[i]
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                h = self._parabolic(i, s)
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])  # linear fallback
+                q[i] = h
+                n[i] += s
+
+    def _parabolic(self, i, s):
+        q, n = self.heights, self.positions
+        return q[i] + s / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        """Current estimate (None before the first observation)."""
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            return q[min(len(q) - 1, int(round(self.p * (len(q) - 1))))]
+        return q[2]
+
+    def to_state(self):
+        return {"p": self.p, "heights": list(self.heights), "positions": list(self.positions),
+                "desired": list(self.desired)}
+
+    @classmethod
+    def from_state(cls, state):
+        est = cls(float(state["p"]))
+        est.heights = [float(h) for h in state["heights"]]
+        est.positions = [int(n) for n in state["positions"]]
+        est.desired = [float(d) for d in state["desired"]]
+        return est
@@ -3,6 +3,8 @@
 import re
 from infra.constants import TITLE_MINOR_WORDS
 
+_BLANK_RUN = re.compile(r"[ \t]+")
+
 
 class TextTools:
     """Stateless text utilities."""
@@ -10,8 +12,8 @@ class TextTools:
     @staticmethod
     def clean_text(s):
         """Normalize dashes to '-' and collapse whitespace."""
-        s = s.replace("\u2013", "-").replace("\u2014", "-").replace("—", "-").replace("–", "-")
-        return re.sub(r"[ \t]+", " ", s.strip())
+        s = s.replace("\u2013", "-").replace("\u2014", "-")  # en/em dash
+        return _BLANK_RUN.sub(" ", s.strip())
 
     @staticmethod
     def is_acronym(token):
@@ -61,7 +63,9 @@ class TextTools:
         if not text or text == "NaN":
             return text
 
-        segs = [s.strip() for s in re.split(r"\s*;\s*", text) if s.strip()]
+        # str.split + strip == re.split(r"\s*;\s*") here, without the quadratic
+        # rescans of long whitespace runs
+        segs = [s.strip() for s in text.split(";") if s.strip()]
         out_segs = []
         for seg in segs:
             if cls.is_acronym(seg):
@@ -11,6 +11,10 @@ from dateutil import parser as dateparser
 
 from patterns.patterns import TIME_RANGE_GENERIC
 
+_HHMM = re.compile(r"(?:[01]\d|2[0-3])[0-5]\d(?:\s*(?:am|pm))?")
+_H_AMPM = re.compile(r"([01]?\d|2[0-3])\s*(am|pm)")
+_H_MM = re.compile(r"([01]?\d|2[0-3]):([0-5]\d)\s*(am|pm)?")
+
 
 class TimeParser:
     """Time token → datetime parsing and time-range extraction."""
@@ -21,7 +25,7 @@ class TimeParser:
         tok = tok.strip().lower().replace("a.m.", "am").replace("p.m.", "pm")
 
         # HHMM (e.g., 0930) with optional am/pm suffix
-        m = re.fullmatch(r"(?:[01]\d|2[0-3])[0-5]\d(?:\s*(?:am|pm))?", tok)
+        m = _HHMM.fullmatch(tok)
         if m:
             hh, mm = int(tok[:2]), int(tok[2:4])
             if tok.endswith("pm") and hh < 12:
@@ -32,7 +36,7 @@ class TimeParser:
             return datetime(today.year, today.month, today.day, hh, mm)
 
         # H am/pm (minutes default to 00)
-        m = re.fullmatch(r"([01]?\d|2[0-3])\s*(am|pm)", tok)
+        m = _H_AMPM.fullmatch(tok)
         if m:
             hh, ap = int(m.group(1)), m.group(2)
             if ap == "pm" and hh < 12:
@@ -43,7 +47,7 @@ class TimeParser:
             return datetime(today.year, today.month, today.day, hh, 0)
 
         # H:MM with optional am/pm
-        m = re.fullmatch(r"([01]?\d|2[0-3]):([0-5]\d)\s*(am|pm)?", tok)
+        m = _H_MM.fullmatch(tok)
         if m:
             hh, mm, ap = int(m.group(1)), int(m.group(2)), m.group(3)
             if ap == "pm" and hh < 12:
@@ -0,0 +1,21 @@
+"""
+tests/conftest.py
+
+- Puts payday/ and benchmarks/ on sys.path (benchmarks share the corpus
+  generator and budgets with the tests)
+- make_log: seeded synthetic free-text work log (see benchmarks/_common.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from _common import generate_log  # noqa: E402
+
+
+@pytest.fixture
+def make_log():
+    return generate_log
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from core.parser import WorkHourParser
+from utils.aliases import AhoCorasick, AliasNormalizer
+
+ALIASES = {"clients": {"ACME": ["acme corp", "alien circuitry"], "Beta": ["b"]},
+           "locations": {"14 Pulsar St": ["14 pulsar street"]}}
+
+
+@pytest.fixture
+def norm():
+    return AliasNormalizer(**ALIASES)
+
+
+@pytest.mark.parametrize("value, canonical", [
+    ("acme", "ACME"),
+    ("ACME Corp", "ACME"),
+    ("  alien   circuitry ", "ACME"),
+    ("(Acme Corp.)", "ACME"),
+    ("b", "Beta"),
+    ("NaN", "NaN"),
+])
+def test_whole_value_is_canonicalized(norm, value, canonical):
+    assert norm.client(value) == canonical
+
+
+@pytest.mark.parametrize("value", ["Pacific Acme", "x b y", "ACME Corp North", "acmes", "Beta Co"])
+def test_partial_match_leaves_client_alone(norm, value):
+    assert norm.client(value) == value
+
+
+def test_locations(norm):
+    assert norm.location("14 PULSAR STREET") == "14 Pulsar St"
+    assert norm.location("14 Pulsar Street north") == "14 Pulsar Street north"
+
+
+def test_matcher_finds_leftmost_longest_whole_word():
+    ac = AhoCorasick([("acme", 1), ("acme corp", 2), ("corp", 3), ("b", 4)])
+    assert ac.find("the Acme Corp yard") == 2
+    assert ac.find("acmes and corp") == 3
+    assert ac.find("x b y") == 4
+    assert ac.find("x b y", whole=True) is None
+    assert ac.find("ACME corp!", whole=True) == 2
+    assert ac.find("nothing") is None
+    assert len(ac) == 4
+
+
+def test_parser_applies_aliases(tmp_path):
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps(ALIASES), encoding="utf-8")
+    parser = WorkHourParser(aliases=AliasNormalizer.from_file(path))
+    rows = parser.parse("monday=0900 - 1200 | at 14 pulsar street for acme corp, pour\n"
+                        "tuesday=0900 - 1200 | at 14 Pulsar Street north for Pacific Acme, pour\n")
+    assert [(r["Location"], r["Client(s)"]) for r in rows] == [
+        ("14 Pulsar St", "ACME"), ("14 Pulsar Street North", "Pacific Acme")]
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from core.anomaly import (RULE_DUPLICATE_BLOCK, RULE_LONG_BLOCK, RULE_OUTLIER, RULE_OVERLAPPING_BLOCK,
+                          AnomalyDetector)
+
+
+class _Report:
+    def __init__(self):
+        self.rows = []
+
+    def record(self, source, day, on_date, time_blocks, scope, rule, hours, label, summary):
+        self.rows.append((scope, rule, time_blocks, hours, label))
+
+
+def _block(start, end, client="NaN"):
+    s = datetime(2024, 3, 4, start // 100, start % 100)
+    e = datetime(2024, 3, 4 + (end <= start), end // 100, end % 100)
+    return {"_s_dt": s, "_e_dt": e, "hours": round((e - s).total_seconds() / 3600, 2),
+            "time": "%04d-%04d" % (start, end), "client": client, "date": None}
+
+
+def _train(detector, employee, day, n, hours=8.0):
+    for _ in range(n):
+        assert detector.observe("%s.txt" % employee, employee, day, [], hours)
+
+
+def test_block_rules_flag_and_keep_day_out_of_baselines():
+    report = _Report()
+    detector = AnomalyDetector(report=report)
+    blocks = [_block(800, 500), _block(900, 1200, "ACME"), _block(900, 1200, "ACME"), _block(1100, 1300)]
+    assert not detector.observe("a.txt", "a", "monday", blocks, 5.0)
+    assert [r[:3] for r in report.rows] == [
+        ("block", RULE_LONG_BLOCK, "0800-0500"),
+        ("block", RULE_DUPLICATE_BLOCK, "0900-1200"),
+        ("block", RULE_OVERLAPPING_BLOCK, "1100-1300"),
+    ]
+    assert detector.flagged == 3 and detector.days == 1
+    assert all(b.stats.n == 0 for b in detector.baselines.values())
+
+    assert detector.observe("a.txt", "a", "monday", [_block(900, 1200, "ACME"), _block(1200, 1300)], 4.0)
+    assert detector.baselines[("client", "acme", "block_hours")].stats.n == 1
+    assert detector.baselines[("employee", "a", "day_hours")].stats.n == 1
+
+
+def test_outliers_only_after_min_count():
+    report = _Report()
+    detector = AnomalyDetector(min_count=8, report=report)
+    _train(detector, "ann", "tuesday", 7)
+    assert detector.observe("ann.txt", "ann", "tuesday", [], 30.0)  # 7 observations: too early
+    assert report.rows == []
+
+    _train(detector, "bob", "monday", 8)
+    _train(detector, "bob", "monday", 1, hours=8.5)  # small changes stay inside the floored spread
+    assert not detector.observe("bob.txt", "bob", "monday", [], 30.0)
+    assert [(r[1], r[4]) for r in report.rows] == [(RULE_OUTLIER, "employee:bob"), (RULE_OUTLIER, "weekday:Monday")]
+    assert detector.baselines[("employee", "bob", "day_hours")].stats.n == 9  # flagged day not learned
+    assert not detector.observe("bob.txt", "bob", "monday", [], 0.5)
+
+
+def test_client_block_outlier():
+    report = _Report()
+    detector = AnomalyDetector(min_count=4, report=report)
+    for _ in range(4):
+        detector.observe("a.txt", "a", "monday", [_block(900, 1000, "ACME")], 1.0)
+    assert not detector.observe("a.txt", "a", "monday", [_block(600, 1800, "Acme")], 12.0)
+    assert ("block", RULE_OUTLIER, "0600-1800", 12.0, "client:acme") in report.rows
+
+
+def test_state_round_trip(tmp_path):
+    path = tmp_path / "state" / "anomaly.json"
+    detector = AnomalyDetector(min_count=8)
+    _train(detector, "bob", "monday", 12)
+    _train(detector, "bob", "monday", 3, hours=9.0)
+    detector.observe("bob.txt", "bob", "monday", [_block(900, 1100, "ACME")], 2.0)
+    assert detector.save_state(path) == path
+    assert not path.with_name("anomaly.json.tmp").exists()
+
+    loaded = AnomalyDetector(min_count=8).load_state(path)
+    assert loaded.baselines.keys() == detector.baselines.keys()
+    for key, baseline in detector.baselines.items():
+        assert loaded.baselines[key].summary() == pytest.approx(baseline.summary())
+    assert not loaded.observe("bob.txt", "bob", "monday", [], 30.0)
+
+    loaded.save_state(tmp_path / "again.json")
+    assert json.loads((tmp_path / "again.json").read_text()) == json.loads(path.read_text())
+
+
+def test_state_missing_file_and_bad_version(tmp_path):
+    assert AnomalyDetector().load_state(tmp_path / "none.json").baselines == {}
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"version": 99, "baselines": []}', encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported anomaly state version"):
+        AnomalyDetector().load_state(bad)
+    with pytest.raises(ValueError):
+        AnomalyDetector(z_max=0)
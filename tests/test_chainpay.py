@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+CORPUS = Path(__file__).resolve().parent / "data" / "chainpay"
+
+
+def _chainpay(cwd, *args, stdin=None):
+    return subprocess.run([sys.executable, str(ROOT / "chainpay.py"), *map(str, args)], cwd=cwd,
+                          input=stdin, capture_output=True)
+
+
+@pytest.mark.parametrize("name", ["sample", "crew", "fuzz"])
+def test_matches_legacy_output(tmp_path, name):
+    """Golden files are the output of the original standalone chainpay.py."""
+    proc = _chainpay(tmp_path, CORPUS / f"{name}.txt")
+    assert proc.returncode == 0, proc.stderr
+    assert (tmp_path / "work hour.csv").read_bytes() == (CORPUS / f"{name}.csv").read_bytes()
+
+
+def test_stdin_and_errors(tmp_path):
+    proc = _chainpay(tmp_path, stdin=(CORPUS / "sample.txt").read_bytes())
+    assert proc.returncode == 0, proc.stderr
+    assert (tmp_path / "work hour.csv").read_bytes() == (CORPUS / "sample.csv").read_bytes()
+
+    assert _chainpay(tmp_path, tmp_path / "missing.txt").returncode == 2
+    (tmp_path / "junk.txt").write_text("notes only\n", encoding="utf-8")
+    assert _chainpay(tmp_path, tmp_path / "junk.txt").returncode == 1
@@ -0,0 +1,65 @@
+import json
+
+from pdio.checkpoint import CheckpointJournal
+from test_cli import run_cli
+
+RULES = {"breaks": [{"name": "lunch", "deduct_hours": 1.0, "default": True,
+                     "rules": [{"pattern": "\\blunch\\b", "deduct": True}]}]}
+ALIASES = {"clients": {"ACME": ["acme corp"]}, "locations": {}}
+
+
+def _setup(tmp_path, make_log):
+    inputs = []
+    for i in range(2):
+        p = tmp_path / f"emp{i}.txt"
+        p.write_text(make_log(40, seed=i), encoding="utf-8")
+        inputs.append(p)
+    (tmp_path / "rules.json").write_text(json.dumps(RULES), encoding="utf-8")
+    (tmp_path / "aliases.json").write_text(json.dumps(ALIASES), encoding="utf-8")
+    return inputs
+
+
+def _processed(caplog):
+    msg = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Batch:")][-1]
+    caplog.clear()
+    return int(msg.split()[1])
+
+
+def test_resume_skips_only_same_targets_and_config(tmp_path, make_log, caplog):
+    inputs = _setup(tmp_path, make_log)
+    ck = tmp_path / "ck.jsonl"
+    base = [*inputs, "--checkpoint", ck]
+    caplog.set_level("INFO")
+
+    assert run_cli(*base, "--out-dir", tmp_path / "a") == 0
+    assert _processed(caplog) == 2
+    assert run_cli(*base, "--out-dir", tmp_path / "a") == 0
+    assert _processed(caplog) == 0
+
+    # Another output directory must get its own CSVs
+    assert run_cli(*base, "--out-dir", tmp_path / "b") == 0
+    assert _processed(caplog) == 2
+    assert sorted(p.name for p in (tmp_path / "b").iterdir()) == ["emp0.csv", "emp1.csv"]
+
+    for extra in (["--rules", tmp_path / "rules.json"], ["--aliases", tmp_path / "aliases.json"],
+                  ["--input-format", "text", "--max-line-chars", "60"]):
+        assert run_cli(*base, "--out-dir", tmp_path / "b", *extra) in (0, 1)
+        assert _processed(caplog) == 2, extra
+        assert run_cli(*base, "--out-dir", tmp_path / "b", *extra) in (0, 1)
+        assert _processed(caplog) == 0, extra
+
+    # Editing a rule file in place changes the fingerprint too
+    RULES["breaks"][0]["deduct_hours"] = 0.75
+    (tmp_path / "rules.json").write_text(json.dumps(RULES), encoding="utf-8")
+    assert run_cli(*base, "--out-dir", tmp_path / "b", "--rules", tmp_path / "rules.json") == 0
+    assert _processed(caplog) == 2
+
+
+def test_journal_without_targets_or_config_is_not_trusted(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("Mon 0900-1700\n", encoding="utf-8")
+    with CheckpointJournal(tmp_path / "ck.jsonl") as journal:
+        journal.record(src, src.read_bytes(), [], 1)
+    journal = CheckpointJournal(tmp_path / "ck.jsonl")
+    assert journal.completed(src) is not None
+    assert journal.completed(src, [tmp_path / "in.csv"], "cfg") is None
@@ -0,0 +1,69 @@
+import pytest
+
+import main as cli
+from pdio.snapshot import SnapshotReader
+
+
+def run_cli(*args):
+    return cli.main(["payday", *map(str, args)])
+
+
+def test_diff_unwritable_out_is_input_error(tmp_path, make_log):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(20), encoding="utf-8")
+    assert run_cli("diff", log, log, "--out", tmp_path / "missing" / "dir" / "d.csv") == 2
+    assert run_cli("diff", log, log, "--out", tmp_path / "d.csv") == 0
+
+
+def test_sink_failure_is_output_error(tmp_path, make_log, capsys):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(50), encoding="utf-8")
+    bad = tmp_path / "file"
+    bad.write_text("", encoding="utf-8")
+    assert run_cli(log, "--sink", bad / "out.csv") == 2  # parent is a file
+    assert "Traceback" not in capsys.readouterr().err
+
+
+def test_unknown_sink_kind_is_rejected(tmp_path, make_log, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(20), encoding="utf-8")
+    assert run_cli(log, "--sink", "db:out.db") == 2
+    assert not (tmp_path / "db:out.db").exists()
+
+
+def test_unwritable_block_outputs_are_output_errors(tmp_path, make_log, capsys):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(50), encoding="utf-8")
+    rates = tmp_path / "rates.json"
+    rates.write_text('{"default_rate": 25, "weekly_overtime_hours": 40}', encoding="utf-8")
+    bad = tmp_path / "file"
+    bad.write_text("", encoding="utf-8")
+    sink = ["--sink", f"csv:{tmp_path / 'cpd.csv'}"]
+    for flags in (["--snapshot", bad / "s.snap"], ["--sort-out", bad / "sorted.csv"],
+                  ["--pay", rates, "--pay-out", bad / "pay.csv"]):
+        assert run_cli(log, *sink, *flags) == 2, flags
+        assert "Traceback" not in capsys.readouterr().err
+
+
+def test_truncated_snapshot_is_rejected(tmp_path, make_log):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(50), encoding="utf-8")
+    snap = tmp_path / "s.snap"
+    assert run_cli(log, "--sink", f"csv:{tmp_path / 'cpd.csv'}", "--snapshot", snap) == 0
+    data = snap.read_bytes()
+    for size in (10, 40, len(data) // 2):
+        cut = tmp_path / f"cut{size}.snap"
+        cut.write_bytes(data[:size])
+        with pytest.raises(ValueError, match="Truncated snapshot"):
+            SnapshotReader(cut)
+
+
+def test_mem_flags(tmp_path, make_log):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(50), encoding="utf-8")
+    sink = ["--sink", f"csv:{tmp_path / 'cpd.csv'}"]
+    assert run_cli(log, *sink, "--mem-budget", 1) == 3  # a budget alone turns profiling on
+    assert run_cli(log, *sink, "--mem-budget", 10 ** 9) == 0
+    for flags in (["--memprofile"], ["--mem-budget", 1]):
+        assert run_cli(log, "--out-dir", tmp_path / "out", *flags) == 2
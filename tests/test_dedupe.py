@@ -0,0 +1,60 @@
+import csv
+
+from test_cli import run_cli
+
+TEXT = """monday=0900 - 1700 | at Site A for ACME, Pour
+tuesday=0800 - 1200 | at Depot for Zenith, Unload
+monday=0900 - 1700 | at Site A for ACME, Pour
+"""
+DATED = """date,start,end,location,task,client
+2024-03-04,0900,1700,Site A,Pour,ACME
+2024-03-05,0800,1200,Depot,Unload,Zenith
+2024-03-04,0900,1700,Site A,Pour,ACME
+"""
+
+
+def _days(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return [r["Day"] for r in csv.DictReader(f) if r["Day"] and r["Day"] != "TOTAL" and r["Day"][0] != "#"]
+
+
+def _run(tmp_path, files, *flags, rc=0):
+    inputs = []
+    for name, text in files.items():
+        p = tmp_path / name
+        p.write_text(text, encoding="utf-8")
+        inputs.append(p)
+    out = tmp_path / "out"
+    report = tmp_path / "dups.csv"
+    assert run_cli(*inputs, "--out-dir", out, "--dedupe", *flags, "--dedupe-report", report) == rc
+    return {p.stem: _days(out / f"{p.stem}.csv") for p in inputs}
+
+
+def test_undated_lines_match_within_source_by_default(tmp_path):
+    files = {"ann.txt": TEXT, "bob.txt": TEXT + "friday=0700 - 1100 | at Yard, Sweep\n"}
+    assert _run(tmp_path, files, "line") == {"ann": ["Monday", "Tuesday"],
+                                             "bob": ["Monday", "Tuesday", "Friday"]}
+    assert _run(tmp_path, files, "line", "--dedupe-scope", "global") == {"ann": ["Monday", "Tuesday"],
+                                                                         "bob": ["Friday"]}
+
+
+def test_undated_blocks_fail_unless_opted_in(tmp_path, caplog):
+    files = {"ann.txt": TEXT, "bob.txt": TEXT + "friday=0700 - 1100 | at Yard, Sweep\n"}
+    assert _run(tmp_path, files, "blocks", rc=2) == {"ann": ["Monday", "Tuesday", "Monday"],
+                                                     "bob": ["Monday", "Tuesday", "Monday", "Friday"]}
+    assert "checked none of 7 undated day(s)" in caplog.text
+
+    assert _run(tmp_path, files, "blocks", "--dedupe-undated") == {"ann": ["Monday", "Tuesday"],
+                                                                  "bob": ["Monday", "Tuesday", "Friday"]}
+
+    one = ("--out", tmp_path / "one.csv", "--dedupe-report", tmp_path / "one-dups.csv")
+    assert run_cli(tmp_path / "ann.txt", *one, "--dedupe", "blocks") == 2
+    assert run_cli(tmp_path / "ann.txt", *one, "--dedupe", "line") == 0
+
+
+def test_dated_days_match_per_employee_by_default(tmp_path):
+    files = {"ann.csv": DATED, "bob.csv": DATED + "2024-03-08,0700,1100,Yard,Sweep,\n"}
+    assert _run(tmp_path, files, "blocks") == {"ann": ["Monday", "Tuesday"],
+                                               "bob": ["Monday", "Tuesday", "Friday"]}
+    assert _run(tmp_path, files, "blocks", "--dedupe-scope", "global") == {"ann": ["Monday", "Tuesday"],
+                                                                          "bob": ["Friday"]}
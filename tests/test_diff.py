@@ -0,0 +1,74 @@
+import shutil
+
+from core.diff import BlockDiff
+from test_cli import run_cli
+
+LOG = """day,start,end,location,task,client
+Monday,0900,1700,Site A,Pour,ACME
+Tuesday,0800,1200,Depot,Unload,Zenith
+"""
+
+
+def _run(tmp_path, src, out_name="cpd.csv"):
+    out = tmp_path / out_name
+    assert run_cli(src, "--sink", f"csv:{out}") == 0
+    return out
+
+
+def test_structured_log_against_its_output(tmp_path):
+    log = tmp_path / "log.csv"
+    log.write_text(LOG, encoding="utf-8")
+    out = _run(tmp_path, log)
+
+    differ = BlockDiff()
+    assert list(differ.diff(log, out)) == []
+    assert differ.summary["unchanged"] == 2
+    assert run_cli("diff", log, out) == 0
+
+
+def test_output_detected_by_header_not_suffix(tmp_path):
+    log = tmp_path / "log.csv"
+    log.write_text(LOG, encoding="utf-8")
+    out = _run(tmp_path, log)
+    renamed = tmp_path / "previous.run"
+    shutil.copy(out, renamed)
+
+    log.write_text(LOG.replace("Tuesday,0800,1200", "Tuesday,0800,1300"), encoding="utf-8")
+    changes = list(BlockDiff().diff(renamed, log))
+    assert sorted((c["Change"], c["Day"], c["TimeBlock"]) for c in changes) == [
+        ("added", "Tuesday", "0800-1300"), ("hours", "Tuesday", ""), ("removed", "Tuesday", "0800-1200")]
+
+
+def test_net_hours_change_is_reported(tmp_path):
+    old = tmp_path / "old.txt"
+    old.write_text("monday=0900 - 1700 | at Site A for ACME, Pour | lunch\n"
+                   "tuesday=0800 - 1200 | at Depot for Zenith, Unload\n", encoding="utf-8")
+    new = tmp_path / "new.txt"
+    new.write_text(old.read_text(encoding="utf-8").replace("| lunch", "| lunch: no"), encoding="utf-8")
+
+    differ = BlockDiff()
+    hours = [c for c in differ.diff(old, new) if c["Change"] == "hours"]
+    assert [(c["Day"], c["Old"], c["New"], c["HoursDelta"]) for c in hours] == [("Monday", 7.5, 8.0, 0.5)]
+    assert differ.summary["hours_delta"] == 0.5
+    assert run_cli("diff", old, new) == 1
+
+    # Against the old run's output: same blocks, only the paid hours moved
+    out = _run(tmp_path, old)
+    differ = BlockDiff()
+    changes = list(differ.diff(out, new))
+    assert [c["Field"] for c in changes] == ["Task", "Hours"]
+    assert differ.summary["hours_delta"] == 0.5
+
+
+def test_structured_days_streamed_like_parsed(tmp_path):
+    from core.structured import StructuredLogParser
+
+    text = LOG + "Tuesday,1300,1600,Depot,Sort,Zenith\nMonday,0700,0900,Yard,Sweep,\n"
+    parser = StructuredLogParser("csv")
+    log = tmp_path / "log.csv"
+    log.write_text(text, encoding="utf-8")
+    with log.open(encoding="utf-8", newline="") as f:
+        streamed = [(day, [b["time"] for b in blocks], net) for day, blocks, net in parser.iter_stream_days(f)]
+    parsed = [(day, [b["time"] for b in blocks], net) for day, blocks, net in parser.iter_days(text)]
+    assert streamed == parsed
+    assert len(parsed) == 3
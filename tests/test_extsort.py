@@ -0,0 +1,61 @@
+import random
+from datetime import date
+
+import pytest
+
+from infra.constants import DAY_NAMES
+from pdio.extsort import ExternalSorter
+
+DAYS = [d.capitalize() for d in DAY_NAMES]
+
+
+def _records(n, seed=7):
+    """Block records with many equal sort keys; Task carries the input position."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        dated = rng.random() < 0.5
+        on = date(2024, 3, rng.randint(1, 4)) if dated else None
+        start = rng.choice((480, 540, 780))
+        out.append({
+            "Employee": rng.choice(("ann", "bob", "")),
+            "Day": on.strftime("%A") if dated else rng.choice(DAYS + ["Unknown"]),
+            "Date": on,
+            "Start": start,
+            "End": start + rng.choice((60, 240)),
+            "Location": rng.choice(("Site A", "Depot")),
+            "Task": "t%d" % i,
+            "Client": "ACME",
+            "Hours": 1.0,
+            "Unpaid": rng.choice((0, 30)),
+        })
+    return out
+
+
+def _key(rec):
+    weekday = DAYS.index(rec["Day"]) if rec["Day"] in DAYS else 7
+    return (rec["Employee"], 0 if rec["Date"] else 1,
+            rec["Date"].toordinal() if rec["Date"] else weekday, rec["Start"])
+
+
+@pytest.mark.parametrize("run_size,fan_in", [(1, 2), (3, 2), (16, 3), (100000, 64)])
+def test_matches_stable_sorted(tmp_path, run_size, fan_in):
+    recs = _records(257)
+    with ExternalSorter(run_size=run_size, tmp_dir=tmp_path, fan_in=fan_in) as sorter:
+        for rec in recs[:100]:
+            sorter.add(rec)
+        sorter.extend(recs[100:])
+        got = list(sorter.merged())
+    assert got == sorted(recs, key=_key)  # sorted() is stable: Task order within equal keys
+    assert sorter.count == 257
+    if run_size == 1:
+        assert sorter.spilled_runs > 257  # intermediate merge passes wrote runs too
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_and_single_record(tmp_path):
+    with ExternalSorter(run_size=1, tmp_dir=tmp_path, fan_in=2) as sorter:
+        assert list(sorter.merged()) == []
+    rec = _records(1)[0]
+    with ExternalSorter(run_size=1, tmp_dir=tmp_path, fan_in=2) as sorter:
+        assert list(sorter.extend([rec]).merged()) == [rec]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import main as cli
+from core.grammar import InputGrammar
+
+CREW = {
+    "name": "crew-b",
+    "files": ["crew-b/*", "*-crewb.txt"],
+    "separators": ["|", ";"],
+    "time": {"formats": ["H", "H:MM", "HHMM"], "range": ["-", "to"], "clock": "12h", "day_start": 6},
+    "directives": {"location": ["@"], "client": ["/"], "task": [":"]},
+}
+
+
+def _blocks(text, grammar=CREW):
+    recs = InputGrammar.from_dict(grammar).parser().parse_blocks(text)
+    return [(r["Day"], r["Start"], r["End"], r["Location"], r["Client"], r["Task"]) for r in recs]
+
+
+def _span(grammar, text):
+    return InputGrammar.from_dict(grammar).time_range(text)[2]
+
+
+@pytest.mark.parametrize("text, span", [
+    ("7-3:30", "0700-1530"),   # end before start on the dial: afternoon
+    ("1-5", "1300-1700"),      # start before day_start: afternoon
+    ("6-11", "0600-1100"),
+    ("9-12", "0900-1200"),
+    ("7am-3pm", "0700-1500"),
+    ("0730 to 1600", "0730-1600"),
+])
+def test_12h_dial(text, span):
+    assert _span(CREW, text) == span
+
+
+def test_overnight_ranges():
+    assert _span(CREW, "9p-1a") == "2100-0100"
+    assert _span(dict(CREW, time={"formats": ["HHMM"]}), "2200-0600") == "2200-0600"
+    assert _blocks("Fri 9p-1a @Depot/Nightshift Co: unload") == [
+        ("Friday", 21 * 60, 25 * 60, "Depot", "Nightshift Co", "Unload")]
+
+
+def test_repeated_marker_stays_in_value():
+    assert _blocks("Wed 9-5 @x/y: a:b")[0][3:] == ("X", "Y", "A:b")
+    assert _blocks("Wed 9-5 @Oak/ACME: fix sink @ unit 4")[0][3:] == ("Oak", "ACME", "Fix sink @ unit 4")
+    # the first marker of each field still cuts the value before it
+    assert _blocks("Wed 9-5 : paint / Beta @ Elm")[0][3:] == ("Elm", "Beta", "Paint")
+
+
+def test_modifiers_fill_missing_fields():
+    blocks = _blocks("Thu 7-11 : framing | @Oak Hall ; /Nebula Nomads @ignored | 12-3:30 @Pine: drywall")
+    assert blocks == [
+        ("Thursday", 7 * 60, 11 * 60, "Oak Hall", "Nebula Nomads", "Framing"),
+        ("Thursday", 12 * 60, 15 * 60 + 30, "Pine", "NaN", "Drywall"),
+    ]
+
+
+def test_matches_and_per_file_selection():
+    crew = InputGrammar.from_dict(CREW)
+    other = InputGrammar.from_dict({"name": "other", "time": {"clock": "12h"}})
+    assert crew.matches("crew-b/mon.txt")
+    assert crew.matches("/data/jane-crewb.txt")
+    assert not crew.matches("crew-a/mon.txt")
+    assert not crew.matches("")
+    assert not other.matches("crew-b/mon.txt")
+
+    grammars = [crew, other]
+    assert cli._grammar_for(grammars, "crew-b/mon.txt") is crew
+    assert cli._grammar_for(grammars, "jane.txt") is other  # first grammar without globs
+    assert cli._grammar_for([crew], "jane.txt") is None
+
+
+def test_batch_picks_grammar_per_file(tmp_path):
+    (tmp_path / "crew.json").write_text(json.dumps(CREW), encoding="utf-8")
+    crew = tmp_path / "jane-crewb.txt"
+    crew.write_text("Mon 7-3:30 @Oak/ACME: framing\n", encoding="utf-8")
+    plain = tmp_path / "joe.txt"
+    plain.write_text("monday=0900 - 1700 | at Site A for ACME, Pour\n", encoding="utf-8")
+    out = tmp_path / "out"
+    assert cli.main(["payday", str(crew), str(plain), "--grammar", str(tmp_path / "crew.json"),
+                     "--out-dir", str(out)]) == 0
+    assert "0700-1530" in (out / "jane-crewb.csv").read_text(encoding="utf-8")
+    assert "0900-1700" in (out / "joe.csv").read_text(encoding="utf-8")
@@ -0,0 +1,96 @@
+import csv
+import random
+from datetime import date
+
+from core.intervals import IntervalTree, OccupancyIndex
+from test_cli import run_cli
+
+_DAYS = ["Monday", "Tuesday", "Wednesday"]
+
+
+def _blocks(n, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        start = rng.randrange(0, 1440, 15)
+        on = date(2024, 3, rng.randint(4, 6)) if rng.random() < 0.5 else None
+        out.append({"Employee": rng.choice("abcd"), "Day": rng.choice(_DAYS), "Date": on, "Start": start,
+                    "End": start + rng.randrange(15, 720, 15), "Client": rng.choice(["ACME", "acme", "Beta", "NaN"]),
+                    "Location": rng.choice(["Oak", "Elm", "NaN"])})
+    return out
+
+
+def test_tree_matches_brute_force():
+    rng = random.Random(3)
+    ivs = [(s, s + rng.randint(0, 50), i) for i, s in enumerate(rng.randint(0, 1000) for _ in range(500))]
+    tree = IntervalTree(ivs)
+    assert len(tree) == sum(e > s for s, e, _ in ivs)
+    for _ in range(300):
+        s = rng.randint(-20, 1050)
+        e = s + rng.randint(1, 80)
+        assert sorted(tree.overlapping(s, e)) == [i for qs, qe, i in ivs if qs < qe and qs < e and s < qe]
+
+
+def test_queries_match_brute_force():
+    blocks = _blocks(600)
+    index = OccupancyIndex(blocks)
+    rng = random.Random(5)
+    for _ in range(200):
+        day = rng.choice(_DAYS)
+        on = date(2024, 3, rng.randint(4, 6)) if rng.random() < 0.5 else None
+        start = rng.randrange(0, 1440, 30)
+        end = (start + rng.randrange(30, 900, 30)) % 1440
+        qs = OccupancyIndex.span({"Day": day, "Date": on, "Start": start, "End": start})[0]
+        qe = qs + (end - start if end > start else end - start + 1440)
+        for field, query in (("Client", index.for_client), ("Location", index.at_location)):
+            value = rng.choice(["acme", "Beta", "Oak", "Elm"])
+            expected = [b for b in blocks if b[field].casefold() == value.casefold()
+                        and OccupancyIndex.span(b)[0] < qe and qs < OccupancyIndex.span(b)[1]]
+            got = query(value, "%02d%02d" % divmod(start, 60), "%02d:%02d" % divmod(end, 60), day=day, on_date=on)
+            assert got == expected
+
+
+def test_conflicts_match_brute_force():
+    blocks = _blocks(400, seed=9)
+    index = OccupancyIndex(blocks)
+    for by in ("Client", "Location"):
+        expected = set()
+        for i, a in enumerate(blocks):
+            for j in range(i + 1, len(blocks)):
+                b = blocks[j]
+                sa, ea = OccupancyIndex.span(a)
+                sb, eb = OccupancyIndex.span(b)
+                if (a[by] != "NaN" and a[by].casefold() == b[by].casefold() and a["Employee"] != b["Employee"]
+                        and sa < eb and sb < ea):
+                    expected.add(frozenset((i, j)))
+        ids = {id(b): i for i, b in enumerate(blocks)}
+        got = [frozenset((ids[id(a)], ids[id(b)])) for a, b in index.conflicts(by=by)]
+        assert len(got) == len(set(got)) and set(got) == expected
+
+
+def test_overnight_and_back_to_back():
+    night = {"Employee": "a", "Day": "Monday", "Date": None, "Start": 22 * 60, "End": 26 * 60, "Client": "ACME"}
+    after = {"Employee": "b", "Day": "Tuesday", "Date": None, "Start": 60, "End": 180, "Client": "ACME"}
+    next_ = {"Employee": "c", "Day": "Tuesday", "Date": None, "Start": 120, "End": 240, "Client": "ACME"}
+    index = OccupancyIndex([night, after, next_])
+    assert index.for_client("acme", "0030", "0100", day="Tuesday") == [night]
+    assert index.for_client("acme", "2330", "0030", day="Monday") == [night]
+    assert index.for_client("acme", "0200", "0400", day="tue") == [after, next_]  # night ends at 0200
+    assert {(a["Employee"], b["Employee"]) for a, b in index.conflicts()} == {("a", "b"), ("b", "c")}
+
+
+def test_batch_conflicts_report(tmp_path):
+    (tmp_path / "ann.txt").write_text("monday=0900 - 1700 | at Oak for ACME, frame\n", encoding="utf-8")
+    (tmp_path / "bob.txt").write_text("monday=1600 - 1800 | at Pine for ACME, wire\n"
+                                      "monday=1700 - 1800 | at Oak for Beta, sweep\n", encoding="utf-8")
+    report = tmp_path / "conflicts.csv"
+    inputs = [tmp_path / "ann.txt", tmp_path / "bob.txt", "--out-dir", tmp_path / "out", "--conflicts", report]
+    assert run_cli(*inputs) == 0
+    with report.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["Value"], r["EmployeeA"], r["EmployeeB"], r["OverlapMinutes"]) for r in rows] == [
+        ("ACME", "ann", "bob", "60")]
+    assert run_cli(*inputs, "--conflicts-by", "location") == 0
+    with report.open(encoding="utf-8", newline="") as f:
+        assert list(csv.DictReader(f)) == []
+    assert run_cli(tmp_path / "ann.txt", "--conflicts", report) == 2
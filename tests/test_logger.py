@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from infra.logger import LoggerFactory
+
+
+@pytest.fixture
+def logfile(tmp_path, monkeypatch):
+    """Restart the writer thread on a JSON log file; restore the stderr listener afterwards."""
+    path = tmp_path / "run.log"
+    LoggerFactory.shutdown()
+    monkeypatch.setenv("WORKHOUR_LOGFILE", str(path))
+    monkeypatch.setenv("WORKHOUR_LOGFORMAT", "json")
+    monkeypatch.setenv("WORKHOUR_LOGLEVEL", "INFO")
+    yield path
+    LoggerFactory.shutdown()
+    monkeypatch.delenv("WORKHOUR_LOGFILE")
+    monkeypatch.delenv("WORKHOUR_LOGFORMAT")
+    LoggerFactory.get_logger("test.logger")
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_shutdown_drains_queue_in_order(logfile):
+    log = LoggerFactory.get_logger("test.logger")
+    for i in range(500):
+        log.info("line %d of %s", i, "run", extra={"stage": "parse", "rows": i})
+    LoggerFactory.shutdown()
+
+    recs = _records(logfile)
+    assert [r["msg"] for r in recs] == ["line %d of run" % i for i in range(500)]
+    assert recs[-1]["stage"] == "parse" and recs[-1]["rows"] == 499
+    assert recs[0]["logger"] == "test.logger" and recs[0]["level"] == "INFO"
+    LoggerFactory.shutdown()  # idempotent
+
+
+def test_records_queued_after_shutdown_flush_on_restart(logfile):
+    log = LoggerFactory.get_logger("test.logger")
+    log.info("before")
+    LoggerFactory.shutdown()
+    log.warning("while stopped")
+    assert [r["msg"] for r in _records(logfile)] == ["before"]
+
+    assert LoggerFactory.get_logger("test.logger") is log
+    LoggerFactory.shutdown()
+    assert [r["msg"] for r in _records(logfile)] == ["before", "while stopped"]
+
+
+def test_exception_text_is_rendered_before_enqueue(logfile):
+    log = LoggerFactory.get_logger("test.logger")
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        log.exception("failed at %d", 7)
+    LoggerFactory.shutdown()
+
+    (rec,) = _records(logfile)
+    assert rec["msg"] == "failed at 7" and rec["level"] == "ERROR"
+    assert "ValueError: bad row" in rec["exc"]
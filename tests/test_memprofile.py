@@ -0,0 +1,11 @@
+from bench_memory import STAGE_BUDGETS, over_budget, profile_parse
+
+
+def test_stage_peaks_within_budget_and_flat(tmp_path, make_log):
+    small = profile_parse(make_log(1000), tmp_path / "small.csv")
+    large = profile_parse(make_log(4000, seed=2), tmp_path / "large.csv")
+
+    assert set(STAGE_BUDGETS) | {"parse"} <= set(large)
+    assert over_budget(large, 256) == []
+    # Streaming: four times the input must not mean four times the peak
+    assert large["parse"].peak < 1.5 * small["parse"].peak
@@ -0,0 +1,51 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+from core.parser import WorkHourParser
+from infra.logger import LoggerFactory
+from pdio.rejects import RejectSink
+
+
+def _rejects(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return sorted(tuple(r) for r in list(csv.reader(f))[1:])
+
+
+def _parse(tmp_path, name, texts, sources, executor=None):
+    sink = RejectSink(tmp_path / name)
+    parser = WorkHourParser(diagnostics=sink)
+    try:
+        rows = parser.parse_many(texts, executor=executor, sources=sources)
+    finally:
+        sink.close()
+    return rows, _rejects(tmp_path / name)
+
+
+def test_shared_instance_matches_sequential(tmp_path, make_log):
+    texts = [make_log(200, seed=i) for i in range(64)]
+    sources = [f"log{i}.txt" for i in range(64)]
+    expected, expected_rejects = _parse(tmp_path, "seq.csv", texts, sources)
+    assert expected_rejects  # the corpus exercises the diagnostics path
+
+    for run in range(3):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            rows, rejects = _parse(tmp_path, f"threads{run}.csv", texts, sources, executor=pool)
+        assert rows == expected
+        assert rejects == expected_rejects
+
+
+def test_parse_many_checks_sources():
+    parser = WorkHourParser()
+    try:
+        parser.parse_many(["a", "b"], sources=["one"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("mismatched sources accepted")
+
+
+def test_logger_factory_concurrent_get_logger():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        loggers = list(pool.map(lambda i: LoggerFactory.get_logger(f"payday.test.{i % 4}"), range(200)))
+    for name in {lg.name for lg in loggers}:
+        assert len(LoggerFactory.get_logger(name).handlers) == 1
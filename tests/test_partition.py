@@ -0,0 +1,75 @@
+import csv
+from datetime import date
+
+import pytest
+
+from pdio.partition import HEADER, PartitionedWriter
+from test_cli import run_cli
+
+
+def _rec(employee, day, client, start, hours, unpaid=0, on=None):
+    return {"Employee": employee, "Day": day, "Date": on, "Start": start, "End": start + int(hours * 60),
+            "Location": "Oak", "Task": "Frame", "Client": client, "Hours": hours, "Unpaid": unpaid}
+
+
+BLOCKS = [
+    _rec("ann", "Monday", "ACME", 540, 8.0, 30, date(2024, 3, 4)),
+    _rec("bob", "Monday", "Beta", 480, 4.0, 0, date(2024, 3, 4)),
+    _rec("ann", "Monday", "ACME", 540, 4.0, 30, date(2024, 3, 11)),
+    _rec("bob", "Tuesday", "ACME", 480, 2.5, 0),
+]
+
+
+def _read(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def _write(tmp_path, by, blocks=BLOCKS, **kw):
+    with PartitionedWriter(tmp_path / by, by=by, **kw) as w:
+        w.write(blocks)
+    return w
+
+
+@pytest.mark.parametrize("by, files", [
+    ("week", {"2024-W10": 2, "2024-W11": 1, "undated": 1}),
+    ("client", {"ACME": 3, "Beta": 1}),
+    ("employee", {"ann": 2, "bob": 2}),
+])
+def test_routing(tmp_path, by, files):
+    w = _write(tmp_path, by)
+    paths = w.close()
+    assert {part: len(_read(p)) - 3 for part, p in paths.items()} == files  # header, TOTAL, watermark
+    for p in paths.values():
+        rows = _read(p)
+        assert rows[0] == HEADER and rows[-2][0] == "TOTAL" and rows[-1][0].startswith("# ")
+
+
+def test_lru_eviction_reopens_in_append(tmp_path):
+    # employee partitions alternate, so with one open handle every block evicts the other file
+    blocks = [_rec("ann" if i % 2 else "bob", "Monday", "ACME", 480 + i, 1.0) for i in range(10)]
+    w = _write(tmp_path, "employee", blocks, max_open=1)
+    assert w.reopened == 8
+    for name in ("ann", "bob"):
+        rows = _read(tmp_path / "employee" / f"{name}.csv")
+        assert [r for r in rows if r == HEADER] == [HEADER]
+        assert len(rows) == 1 + 5 + 2
+        assert [r[3] for r in rows[1:6]] == sorted(r[3] for r in rows[1:6])
+
+
+def test_total_is_net_of_unpaid(tmp_path):
+    _write(tmp_path, "client")
+    total = _read(tmp_path / "client" / "ACME.csv")[-2]
+    # 8.0 + 4.0 + 2.5 gross, 60 unpaid minutes
+    assert total[7:] == ["13.50", "60"]
+
+
+def test_bad_partition_dir_is_output_error(tmp_path, make_log, capsys):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(30), encoding="utf-8")
+    bad = tmp_path / "file"
+    bad.write_text("", encoding="utf-8")
+    flags = ["--partition-by", "client", "--partition-dir", bad / "parts"]
+    assert run_cli(log, "--sink", f"csv:{tmp_path / 'cpd.csv'}", *flags) == 2
+    assert run_cli(log, "--out-dir", tmp_path / "out", *flags) == 2
+    assert "Traceback" not in capsys.readouterr().err
@@ -0,0 +1,40 @@
+import random
+import re
+import time
+
+import pytest
+from bench_patterns import CASES
+
+from patterns.patterns import CLIENT_FOR, CLIENT_WITH
+from utils.extractors import FieldExtractors
+
+# Before the linear rewrite; the new patterns must capture exactly the same
+_OLD_FOR = re.compile(r"\bfor\s+([A-Za-z0-9][\w&\-\s]+)\b", re.IGNORECASE)
+_OLD_WITH = re.compile(r"\bwith\s+([A-Za-z0-9][\w&\-\s]+)\b", re.IGNORECASE)
+_OLD_TASK = re.compile(r"\b(?:with|for)\b\s+[A-Za-z0-9][\w&\-\s]+,\s*(.+)$", re.IGNORECASE)
+_TOKENS = ["for", "with", "For", " ", "  ", "\t", "-", "&", "a", "b1", "_", ",", ".", "é", "Z", "9", "'", "#"]
+
+
+def _span(m):
+    return m and (m.span(), m.group(1))
+
+
+def test_client_patterns_match_previous_captures():
+    rng = random.Random(7)
+    for _ in range(20000):
+        s = "".join(rng.choice(_TOKENS) for _ in range(rng.randint(0, 14)))
+        assert _span(CLIENT_FOR.search(s)) == _span(_OLD_FOR.search(s)), s
+        assert _span(CLIENT_WITH.search(s)) == _span(_OLD_WITH.search(s)), s
+        old = _OLD_TASK.search(s)
+        assert FieldExtractors.task_after_client(s) == (old.group(1) if old else None), s
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_pathological_line_time_bound(name):
+    fn, make = CASES[name]
+    line = make(20000)
+    assert len(line) > 20000
+    t = time.perf_counter()
+    fn(line)
+    # Linear scans take milliseconds (the parser ~0.1s); quadratic ones take minutes
+    assert time.perf_counter() - t < 2.0
@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from core.parser import WorkHourParser
+from policies.pay import PayEngine, RateTable
+
+
+def _engine(**kw):
+    return PayEngine(rates=RateTable(25, {"ACME Corp": 40}), weekly_overtime_hours=10, daily_double_time_hours=6,
+                     night_differential=2, **kw)
+
+
+def _blocks(make_log, n=3000):
+    rng = random.Random(4)
+    blocks = WorkHourParser().parse_blocks(make_log(n, seed=11))
+    first = date(2024, 1, 1)
+    for b in blocks:
+        b["Employee"] = rng.choice(["ann", "bob", "cy"])
+        if rng.random() < 0.5:
+            b["Date"] = first + timedelta(days=rng.randrange(60))
+    return blocks
+
+
+def test_numpy_and_python_paths_agree(make_log):
+    pytest.importorskip("numpy")
+    blocks = _blocks(make_log)
+    py = _engine(use_numpy=False).compute(blocks)
+    np_ = _engine(use_numpy=True).compute(blocks)
+    assert py == np_
+    # the generated log crosses both thresholds many times
+    assert sum(r["Overtime"] > 0 for r in py) > 100 and sum(r["DoubleTime"] > 0 for r in py) > 100
+    assert PayEngine.summarize(py) == PayEngine.summarize(np_)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_threshold_boundaries(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    on = date(2024, 3, 4)  # Monday
+    blocks = [{"Employee": "ann", "Day": "", "Date": on + timedelta(days=i), "Start": 480, "End": 480 + 240,
+               "Client": "x", "Unpaid": 0} for i in range(3)]  # 3 x 4h against a 10h week
+    blocks.append({"Employee": "ann", "Day": "", "Date": on + timedelta(days=2), "Start": 800, "End": 800 + 180,
+                   "Client": "x", "Unpaid": 0})  # day 3: 4h + 3h against a 6h day
+    res = _engine(use_numpy=use_numpy).compute(blocks)
+    assert [(r["Regular"], r["Overtime"], r["DoubleTime"]) for r in res] == [
+        (240, 0, 0), (240, 0, 0), (120, 120, 0), (0, 120, 60)]
+
+
+def test_undated_days_are_split_into_weeks():
+    days = ["Monday", "Wednesday", "Friday", "Monday", "Tuesday", "Tuesday", "Unknown", "Sunday", "Saturday"]
+    blocks = [{"Employee": "ann", "Day": d, "Date": None, "Start": 480, "End": 960, "Client": "x"} for d in days]
+    blocks.append({"Employee": "bob", "Day": "Friday", "Date": None, "Start": 480, "End": 960, "Client": "x"})
+    weeks = [r["Week"] for r in _engine().compute(blocks)]
+    assert weeks == ["undated-1"] * 3 + ["undated-2"] * 5 + ["undated-3", "undated-1"]
+    totals = PayEngine.summarize(PayEngine(weekly_overtime_hours=10, daily_double_time_hours=24).compute(blocks))
+    # 8h days against a 10h week: 3 days -> 14h overtime, 5 days -> 30h
+    assert [(t["Employee"], t["Week"], t["Overtime"]) for t in totals] == [
+        ("ann", "undated-1", 14 * 60), ("ann", "undated-2", 30 * 60), ("ann", "undated-3", 0), ("bob", "undated-1", 0)]
+
+
+def test_unpaid_carries_over_to_later_blocks_of_the_day():
+    blocks = [
+        {"Employee": "ann", "Day": "Monday", "Date": None, "Start": 480, "End": 495, "Client": "x", "Unpaid": 30},
+        {"Employee": "ann", "Day": "Monday", "Date": None, "Start": 500, "End": 620, "Client": "x", "Unpaid": 0},
+        {"Employee": "ann", "Day": "Tuesday", "Date": None, "Start": 500, "End": 620, "Client": "x", "Unpaid": 0},
+    ]
+    assert [r["Regular"] for r in _engine().compute(blocks)] == [0, 105, 120]
@@ -0,0 +1,64 @@
+import pytest
+
+from core.parser import WorkHourParser
+from core.pipeline import Pipeline
+from core.structured import StructuredLogParser
+from pdio.rejects import RejectSink
+
+BATCH_SIZES = (1, 2, 7, 256, 100000)
+
+
+def _noisy_log(make_log):
+    # Interleave lines the parser rejects so reject order is covered too
+    lines = make_log(300).splitlines()
+    for i in range(0, len(lines), 17):
+        lines[i] = "notes %d: no times here" % i
+    for i in range(5, len(lines), 23):
+        lines[i] = "wednesday=prep %d | " % i + lines[i]
+    return "\r\n".join(lines) + "\n"
+
+
+def _rejects(path):
+    return path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_rows_days_and_rejects_match_parser(tmp_path, make_log, batch_size):
+    text = _noisy_log(make_log)
+    with RejectSink(tmp_path / "want.csv") as sink:
+        parser = WorkHourParser(diagnostics=sink, max_line_chars=400)
+        want_rows = parser.parse(text, source="a.txt")
+    want_days = list(WorkHourParser(max_line_chars=400).iter_days(text))
+
+    with RejectSink(tmp_path / "got.csv") as sink:
+        pipe = Pipeline(WorkHourParser(diagnostics=sink, max_line_chars=400), batch_size=batch_size)
+        read, days = [], []
+        pipe.tap("read", read.append)
+        pipe.tap("policy", days.extend)
+        rows = pipe.collect(pipe.run(text, source="a.txt"))
+
+    assert rows == want_rows
+    assert days == want_days
+    assert _rejects(tmp_path / "got.csv") == _rejects(tmp_path / "want.csv")
+    assert sink.count > 20
+    assert all(len(b) == batch_size for b in read[:-1]) and 0 < len(read[-1]) <= batch_size
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_resume_matches_single_run(make_log, batch_size):
+    text = _noisy_log(make_log)
+    pipe = Pipeline(WorkHourParser(), batch_size=batch_size)
+    head = pipe.run(text, stop="extract")
+    assert pipe.collect(pipe.resume(head, "policy")) == WorkHourParser().parse(text)
+
+
+@pytest.mark.parametrize("batch_size", (1, 3, 256))
+def test_structured_rows_match_parser(batch_size):
+    lines = ["date,start,end,location,task,client"]
+    for d in range(1, 29):
+        lines.append("2024-03-%02d,0800,1200,Site %d,Pour,ACME" % (d, d % 3))
+        lines.append("2024-03-%02d,1300,1700,Depot,Unload,Zenith" % d)
+    text = "\n".join(lines) + "\n"
+    pipe = Pipeline(StructuredLogParser("csv"), batch_size=batch_size)
+    assert pipe.stage_names == ["days", "format"]
+    assert pipe.collect(pipe.run(text)) == StructuredLogParser("csv").parse(text)
@@ -0,0 +1,73 @@
+import pstats
+from types import SimpleNamespace
+
+from infra.profiler import RunProfiler
+
+MAIN = ("/src/app.py", 1, "main")
+A = ("/src/app.py", 10, "a")
+B = ("/src/core/__init__.py", 3, "b")
+C = ("/src/app.py", 20, "c")
+LEN = ("~", 0, "<built-in method builtins.len>")
+
+
+def _edge(ct):
+    return (1, 1, 0.0, ct)
+
+
+# main -> a -> c, main -> b -> c (c recurses), main -> len; entries are
+# (cc, nc, tt, ct, {caller: (cc, nc, tt, ct)}) as in pstats.Stats.stats
+GRAPH = {
+    MAIN: (1, 1, 1.0, 10.5, {}),
+    A: (1, 1, 2.0, 6.0, {MAIN: _edge(6.0)}),
+    B: (1, 1, 1.0, 3.0, {MAIN: _edge(3.0)}),
+    C: (2, 3, 6.0, 6.0, {A: _edge(4.0), B: _edge(2.0), C: _edge(1.0)}),
+    LEN: (1, 1, 0.5, 0.5, {MAIN: _edge(0.5)}),
+}
+
+
+def test_folded_stacks_split_self_time_by_caller():
+    assert RunProfiler.folded(SimpleNamespace(stats=GRAPH)) == [
+        ("app.py:1(main)", 1000000),
+        ("app.py:1(main);<built-in method builtins.len>", 500000),
+        ("app.py:1(main);app.py:10(a)", 2000000),
+        ("app.py:1(main);app.py:10(a);app.py:20(c)", 4000000),
+        ("app.py:1(main);core/__init__.py:3(b)", 1000000),
+        ("app.py:1(main);core/__init__.py:3(b);app.py:20(c)", 2000000),
+    ]
+
+
+def test_folded_total_matches_root_time():
+    stacks = RunProfiler.folded(SimpleNamespace(stats=GRAPH))
+    assert abs(sum(t for _, t in stacks) - 10.5e6) <= len(stacks)
+
+
+def _inner(n):
+    return sum(i * i for i in range(n))
+
+
+def _outer():
+    return [_inner(2000) for _ in range(20)]
+
+
+def test_write_profiles_only_sampled_units(tmp_path):
+    prof = RunProfiler(tmp_path / "run.prof", every=3)
+    for i in range(9):
+        with prof.sample(i):
+            _outer()
+    out, folded = prof.write()
+
+    calls = {f[2]: nc for f, (_, nc, _, _, _) in pstats.Stats(str(out)).stats.items()}
+    assert calls["_outer"] == 3 and calls["_inner"] == 60
+    lines = folded.read_text(encoding="utf-8").splitlines()
+    assert any("(_outer);test_profiler.py:" in line and "(_inner)" in line for line in lines)
+    for line in lines:
+        stack, micros = line.rsplit(" ", 1)
+        assert int(micros) > 0 and stack
+
+
+def test_disabled_profiler_is_a_no_op():
+    prof = RunProfiler()
+    assert not prof.enabled and prof.folded_path is None
+    with prof.sample(0):
+        _outer()
+    prof.stop()
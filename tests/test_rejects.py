@@ -0,0 +1,65 @@
+import csv
+
+from core.parser import WorkHourParser
+from core.structured import StructuredLogParser
+from pdio.rejects import (REASON_BAD_RECORD, REASON_LINE_TOO_LONG, REASON_NO_TIME_RANGE,
+                          REASON_SEGMENT_BEFORE_BLOCK, RejectSink)
+
+# Mixed line endings and a two-byte character: line numbers count \r\n, \r
+# and \n once each, byte offsets are UTF-8.
+TEXT = ("monday=0900 - 1700 | at Site A for ACME\r\n"
+        "notes: café closed\r"
+        "wednesday=Depot prep | 0800 - 1200 | at Depot\n"
+        "thursday=" + "x" * 100 + "\n"
+        "friday=0700 - 1100 | at Yard\n")
+
+
+def _rows(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_reasons_lines_and_byte_offsets(tmp_path):
+    out = tmp_path / "rejects.csv"
+    with RejectSink(out, buffer_size=2) as sink:
+        rows = WorkHourParser(diagnostics=sink, max_line_chars=80).parse(TEXT, source="ann.txt")
+    assert [r["Day"] for r in rows] == ["Monday", "Wednesday", "Friday"]
+    assert sink.count == 3
+
+    header, *recs = _rows(out)
+    assert header == RejectSink.HEADER
+    assert [r[:4] for r in recs] == [
+        ["ann.txt", "2", "41", REASON_NO_TIME_RANGE],
+        ["ann.txt", "3", "61", REASON_SEGMENT_BEFORE_BLOCK],
+        ["ann.txt", "4", "107", REASON_LINE_TOO_LONG],
+    ]
+    assert recs[0][4] == "notes: café closed"
+    assert recs[1][4] == "wednesday=Depot prep"
+    raw = TEXT.encode("utf-8")
+    for _, _, byte, _, text in recs:
+        assert raw[int(byte):].startswith(text.encode("utf-8"))
+
+
+def test_cursor_offsets_are_per_source(tmp_path):
+    out = tmp_path / "rejects.csv"
+    sink = RejectSink(out)
+    a = sink.open_text("x\né\ny\n", source="a")
+    b = sink.open_text("one\ntwo\n", source="b")
+    a.record(2, "r", "é")
+    b.record(4, "r", "two")
+    a.record(4, "r", "y")
+    sink.close()
+    sink.close()  # idempotent
+    assert [r[:3] for r in _rows(out)[1:]] == [["a", "2", "2"], ["b", "2", "4"], ["a", "3", "5"]]
+
+
+def test_structured_bad_records(tmp_path):
+    out = tmp_path / "rejects.csv"
+    text = ("date,start,end,location\n"
+            "2024-03-04,0900,1700,Site A\n"
+            "not-a-date,0900,1700,Site A\n"
+            "2024-03-05,,,Depot\n")
+    with RejectSink(out) as sink:
+        rows = StructuredLogParser("csv", diagnostics=sink).parse(text, source="ann.csv")
+    assert len(rows) == 1
+    assert [r[1:4] for r in _rows(out)[1:]] == [["3", "52", REASON_BAD_RECORD], ["4", "80", REASON_NO_TIME_RANGE]]
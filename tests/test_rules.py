@@ -0,0 +1,71 @@
+import pytest
+
+from core.parser import WorkHourParser
+from policies.policies import Policies
+from policies.rules import BreakPolicy, BreakRule, PolicyRuleSet
+
+RULES = {"breaks": [
+    {"name": "lunch", "deduct_hours": 0.5, "annotate": "(lunch)", "default": True, "min_shift_hours": 6,
+     "rules": [{"pattern": "\\bno\\s*breaks\\b", "deduct": False},
+               {"pattern": "\\bno\\s*lunch\\b", "priority": 1, "deduct": False},
+               {"pattern": "\\blunch\\b", "priority": 2, "deduct": True, "annotate": True}]},
+    {"name": "coffee", "deduct_hours": 0.25, "default": True, "max_shift_hours": 10,
+     "rules": [{"pattern": "\\bno\\s*breaks\\b", "deduct": False},
+               {"pattern": "\\bno\\s*coffee\\b", "deduct": False}]},
+    {"name": "site", "deduct_hours": 1.0, "default": False, "clients": ["ACME"],
+     "rules": [{"pattern": "\\bsite\\s+break\\b", "deduct": True}]},
+]}
+
+
+@pytest.fixture
+def rules():
+    return PolicyRuleSet.from_dict(RULES)
+
+
+def _decide(rules, segments, gross=8.0, clients=()):
+    return rules.decide(rules.scan(segments), gross, clients)
+
+
+def test_shared_cue_resolves_every_break(rules):
+    lunch, coffee, site = rules.scan(["no breaks"])
+    assert lunch >= 0 and coffee >= 0 and lunch != coffee and site == -1
+    assert _decide(rules, ["no breaks"]) == (0.0, [])
+    assert _decide(rules, ["site break, no breaks"], clients=["acme"]) == (1.0, [])
+
+
+def test_multi_break_lines(rules):
+    assert _decide(rules, ["0900-1700 at Oak"]) == (0.75, [])
+    assert _decide(rules, ["at Oak", "lunch", "no coffee"]) == (0.5, ["(lunch)"])
+    assert _decide(rules, ["no lunch | lunch"]) == (0.25, [])  # lower priority wins
+    assert _decide(rules, ["lunch and no coffee", "no lunch"]) == (0.0, [])
+
+
+def test_shift_gates(rules):
+    assert _decide(rules, ["lunch"], gross=5.5) == (0.25, [])         # lunch needs >= 6h
+    assert _decide(rules, ["lunch"], gross=6.0) == (0.75, ["(lunch)"])
+    assert _decide(rules, ["lunch"], gross=10.0) == (0.75, ["(lunch)"])
+    assert _decide(rules, ["lunch"], gross=10.5) == (0.5, ["(lunch)"])  # coffee only up to 10h
+    assert _decide(rules, ["lunch"], gross=None) == (0.75, ["(lunch)"])  # gates skipped
+
+
+def test_client_gate(rules):
+    assert _decide(rules, ["site break"], clients=["Beta Co", "NaN"]) == (0.75, [])
+    assert _decide(rules, ["site break"], clients=["Beta Co", "acme"]) == (1.75, [])
+    assert _decide(rules, ["at Oak"], clients=["ACME"]) == (0.75, [])  # default off
+
+
+def test_rule_file_end_to_end():
+    parser = WorkHourParser(policies=Policies(rules=PolicyRuleSet.from_dict(RULES)))
+    rows = parser.parse("monday=0900 - 1700 | at Oak for ACME, frame | lunch | site break\n"
+                        "tuesday=0900 - 1400 | at Oak, frame | no breaks\n"
+                        "wednesday=0700 - 1800 | at Oak, frame\n")
+    assert [r["Hours"] for r in rows] == [8.0 - 1.75, 5.0, 11.0 - 0.5]
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError, match="Invalid pattern"):
+        PolicyRuleSet([BreakPolicy("x", rules=[BreakRule("(")])])
+    with pytest.raises(ValueError, match="Named groups"):
+        PolicyRuleSet([BreakPolicy("x", rules=[BreakRule("(?P<a>x)")])])
+    with pytest.raises(ValueError, match="breaks"):
+        PolicyRuleSet.from_dict({"rules": []})
@@ -0,0 +1,50 @@
+import csv
+
+import pytest
+
+from pdio.sinks import SinkFanOut, open_sink
+from pdio.writer import CsvWriter
+
+ROWS = [{"Day": "Monday", "TimeBlocks": "0900-1700", "Location": "Site", "Tasks/Details": "Work",
+         "Client(s)": "Acme", "Hours": 7.5}]
+
+
+def test_open_sink_kinds(tmp_path):
+    assert isinstance(open_sink(f"csv:{tmp_path / 'a.txt'}"), CsvWriter)
+    assert isinstance(open_sink(str(tmp_path / "a.csv")), CsvWriter)
+    assert isinstance(open_sink(r"C:\out.csv"), CsvWriter)  # drive letter, not a kind
+    with pytest.raises(ValueError, match="Unknown sink kind 'db'"):
+        open_sink("db:out.db")
+    with pytest.raises(ValueError, match="Cannot tell the sink kind"):
+        open_sink("out.txt")
+
+
+@pytest.mark.parametrize("threaded", [True, False])
+def test_fan_out_writes_every_sink(tmp_path, threaded):
+    fan = SinkFanOut([CsvWriter(tmp_path / "a.csv"), CsvWriter(tmp_path / "b.csv")], threaded=threaded)
+    fan.write(ROWS)
+    fan.write(ROWS)
+    done = fan.close()
+    assert [rows for _, _, rows, _ in done] == [2, 2]
+    for name in ("a.csv", "b.csv"):
+        with open(tmp_path / name, newline="", encoding="utf-8") as f:
+            assert sum(1 for r in csv.reader(f) if r and r[0] == "Monday") == 2
+
+
+@pytest.mark.parametrize("threaded", [True, False])
+def test_fan_out_raises_sink_error_once(tmp_path, threaded):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    fan = SinkFanOut([CsvWriter(blocker / "a.csv")], threaded=threaded)
+    raised = 0
+    for _ in range(3):
+        try:
+            fan.write(ROWS)
+        except OSError:
+            raised += 1
+            break
+    try:
+        fan.close()
+    except OSError:
+        raised += 1
+    assert fan.failed and raised == 1
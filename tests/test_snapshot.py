@@ -0,0 +1,25 @@
+from pdio.snapshot import SnapshotReader
+from pdio.writer import CsvWriter
+from test_cli import run_cli
+
+LOG = """monday=0900 - 1700 | at Riverbelt, Framing | for Zorblax Builders | lunch
+tuesday=0800 - 1200 | at Elmara for ACME, Rough-in | 1230 - 1600 = at 14 Pulsar St for City Council, Inspection | lunch
+wednesday=2200 - 0200 | at Depot for Nightshift Co, Unload
+"""
+
+
+def test_cli_snapshot_round_trips_output_rows(tmp_path, make_log):
+    for name, text in (("fixed", LOG), ("generated", make_log(300, seed=7))):
+        log = tmp_path / f"{name}.txt"
+        log.write_text(text, encoding="utf-8")
+        out, snap, again = tmp_path / f"{name}.csv", tmp_path / f"{name}.pds", tmp_path / f"{name}-snap.csv"
+        assert run_cli(log, "--sink", f"csv:{out}", "--snapshot", snap) == 0
+
+        with SnapshotReader(snap) as reader:
+            CsvWriter(again).write(reader.iter_rows())
+            blocks = list(reader.iter_blocks())
+        assert again.read_bytes() == out.read_bytes()
+
+        if name == "fixed":
+            assert [(b["Day"], b["Hours"], b["Unpaid"]) for b in blocks] == [
+                ("Monday", 8.0, 30), ("Tuesday", 4.0, 30), ("Tuesday", 3.5, 0), ("Wednesday", 4.0, 30)]
@@ -0,0 +1,86 @@
+import csv
+import zipfile
+import xml.etree.ElementTree as ET
+
+from infra.constants import WATERMARK
+from pdio.xlsx import HEADER, XlsxWriter
+from test_cli import run_cli
+
+NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+PARTS = {"[Content_Types].xml", "_rels/.rels", "xl/workbook.xml", "xl/_rels/workbook.xml.rels",
+         "xl/styles.xml", "xl/sharedStrings.xml", "xl/worksheets/sheet1.xml"}
+
+
+def _read(path):
+    """Sheet rows as lists of (value, formula) per cell, plus the sst element."""
+    with zipfile.ZipFile(path) as z:
+        assert set(z.namelist()) == PARTS
+        sst = ET.fromstring(z.read("xl/sharedStrings.xml"))
+        sheet = ET.fromstring(z.read("xl/worksheets/sheet1.xml"))
+    strings = [si.find("m:t", NS).text or "" for si in sst.findall("m:si", NS)]
+    rows = []
+    for n, row in enumerate(sheet.iterfind("m:sheetData/m:row", NS), 1):
+        assert row.get("r") == str(n)
+        cells = []
+        for col, c in zip("ABCDEF", row.findall("m:c", NS)):
+            assert c.get("r") == "%s%d" % (col, n)
+            f = c.find("m:f", NS)
+            if c.get("t") == "s":
+                value = strings[int(c.find("m:v", NS).text)]
+            elif c.get("t") == "inlineStr":
+                value = c.find("m:is/m:t", NS).text or ""
+            else:
+                value = float(c.find("m:v", NS).text)
+            cells.append((value, f.text if f is not None else None))
+        rows.append(cells)
+    return rows, sst
+
+
+def _row(day, location, client, hours, task="Pour"):
+    return {"Day": day, "TimeBlocks": "0900-1700", "Location": location, "Tasks/Details": task,
+            "Client(s)": client, "Hours": hours}
+
+
+def test_shared_strings_and_sum_formula(tmp_path):
+    rows = [_row("Monday", "Site A", "ACME", 7.5), _row("Tuesday", "Site A", "ACME", 4.0),
+            _row("Monday", "Depot", "Zenith", 2.25)]
+    path = XlsxWriter(tmp_path / "out.xlsx").write(iter(rows))
+    sheet, sst = _read(path)
+
+    assert [v for v, _ in sheet[0]] == HEADER
+    assert [[v for v, _ in r] for r in sheet[1:4]] == [[r[k] for k in HEADER] for r in rows]
+    assert sheet[4][0] == ("TOTAL", None)
+    assert sheet[4][5] == (13.75, "SUM(F2:F4)")
+    assert sheet[5] == [("# " + WATERMARK, None)]
+    assert len(sheet) == 6
+
+    # header (6) + Day/Location/Client per row (9) + TOTAL; each distinct value stored once
+    assert sst.get("count") == "16"
+    assert sst.get("uniqueCount") == str(len(sst.findall("m:si", NS))) == "13"
+
+
+def test_markup_escaped_and_control_characters_dropped(tmp_path):
+    rows = [_row("Monday", "Bay <3> & \"Yard\"", "A&B\x01", 1.0, task="cut\x0b<rebar>\tfix\x1f")]
+    sheet, _ = _read(XlsxWriter(tmp_path / "out.xlsx").write(rows))
+    location, task, client = sheet[1][2][0], sheet[1][3][0], sheet[1][4][0]
+    assert location == "Bay <3> & \"Yard\""
+    assert task == "cut<rebar>\tfix"
+    assert client == "A&B"
+
+
+def test_empty_workbook_total_is_zero(tmp_path):
+    sheet, _ = _read(XlsxWriter(tmp_path / "out.xlsx").write([]))
+    assert len(sheet) == 3
+    assert sheet[1][5] == (0.0, "0")
+
+
+def test_cli_workbook_matches_csv(tmp_path, make_log):
+    log = tmp_path / "a.txt"
+    log.write_text(make_log(200), encoding="utf-8")
+    assert run_cli(log, "--sink", tmp_path / "a.csv", "--xlsx", tmp_path / "a.xlsx") == 0
+    with (tmp_path / "a.csv").open(encoding="utf-8", newline="") as f:
+        body = [r for r in csv.reader(f) if r and r[0] not in ("TOTAL", "Day") and not r[0].startswith("#")]
+    sheet, _ = _read(tmp_path / "a.xlsx")
+    assert [[v for v, _ in r[:5]] for r in sheet[1:-2]] == [r[:5] for r in body]
+    assert [r[5][0] for r in sheet[1:-2]] == [float(r[5]) for r in body]
+    assert sheet[-2][5][1] == "SUM(F2:F%d)" % (len(body) + 1)